@@ -0,0 +1,53 @@
+import asyncio
+
+from quart import Blueprint, Response, request
+from werkzeug.exceptions import NotFound
+
+from app.storage.backends import (
+    CONTENT_TYPES,
+    IMMUTABLE_MAX_AGE,
+    MEDIA_KEY,
+    MEDIA_ROUTE,
+    served_storages,
+)
+
+media = Blueprint("media", __name__)
+
+
+@media.route(f"{MEDIA_ROUTE}/<string:storage>/<string:key>", methods=["GET"])
+@media.route(f"{MEDIA_ROUTE}/<string:key>", methods=["GET"])
+async def get_media(key: str, storage: str = None):
+    """
+    Serve a stored screenshot file, see `media.get_media`.
+
+    The storage is read in a thread, so the event loop keeps serving other requests during disk or S3 reads.
+
+    Returns:
+        quart.Response: The file with an immutable `Cache-Control` and its ETag, or a 304 Not Modified.
+
+    Raises:
+        NotFound: If the key is malformed or no such file is stored by the backend.
+    """
+    match = MEDIA_KEY.match(key)
+    if match is None:
+        raise NotFound("No such file")
+
+    etag = key.split(".", 1)[0]
+
+    if request.if_none_match.contains(etag):
+        response = Response("", 304)
+    else:
+        content = None
+        for backend in served_storages(storage):
+            content = await asyncio.to_thread(backend.get, key)
+            if content is not None:
+                break
+        if content is None:
+            raise NotFound("No such file")
+        response = Response(content, mimetype=CONTENT_TYPES[match.group(1)])
+
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
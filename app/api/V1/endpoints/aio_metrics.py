@@ -0,0 +1,22 @@
+import asyncio
+
+from quart import Blueprint, Response
+
+from app.metrics.registry import CONTENT_TYPE, render
+
+metrics = Blueprint("metrics", __name__)
+
+
+@metrics.route("/metrics", methods=["GET"])
+async def get_metrics():
+    """
+    Expose the application metrics in the Prometheus text format, see `metrics.get_metrics`.
+
+    With `PROMETHEUS_MULTIPROC_DIR` the exposition is aggregated from the files of every worker, so it is rendered in a thread.
+
+    Returns:
+        quart.Response: HTTP request, MongoDB command and GitHub lookup metrics.
+    """
+    response = Response(await asyncio.to_thread(render), content_type=CONTENT_TYPE)
+    response.cache_control.no_store = True
+    return response
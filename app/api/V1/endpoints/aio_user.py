@@ -0,0 +1,588 @@
+import asyncio
+import time
+
+from quart import (
+    Blueprint,
+    Response,
+    make_response,
+    render_template,
+    request,
+    url_for,
+)
+from werkzeug.exceptions import BadRequest, Conflict, InternalServerError, NotFound
+
+from app.cache.page import page_cache
+from app.config.config import Config
+from app.exceptions.custom_exceptions import (
+    DuplicateRecordError,
+    InvalidCursorError,
+    RateLimitedError,
+)
+from app.github.aio import async_github_client
+from app.metrics.aio import instrument
+from app.metrics.registry import GITHUB_LOOKUP_DURATION
+from app.models.aio import AsyncUser
+from app.models.counters import counter_buffer
+from app.models.export import export_profiles
+from app.models.pagination import decode_offset_cursor, encode_offset_cursor
+from app.models.search import search_index, tokenize
+from app.models.user import PROFILE_PENDING
+from app.schemas.user import USER_OUT_PROJECTION, UserIn, UserSearch, UserUpdate
+from app.schemas.utils import localtime
+from app.storage.backends import media_url
+
+from .user import (
+    COUNTER_FIELDS,
+    _bulk_profiles,
+    _dump_profiles,
+    _export_args,
+    _page_args,
+    _pending_profile,
+    _profile_status,
+    _serialize_profiles,
+)
+from .utils import async_capture_screenshot, queue_profile_enrichment, register_profiles
+
+user = instrument(Blueprint("user", __name__))
+user.add_app_template_filter(localtime, "localtime")
+user.add_app_template_global(media_url, "media_url")
+
+
+async def _cached_page(render):
+    """
+    Serve a rendered page from the page cache, honouring conditional requests.
+
+    The async counterpart of `user._cached_page`; both apps share the cache, so a page rendered by one is served by the other.
+
+    Args:
+        render (callable): A coroutine function rendering the page on a cache miss.
+
+    Returns:
+        quart.Response: The page with a strong ETag, or a 304 Not Modified.
+    """
+    key = request.full_path
+    version = page_cache.version()
+
+    page = page_cache.get(key, version)
+    if page is None:
+        page = page_cache.set(key, version, await render())
+
+    if request.if_none_match.contains(page["etag"]):
+        response = await make_response("", 304)
+    else:
+        response = await make_response(page["body"])
+
+    response.set_etag(page["etag"])
+    response.cache_control.no_cache = True
+    return response
+
+
+async def _load_page(filter_type: str | None):
+    """
+    Load one page of a gallery listing for the current request.
+
+    Args:
+        filter_type (str | None): The named listing, or None for the default gallery order.
+
+    Returns:
+        tuple[list[dict], str | None]: The profiles of the page and the continuation cursor.
+
+    Raises:
+        BadRequest: If the listing name or the cursor is invalid.
+        InternalServerError: If the profiles could not be retrieved.
+    """
+    limit, cursor = _page_args(request.args)
+
+    try:
+        return await AsyncUser().paginate(
+            filter_type=filter_type,
+            limit=limit,
+            cursor=cursor,
+            projection=USER_OUT_PROJECTION,
+        )
+    except InvalidCursorError as e:
+        raise BadRequest(f"Invalid cursor: {e}")
+    except ValueError as e:
+        raise BadRequest(f"Invalid filter parameter: {e}")
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
+
+
+def _next_cards_url(filter_type: str | None, next_cursor: str | None) -> str | None:
+    """
+    Build the URL of the card fragment that continues the current listing.
+
+    Args:
+        filter_type (str | None): The named listing.
+        next_cursor (str | None): The continuation cursor of the next page.
+
+    Returns:
+        str | None: The URL, or None on the last page.
+    """
+    if next_cursor is None:
+        return None
+
+    return url_for(
+        "user.get_user_profile_cards",
+        type=filter_type,
+        limit=request.args.get("limit"),
+        cursor=next_cursor,
+    )
+
+
+async def _fetch_user_info(username: str) -> tuple:
+    """
+    Fetch a GitHub user through the shared async client, see `utils.fetch_user_info`.
+
+    Every lookup is timed into the `github_user_lookup_duration_seconds` metric, with the same outcome labels as in the WSGI app.
+
+    Args:
+        username (str): The GitHub username.
+
+    Returns:
+        tuple: The HTTP status code and the user information (dict), or `(None, {})` if the user does not exist or cannot be fetched.
+
+    Raises:
+        RateLimitedError: If the lookup was deferred by the rate limiter and nothing is cached for the user.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response_code, response_data = await async_github_client.get_user(username)
+        outcome = "not_found" if response_code is None else "found"
+        return response_code, response_data
+    except RateLimitedError:
+        outcome = "rate_limited"
+        raise
+    finally:
+        GITHUB_LOOKUP_DURATION.labels(outcome).observe(time.perf_counter() - started)
+
+
+async def _iterate_in_thread(chunks):
+    """
+    Drain a blocking iterator from worker threads, one item at a time.
+
+    Args:
+        chunks (Iterator): The iterator, e.g. an export reading a database cursor.
+
+    Yields:
+        The items of `chunks`, without blocking the event loop while each is produced.
+    """
+    done = object()
+    try:
+        while (chunk := await asyncio.to_thread(next, chunks, done)) is not done:
+            yield chunk
+    finally:
+        chunks.close()
+
+
+async def _register_pending(data: dict):
+    """
+    Store a profile as pending and leave its GitHub lookup to the `enrich_profile` task, see `user._register_pending`.
+
+    Args:
+        data (dict): The registration data, as accepted by `save_user_profile`.
+
+    Returns:
+        tuple[dict, int, dict]: A JSON response with the status URL, HTTP 202 and a `Location` header pointing at the status URL.
+
+    Raises:
+        BadRequest: If the registration data is invalid.
+        Conflict: If the GitHub username is already registered.
+        InternalServerError: If the profile could not be stored or the task could not be queued.
+    """
+    user_dict = _pending_profile(data)
+
+    github_username = user_dict["github_username"]
+    try:
+        await AsyncUser().save(data=user_dict)
+        queue_profile_enrichment(github_username)
+    except DuplicateRecordError:
+        raise Conflict("User with this username already exists")
+    except Exception as e:
+        raise InternalServerError(f"Failed to register user: {e}")
+
+    status_url = url_for(
+        "user.get_user_profile_status", github_username=github_username
+    )
+    body = {
+        "status": PROFILE_PENDING,
+        "message": "Profile registration accepted",
+        "status_url": status_url,
+    }
+    return body, 202, {"Location": status_url}
+
+
+@user.route("/profile", methods=["POST"])
+async def save_user_profile():
+    """
+    Save user profile information, see `user.save_user_profile`.
+
+    The GitHub lookup and the insert are awaited, so the worker serves other requests meanwhile.
+
+    Returns:
+        dict: A JSON response indicating the status of the profile registration. With `Config.ASYNC_REGISTRATION`,
+        or when the GitHub rate limiter defers the lookup, HTTP 202 and the URL of `get_user_profile_status` instead,
+        see `_register_pending`.
+
+    Raises:
+        BadRequest: If there is a validation error in the incoming JSON data or the profile data.
+        Conflict: If the GitHub username is already registered.
+        NotFound: If the GitHub username does not exist.
+        InternalServerError: If there is an error while trying to register the user profile.
+    """
+    data = await request.get_json()
+
+    if Config.ASYNC_REGISTRATION:
+        return await _register_pending(data)
+
+    try:
+        response_code, response_data = await _fetch_user_info(
+            data.get("github_username")
+        )
+    except RateLimitedError:
+        # Register now and look the user up once the rate limit allows
+        return await _register_pending(data)
+    if response_code is not None:
+        data["full_name"] = response_data.get("name")
+        data["github_avatar"] = response_data.get("avatar_url")
+    else:
+        raise NotFound("Invalid Github username")
+
+    try:
+        user_data = UserIn(**data)
+    except ValueError as e:
+        raise BadRequest(f"Validation error: {e}")
+
+    try:
+        user_dict = user_data.model_dump(exclude_unset=False)
+    except ValueError as e:
+        raise BadRequest(f"Invalid profile data: {e}")
+
+    # Duplicates are rejected by the unique index on github_username
+    try:
+        response = await AsyncUser().save(data=user_dict)
+        async_capture_screenshot.delay(data.get("github_username"))
+    except DuplicateRecordError:
+        raise Conflict("User with this username already exists")
+    except Exception as e:
+        raise InternalServerError(f"Failed to register user: {e}")
+
+    if response.acknowledged:
+        return {"status": "success", "message": "Profile added successfully"}
+
+    return {"status": "failure", "message": "Profile registration failed"}
+
+
+@user.route("/profile/bulk", methods=["POST"])
+async def save_user_profiles():
+    """
+    Register many user profiles in one request, see `user.save_user_profiles`.
+
+    The batch registration blocks on GitHub and MongoDB, so it runs in a worker thread.
+
+    Returns:
+        dict: The outcome per profile: `created`, `deferred`, `duplicates`, `not_found` and `invalid`, see `register_profiles`.
+
+    Raises:
+        BadRequest: If the body is not a list of profiles or exceeds `Config.BULK_MAX_PROFILES`.
+        InternalServerError: If the profiles could not be stored.
+    """
+    profiles = _bulk_profiles(await request.get_json(silent=True))
+
+    try:
+        result = await asyncio.to_thread(register_profiles, profiles)
+    except Exception as e:
+        raise InternalServerError(f"Failed to register users: {e}")
+
+    return {"status": "success", **result}
+
+
+@user.route("/", methods=["GET"])
+async def get_user_profiles():
+    """
+    Render the first page of the gallery, see `user.get_user_profiles`.
+
+    Returns:
+        quart.Response: The gallery page, served from the page cache when possible.
+
+    Raises:
+        BadRequest: If the pagination parameters are invalid.
+        NotFound: If no users are found.
+        InternalServerError: If there is an error while trying to retrieve user data.
+    """
+
+    async def render():
+        user_data, next_cursor = await _load_page(filter_type=None)
+
+        if not user_data:
+            raise NotFound("No users found")
+
+        return await render_template(
+            "index.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=_next_cards_url(None, next_cursor),
+        )
+
+    return await _cached_page(render)
+
+
+@user.route("/profile/cards", methods=["GET"])
+async def get_user_profile_cards():
+    """
+    Render the next page of profile cards as an HTML fragment, see `user.get_user_profile_cards`.
+
+    Returns:
+        quart.Response: The rendered cards, followed by a new sentinel when another page exists.
+
+    Raises:
+        BadRequest: If the listing name or the pagination parameters are invalid.
+        InternalServerError: If there is an error while trying to retrieve user data.
+    """
+    filter_type = request.args.get("type") or None
+
+    async def render():
+        user_data, next_cursor = await _load_page(filter_type=filter_type)
+
+        return await render_template(
+            "_cards.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=_next_cards_url(filter_type, next_cursor),
+        )
+
+    return await _cached_page(render)
+
+
+@user.route("/profile/update", methods=["PATCH"])
+async def update_user_profile():
+    """
+    Update user profile information, see `user.update_user_profile`.
+
+    Returns:
+        dict: A JSON response indicating the status of the profile update.
+
+    Raises:
+        BadRequest: If there is a validation error in the incoming JSON data or the user data.
+        NotFound: If no users are found with the specified username.
+        InternalServerError: If there is an error while trying to retrieve or update the user profile.
+    """
+    try:
+        user_data = UserUpdate(**(await request.get_json()))
+    except ValueError as e:
+        raise BadRequest(f"Validation error: {e}")
+
+    try:
+        user_dict = user_data.model_dump(exclude_unset=True)
+    except ValueError as e:
+        raise BadRequest(f"Invalid user data: {e}")
+
+    user_instance = AsyncUser()
+    try:
+        existing = await user_instance.get(
+            username=user_dict["github_username"], projection={"_id": 1}
+        )
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
+
+    if existing is None:
+        raise NotFound("No users found")
+
+    try:
+        response = await user_instance.update(data=user_dict)
+    except Exception as e:
+        raise InternalServerError(f"Failed to update user: {e}")
+
+    if response.acknowledged:
+        return {"status": "success", "message": "User update successful"}
+
+    return {"status": "failure", "message": "User update failed"}
+
+
+@user.route(
+    "/profile/<string:github_username>/<any(view, like):counter>", methods=["POST"]
+)
+async def increment_profile_counter(github_username: str, counter: str):
+    """
+    Record a view or a like of a user profile, see `user.increment_profile_counter`.
+
+    Args:
+        github_username (str): The github_username of the profile.
+        counter (str): Either 'view' or 'like'.
+
+    Returns:
+        tuple[dict, int]: A JSON response and HTTP 202, as the write is applied asynchronously.
+    """
+    counter_buffer.add(github_username, COUNTER_FIELDS[counter])
+
+    return {"status": "success", "message": f"Profile {counter} recorded"}, 202
+
+
+@user.route("/profile/search", methods=["GET"])
+async def search_user_profiles():
+    """
+    Search user profiles by name, GitHub username and tags, see `user.search_user_profiles`.
+
+    Returns:
+        dict | str: `{"results": [...], "next_cursor": str | None}`, or the rendered cards.
+
+    Raises:
+        BadRequest: If the query is empty or the pagination parameters are invalid.
+        InternalServerError: If there is an error while trying to search user data.
+    """
+    query = " ".join(tokenize(request.args.get("q", "")))
+    if not query:
+        raise BadRequest(
+            "Validation error: q must contain at least one letter or digit"
+        )
+
+    limit, cursor = _page_args(request.args)
+    try:
+        offset = decode_offset_cursor(query, cursor) if cursor else 0
+    except InvalidCursorError as e:
+        raise BadRequest(f"Invalid cursor: {e}")
+
+    try:
+        # An index rebuild reads the whole table synchronously; keep it off the loop
+        ranked = await asyncio.to_thread(search_index.search, query)
+        usernames = ranked[offset : offset + limit]
+        user_data = (
+            await AsyncUser().filter(
+                filter={"github_username": {"$in": usernames}},
+                projection=USER_OUT_PROJECTION,
+            )
+            if usernames
+            else []
+        )
+    except Exception as e:
+        raise InternalServerError(f"Failed to search user data: {e}")
+
+    # Restore the ranking, which the $in lookup does not preserve
+    rank = {username: i for i, username in enumerate(usernames)}
+    user_data.sort(key=lambda profile: rank[profile["github_username"]])
+
+    next_cursor = None
+    if offset + limit < len(ranked):
+        next_cursor = encode_offset_cursor(query, offset + limit)
+
+    if request.args.get("format") == "html":
+        next_url = None
+        if next_cursor:
+            next_url = url_for(
+                "user.search_user_profiles",
+                q=query,
+                limit=limit,
+                cursor=next_cursor,
+                format="html",
+            )
+
+        return await render_template(
+            "_cards.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=next_url,
+        )
+
+    return {"results": _dump_profiles(user_data), "next_cursor": next_cursor}
+
+
+@user.route("/profile/<string:github_username>/status", methods=["GET"])
+async def get_user_profile_status(github_username: str):
+    """
+    Report the registration status of a user profile, see `user.get_user_profile_status`.
+
+    Args:
+        github_username (str): The github_username of the profile.
+
+    Returns:
+        quart.Response: `{"github_username": str, "status": "pending" | "active", "screenshot_ready": bool}`, never cached.
+
+    Raises:
+        NotFound: If no profile is registered under the username.
+        InternalServerError: If the profile could not be retrieved.
+    """
+    try:
+        profile = await AsyncUser().get(
+            username=github_username,
+            projection={"_id": 0, "profile_status": 1, "screenshot": 1},
+        )
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
+
+    response = await make_response(_profile_status(github_username, profile))
+    response.cache_control.no_store = True
+    return response
+
+
+@user.route("/profile/export", methods=["GET"])
+async def export_user_profiles():
+    """
+    Download every user profile as an NDJSON or CSV file, see `user.export_user_profiles`.
+
+    The export reads a blocking database cursor, so each chunk is produced in a worker thread while the event loop keeps serving other requests.
+
+    Returns:
+        quart.Response: The streamed file, served as an attachment.
+
+    Raises:
+        BadRequest: If the format is not supported.
+    """
+    format, compress, mimetype, filename = _export_args(request.args)
+
+    response = Response(
+        _iterate_in_thread(export_profiles(format=format, compress=compress)),
+        mimetype=mimetype,
+    )
+    # A large export may take longer than Quart's default response timeout
+    response.timeout = None
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.cache_control.no_store = True
+    return response
+
+
+@user.route("/profile/filter", methods=["POST", "GET"])
+async def filter_user_profile():
+    """
+    Filter user profiles by criteria or render a named listing, see `user.filter_user_profile`.
+
+    Returns:
+        quart.Response | list[dict]: The rendered listing for GET, the matching profiles for POST.
+
+    Raises:
+        BadRequest: If the filter criteria or pagination parameters are invalid.
+        NotFound: If a listing has no profiles.
+        InternalServerError: If there is an error while attempting to filter user profiles.
+    """
+    if request.method == "GET":
+        filter_type = request.args.get("type")
+
+        async def render():
+            user_data, next_cursor = await _load_page(filter_type=filter_type)
+
+            if not user_data:
+                raise NotFound("No users found")
+
+            return await render_template(
+                "index.html",
+                data=_serialize_profiles(user_data),
+                branch=Config.BRANCH,
+                next_url=_next_cards_url(filter_type, next_cursor),
+            )
+
+        return await _cached_page(render)
+
+    try:
+        user_data = UserSearch(**(await request.get_json()))
+    except ValueError as e:
+        raise BadRequest(f"Validation error: {e}")
+
+    try:
+        user_dict = user_data.model_dump(exclude_unset=True)
+    except ValueError as e:
+        raise BadRequest(f"Invalid filter parameter: {e}")
+
+    try:
+        return await AsyncUser().filter(filter=user_dict)
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
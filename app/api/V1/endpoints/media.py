@@ -0,0 +1,82 @@
+import os
+from io import BytesIO
+
+from flask import Blueprint, make_response, request, send_file
+from werkzeug.exceptions import NotFound
+
+from app.storage.backends import (
+    CONTENT_TYPES,
+    IMMUTABLE_MAX_AGE,
+    MEDIA_KEY,
+    MEDIA_ROUTE,
+    served_storages,
+)
+
+media = Blueprint("media", __name__)
+
+
+@media.route(f"{MEDIA_ROUTE}/<string:storage>/<string:key>", methods=["GET"])
+@media.route(f"{MEDIA_ROUTE}/<string:key>", methods=["GET"])
+def get_media(key: str, storage: str = None):
+    """
+    Serve a stored screenshot file.
+
+    Files are addressed by their content hash, so the hash is a strong ETag and the response may be cached forever. A revalidation is answered from the key alone, without touching the storage.
+
+    Args:
+        key (str): The key of the file, e.g. '3f2a9c0d1e4b5a67.webp'.
+        storage (str, optional): The backend holding the file, as recorded in the screenshot manifest, e.g. 'local'. Without it the file is looked up in every served backend, see `served_storages`.
+
+    Returns:
+        flask.Response: The file with `Cache-Control: public, max-age=31536000, immutable` and its ETag, or a 304 Not Modified.
+
+    Raises:
+        NotFound: If the key is malformed or no such file is stored by the backend.
+
+    Note:
+        Local files are sent with `send_file`, so with `MEDIA_X_SENDFILE` the front server streams them through `X-Sendfile` and the worker only sends headers. Files of the S3 backend are read from the bucket; set `MEDIA_PUBLIC_URL` to have browsers load them from the bucket or a CDN instead.
+    """
+    match = MEDIA_KEY.match(key)
+    if match is None:
+        raise NotFound("No such file")
+
+    etag = key.split(".", 1)[0]
+    mimetype = CONTENT_TYPES[match.group(1)]
+
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+        response.set_etag(etag)
+    else:
+        response = None
+        for backend in served_storages(storage):
+            response = _send_media(backend, key, mimetype, etag)
+            if response is not None:
+                break
+        if response is None:
+            raise NotFound("No such file")
+
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+def _send_media(backend, key: str, mimetype: str, etag: str):
+    """
+    Send a file of one backend.
+
+    Returns:
+        flask.Response | None: The file, or None if the backend does not hold it.
+    """
+    path = backend.path(key)
+    if path is not None:
+        if not os.path.isfile(path):
+            return None
+        return send_file(path, mimetype=mimetype, etag=etag, max_age=IMMUTABLE_MAX_AGE)
+
+    content = backend.get(key)
+    if content is None:
+        return None
+    return send_file(
+        BytesIO(content), mimetype=mimetype, etag=etag, max_age=IMMUTABLE_MAX_AGE
+    )
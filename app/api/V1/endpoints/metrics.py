@@ -0,0 +1,18 @@
+from flask import Blueprint, Response
+
+from app.metrics.registry import CONTENT_TYPE, render
+
+metrics = Blueprint("metrics", __name__)
+
+
+@metrics.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Expose the application metrics in the Prometheus text format.
+
+    Returns:
+        flask.Response: HTTP request, MongoDB command and GitHub lookup metrics, aggregated across gunicorn workers when `PROMETHEUS_MULTIPROC_DIR` is set.
+    """
+    response = Response(render(), content_type=CONTENT_TYPE)
+    response.cache_control.no_store = True
+    return response
@@ -1,6 +1,15 @@
 from typing import List
 
-from flask import Blueprint, abort, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from werkzeug.exceptions import (
     BadRequest,
     Conflict,
@@ -9,13 +18,329 @@ from werkzeug.exceptions import (
     NotFound,
 )
 
+from app.cache.page import page_cache
 from app.config.config import Config
+from app.exceptions.custom_exceptions import (
+    DuplicateRecordError,
+    InvalidCursorError,
+    RateLimitedError,
+)
+from app.metrics.http import instrument
+from app.models.counters import counter_buffer
+from app.models.export import EXPORT_FORMATS, export_profiles
+from app.models.pagination import decode_offset_cursor, encode_offset_cursor
+from app.models.search import search_index, tokenize
+from app.models.user import PROFILE_ACTIVE, PROFILE_PENDING
 from app.models.user import User as UserModel
-from app.schemas.user import UserIn, UserOut, UserSearch, UserUpdate
+from app.schemas.user import (
+    USER_OUT_PROJECTION,
+    UserIn,
+    UserOut,
+    UserSearch,
+    UserUpdate,
+    user_out_list,
+)
+from app.schemas.utils import localtime
+from app.storage.backends import media_url
+
+from .utils import (
+    async_capture_screenshot,
+    fetch_user_info,
+    queue_profile_enrichment,
+    register_profiles,
+)
+
+user = instrument(Blueprint("user", __name__))
+user.add_app_template_filter(localtime, "localtime")
+user.add_app_template_global(media_url, "media_url")
+
+# Profile fields that may be incremented through `increment_profile_counter`
+COUNTER_FIELDS = {"view": "profile_views", "like": "profile_likes"}
+
+
+def _page_args(args=None):
+    """
+    Read the pagination query parameters of the current request.
+
+    Args:
+        args (MultiDict, optional): The query parameters. Defaults to those of the current Flask request.
+
+    Returns:
+        tuple[int, str | None]: The page size, clamped to `Config.MAX_PAGE_SIZE`, and the continuation cursor.
+
+    Raises:
+        BadRequest: If `limit` is not a positive integer.
+    """
+    args = request.args if args is None else args
+
+    try:
+        limit = int(args.get("limit", Config.PAGE_SIZE))
+    except ValueError:
+        raise BadRequest("Validation error: limit must be an integer")
+
+    if limit < 1:
+        raise BadRequest("Validation error: limit must be positive")
+
+    return min(limit, Config.MAX_PAGE_SIZE), args.get("cursor") or None
+
+
+def _dump_profiles(user_data: list[dict]) -> list[dict]:
+    """
+    Validate database rows through `UserOut` as one batch.
+
+    Args:
+        user_data (list[dict]): The profiles as returned by the model layer.
+
+    Returns:
+        list[dict]: The profiles as plain `UserOut` dicts.
+    """
+    return user_out_list.dump_python(user_out_list.validate_python(user_data))
+
+
+def _serialize_profiles(user_data: list[dict]) -> list[dict]:
+    """
+    Serialize database rows for the gallery template.
+
+    Args:
+        user_data (list[dict]): The profiles as returned by the model layer.
+
+    Returns:
+        list[dict]: The profiles validated through `UserOut`, with tags joined for display.
+    """
+    data = _dump_profiles(user_data)
+
+    for user in data:
+        user["tags"] = " ".join(user["tags"]) if user["tags"] else "No Hastags found"
+
+    return data
+
+
+def _cached_page(render):
+    """
+    Serve a rendered page from the page cache, honouring conditional requests.
+
+    The page is keyed by the request path and query string under the current data version. A cached page is returned without touching the database or the template, and a client whose `If-None-Match` matches gets an empty 304.
+
+    Args:
+        render (callable): Renders the page on a cache miss. Exceptions propagate and nothing is cached.
+
+    Returns:
+        flask.Response: The page with a strong ETag, or a 304 Not Modified.
+    """
+    key = request.full_path
+    version = page_cache.version()
+
+    page = page_cache.get(key, version)
+    if page is None:
+        page = page_cache.set(key, version, render())
+
+    if request.if_none_match.contains(page["etag"]):
+        response = make_response("", 304)
+    else:
+        response = make_response(page["body"])
+
+    response.set_etag(page["etag"])
+    response.cache_control.no_cache = True
+    return response
+
+
+def _load_page(filter_type: str | None):
+    """
+    Load one page of a gallery listing for the current request.
+
+    Args:
+        filter_type (str | None): The named listing, or None for the default gallery order.
+
+    Returns:
+        tuple[list[dict], str | None]: The profiles of the page and the continuation cursor.
+
+    Raises:
+        BadRequest: If the listing name or the cursor is invalid.
+        InternalServerError: If the profiles could not be retrieved.
+    """
+    limit, cursor = _page_args()
+
+    user_instance = UserModel()
+    try:
+        return user_instance.paginate(
+            filter_type=filter_type,
+            limit=limit,
+            cursor=cursor,
+            projection=USER_OUT_PROJECTION,
+        )
+    except InvalidCursorError as e:
+        raise BadRequest(f"Invalid cursor: {e}")
+    except ValueError as e:
+        raise BadRequest(f"Invalid filter parameter: {e}")
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
+
+
+def _next_cards_url(filter_type: str | None, next_cursor: str | None) -> str | None:
+    """
+    Build the URL of the card fragment that continues the current listing.
+
+    Args:
+        filter_type (str | None): The named listing.
+        next_cursor (str | None): The continuation cursor of the next page.
+
+    Returns:
+        str | None: The URL, or None on the last page.
+    """
+    if next_cursor is None:
+        return None
+
+    return url_for(
+        "user.get_user_profile_cards",
+        type=filter_type,
+        limit=request.args.get("limit"),
+        cursor=next_cursor,
+    )
+
+
+def _pending_profile(data: dict) -> dict:
+    """
+    Validate registration data into a pending profile, without its GitHub fields.
+
+    Args:
+        data (dict): The registration data, as accepted by `save_user_profile`.
+
+    Returns:
+        dict: The profile document, with `profile_status` set to pending.
+
+    Raises:
+        BadRequest: If the registration data is invalid.
+    """
+    # Name and avatar always come from GitHub
+    data = {k: v for k, v in data.items() if k not in ("full_name", "github_avatar")}
+    if not data.get("github_username"):
+        raise BadRequest("Validation error: github_username is required")
+
+    try:
+        user_dict = UserIn(**data).model_dump(exclude_unset=False)
+    except ValueError as e:
+        raise BadRequest(f"Validation error: {e}")
+    user_dict["profile_status"] = PROFILE_PENDING
+
+    return user_dict
+
+
+def _profile_status(github_username: str, profile: dict | None) -> dict:
+    """
+    Build the body of `get_user_profile_status` from the stored profile.
+
+    Args:
+        github_username (str): The github_username of the profile.
+        profile (dict | None): The profile, with its `profile_status` and `screenshot`.
+
+    Returns:
+        dict: `{"github_username": str, "status": "pending" | "active", "screenshot_ready": bool}`.
+
+    Raises:
+        NotFound: If no profile is registered under the username.
+    """
+    if profile is None:
+        raise NotFound("No profile registered under this username")
+
+    return {
+        "github_username": github_username,
+        "status": profile.get("profile_status", PROFILE_ACTIVE),
+        "screenshot_ready": bool(profile.get("screenshot")),
+    }
+
+
+def _bulk_profiles(body: dict | None) -> list:
+    """
+    Read the profiles of a `save_user_profiles` request body.
+
+    Args:
+        body (dict | None): The parsed JSON body.
+
+    Returns:
+        list: The profile data, at most `Config.BULK_MAX_PROFILES` entries.
+
+    Raises:
+        BadRequest: If the body is not a non-empty list of profiles or exceeds the limit.
+    """
+    profiles = (body or {}).get("profiles")
+
+    if not isinstance(profiles, list) or not profiles:
+        raise BadRequest("Validation error: profiles must be a non-empty list")
+
+    if len(profiles) > Config.BULK_MAX_PROFILES:
+        raise BadRequest(
+            f"Validation error: at most {Config.BULK_MAX_PROFILES} profiles per request"
+        )
+
+    return profiles
+
+
+def _export_args(args) -> tuple[str, bool, str, str]:
+    """
+    Read the query parameters of an `export_user_profiles` request.
+
+    Args:
+        args (MultiDict): The query parameters.
+
+    Returns:
+        tuple[str, bool, str, str]: The format, whether to compress, the mimetype and the download filename.
+
+    Raises:
+        BadRequest: If the format is not supported.
+    """
+    format = args.get("format", "ndjson")
+    compress = args.get("gzip", "").lower() in ("1", "true")
+
+    if format not in EXPORT_FORMATS:
+        raise BadRequest(
+            f"Validation error: format must be one of {', '.join(EXPORT_FORMATS)}"
+        )
+
+    mimetype, extension = EXPORT_FORMATS[format]
+    filename = f"profiles.{extension}"
+    if compress:
+        mimetype, filename = "application/gzip", f"{filename}.gz"
+
+    return format, compress, mimetype, filename
 
-from .utils import async_capture_screenshot, fetch_user_info
 
-user = Blueprint("user", __name__)
+def _register_pending(data: dict):
+    """
+    Store a profile as pending and leave its GitHub lookup to the `enrich_profile` task.
+
+    The profile is validated and inserted without waiting on GitHub, so the response time does not depend on it. Pending profiles are hidden from listings until the task fills in `full_name` and `github_avatar`.
+
+    Args:
+        data (dict): The registration data, as accepted by `save_user_profile`.
+
+    Returns:
+        tuple[dict, int, dict]: A JSON response with the status URL, HTTP 202 and a `Location` header pointing at the status URL.
+
+    Raises:
+        BadRequest: If the registration data is invalid.
+        Conflict: If the GitHub username is already registered.
+        InternalServerError: If the profile could not be stored or the task could not be queued.
+    """
+    user_dict = _pending_profile(data)
+
+    github_username = user_dict["github_username"]
+    try:
+        UserModel().save(data=user_dict)
+        queue_profile_enrichment(github_username)
+    except DuplicateRecordError:
+        raise Conflict("User with this username already exists")
+    except Exception as e:
+        raise InternalServerError(f"Failed to register user: {e}")
+
+    status_url = url_for(
+        "user.get_user_profile_status", github_username=github_username
+    )
+    body = {
+        "status": PROFILE_PENDING,
+        "message": "Profile registration accepted",
+        "status_url": status_url,
+    }
+    return body, 202, {"Location": status_url}
 
 
 @user.route("/profile", methods=["POST"])
@@ -28,7 +353,9 @@ def save_user_profile():
     of the profile registration.
 
     Returns:
-        dict: A JSON response indicating the status of the profile registration.
+        dict: A JSON response indicating the status of the profile registration. With `Config.ASYNC_REGISTRATION`,
+        or when the GitHub rate limiter defers the lookup, HTTP 202 and the URL of `get_user_profile_status` instead,
+        see `_register_pending`.
 
     Raises:
         BadRequest: If there is a validation error in the incoming JSON data or the profile data.
@@ -51,9 +378,17 @@ def save_user_profile():
     if request.method == "POST":
         data = request.json
 
-        response_code, response_data = fetch_user_info(
-            username=data.get("github_username")
-        )
+        if Config.ASYNC_REGISTRATION:
+            return _register_pending(data)
+
+        try:
+            response_code, response_data = fetch_user_info(
+                username=data.get("github_username")
+            )
+        except RateLimitedError:
+            # Register now and look the user up once the rate limit allows
+            return _register_pending(data)
+
         if response_code is not None:
             data["full_name"] = response_data.get("name")
             data["github_avatar"] = response_data.get("avatar_url")
@@ -72,15 +407,12 @@ def save_user_profile():
 
         user_instance = UserModel()
 
-        exist_users_list = user_instance.filter(
-            filter={"github_username": user_dict.get("github_username")}
-        )
-        if len(exist_users_list) > 0:
-            raise Conflict("User with this username already exists")
-
+        # Duplicates are rejected by the unique index on github_username
         try:
             response = user_instance.save(data=user_dict)
             async_capture_screenshot.delay(data.get("github_username"))
+        except DuplicateRecordError:
+            raise Conflict("User with this username already exists")
         except Exception as e:
             raise InternalServerError(f"Failed to register user: {e}")
 
@@ -93,43 +425,137 @@ def save_user_profile():
     abort(MethodNotAllowed.code, description="Unsupported request method")
 
 
+@user.route("/profile/<string:github_username>/status", methods=["GET"])
+def get_user_profile_status(github_username: str):
+    """
+    Report the registration status of a user profile.
+
+    Clients poll this after an asynchronous registration until `status` is 'active'.
+
+    Args:
+        github_username (str): The github_username of the profile.
+
+    Returns:
+        flask.Response: `{"github_username": str, "status": "pending" | "active", "screenshot_ready": bool}`, never cached.
+
+    Raises:
+        NotFound: If no profile is registered under the username, including a pending profile GitHub did not confirm.
+        InternalServerError: If the profile could not be retrieved.
+    """
+    try:
+        profile = UserModel().get(
+            username=github_username,
+            projection={"_id": 0, "profile_status": 1, "screenshot": 1},
+        )
+    except Exception as e:
+        raise InternalServerError(f"Failed to retrieve user data: {e}")
+
+    response = make_response(_profile_status(github_username, profile))
+    response.cache_control.no_store = True
+    return response
+
+
+@user.route("/profile/bulk", methods=["POST"])
+def save_user_profiles():
+    """
+    Register many user profiles in one request.
+
+    Expects a JSON body `{"profiles": [...]}`, where each entry has the same fields as the body of `POST /profile`. GitHub lookups run in parallel, the profiles are inserted in one batch and a single screenshot job is queued for all of them.
+
+    Returns:
+        dict: The outcome per profile: `created`, `deferred`, `duplicates`, `not_found` and `invalid`, see `register_profiles`.
+
+    Raises:
+        BadRequest: If the body is not a list of profiles or exceeds `Config.BULK_MAX_PROFILES`.
+        InternalServerError: If the profiles could not be stored.
+    """
+    profiles = _bulk_profiles(request.get_json(silent=True))
+
+    try:
+        result = register_profiles(profiles)
+    except Exception as e:
+        raise InternalServerError(f"Failed to register users: {e}")
+
+    return {"status": "success", **result}
+
+
 @user.route("/", methods=["GET"])
 def get_user_profiles() -> List[UserOut]:
     """
     Retrieve a list of users.
 
-    Returns a list of user data in the response.
+    Returns the first page of user data in the response.
 
-    This endpoint fetches user data from a data source and returns it as a list
+    This endpoint fetches one page of user data from a data source and returns it as a list
     of UserOut objects, which include user_uuid, full name, email, GitHub profile, GitHub avatar, profile views, and tags.
 
+    Query Parameters:
+        limit (int, optional): The page size, capped at `Config.MAX_PAGE_SIZE`.
+        cursor (str, optional): The continuation token of a previous page.
+
     Returns:
         List[UserOut]: A list of user data.
 
     Raises:
+        HTTPException (status_code=400): If the pagination parameters are invalid.
         HTTPException (status_code=500): If there is an error while trying to retrieve user data.
         HTTPException (status_code=404): If no users are found.
 
     Note:
-        The response is an HTML document containing the user profiles.
+        The response is an HTML document containing the user profiles. Further pages are fetched lazily
+        through `get_user_profile_cards`. Rendered pages are served from the page cache with a strong ETag
+        until a profile write bumps the data version.
 
     """
-    try:
-        user_instance = UserModel()
-        user_data = user_instance.get_all()
-    except Exception as e:
-        raise InternalServerError(f"Failed to retrieve user data: {e}")
 
-    if not user_data:
-        raise NotFound("No users found")
+    def render():
+        user_data, next_cursor = _load_page(filter_type=None)
 
-    # Serialize the list of user_data using the UserOut schema
-    data = [UserOut(**user).model_dump() for user in user_data]
+        if not user_data:
+            raise NotFound("No users found")
 
-    for user in data:
-        user["tags"] = " ".join(user["tags"]) if user["tags"] else "No Hastags found"
+        return render_template(
+            "index.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=_next_cards_url(None, next_cursor),
+        )
+
+    return _cached_page(render)
+
+
+@user.route("/profile/cards", methods=["GET"])
+def get_user_profile_cards():
+    """
+    Render the next page of profile cards as an HTML fragment.
+
+    Used by `static/js/pagination.js` to implement the gallery's "load more" behaviour without re-rendering the whole page.
+
+    Query Parameters:
+        type (str, optional): The named listing ('latest', 'trending', 'popular', 'hot' or 'creative').
+        limit (int, optional): The page size, capped at `Config.MAX_PAGE_SIZE`.
+        cursor (str, optional): The continuation token of the previous page.
+
+    Returns:
+        str: The rendered `<li>` cards, followed by a new sentinel when another page exists.
+
+    Raises:
+        BadRequest: If the listing name or the pagination parameters are invalid.
+        InternalServerError: If there is an error while trying to retrieve user data.
+    """
+    filter_type = request.args.get("type") or None
 
-    return render_template("index.html", data=data, branch=Config.BRANCH)
+    def render():
+        user_data, next_cursor = _load_page(filter_type=filter_type)
+
+        return render_template(
+            "_cards.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=_next_cards_url(filter_type, next_cursor),
+        )
+
+    return _cached_page(render)
 
 
 @user.route("/profile/update", methods=["PATCH"])
@@ -184,6 +610,135 @@ def update_user_profile():
     abort(MethodNotAllowed.code, description="Unsupported request method")
 
 
+@user.route(
+    "/profile/<string:github_username>/<any(view, like):counter>", methods=["POST"]
+)
+def increment_profile_counter(github_username: str, counter: str):
+    """
+    Record a view or a like of a user profile.
+
+    The increment is buffered in-process and persisted with an atomic `$inc` by `CounterBuffer`, so concurrent viewers never overwrite each other's counts and a click costs no database round trip on the request path.
+
+    Args:
+        github_username (str): The github_username of the profile.
+        counter (str): Either 'view' or 'like'.
+
+    Returns:
+        tuple[dict, int]: A JSON response and HTTP 202, as the write is applied asynchronously.
+    """
+    counter_buffer.add(github_username, COUNTER_FIELDS[counter])
+
+    return {"status": "success", "message": f"Profile {counter} recorded"}, 202
+
+
+@user.route("/profile/search", methods=["GET"])
+def search_user_profiles():
+    """
+    Search user profiles by name, GitHub username and tags.
+
+    Matches come from the in-process `SearchIndex`: every query term must match a word of the profile, either exactly or as a prefix, and results are ranked by where they matched (username over name over tags).
+
+    Query Parameters:
+        q (str): The search query.
+        limit (int, optional): The page size, capped at `Config.MAX_PAGE_SIZE`.
+        cursor (str, optional): The continuation token of a previous page.
+        format (str, optional): 'json' (default) or 'html' for a card fragment as used by `static/js/filter.js`.
+
+    Returns:
+        dict | str: `{"results": [...], "next_cursor": str | None}`, or the rendered cards.
+
+    Raises:
+        BadRequest: If the query is empty or the pagination parameters are invalid.
+        InternalServerError: If there is an error while trying to search user data.
+    """
+    query = " ".join(tokenize(request.args.get("q", "")))
+    if not query:
+        raise BadRequest(
+            "Validation error: q must contain at least one letter or digit"
+        )
+
+    limit, cursor = _page_args()
+    try:
+        offset = decode_offset_cursor(query, cursor) if cursor else 0
+    except InvalidCursorError as e:
+        raise BadRequest(f"Invalid cursor: {e}")
+
+    try:
+        ranked = search_index.search(query)
+        usernames = ranked[offset : offset + limit]
+        user_data = (
+            UserModel().filter(
+                filter={"github_username": {"$in": usernames}},
+                projection=USER_OUT_PROJECTION,
+            )
+            if usernames
+            else []
+        )
+    except Exception as e:
+        raise InternalServerError(f"Failed to search user data: {e}")
+
+    # Restore the ranking, which the $in lookup does not preserve
+    rank = {username: i for i, username in enumerate(usernames)}
+    user_data.sort(key=lambda profile: rank[profile["github_username"]])
+
+    next_cursor = None
+    if offset + limit < len(ranked):
+        next_cursor = encode_offset_cursor(query, offset + limit)
+
+    if request.args.get("format") == "html":
+        next_url = None
+        if next_cursor:
+            next_url = url_for(
+                "user.search_user_profiles",
+                q=query,
+                limit=limit,
+                cursor=next_cursor,
+                format="html",
+            )
+
+        return render_template(
+            "_cards.html",
+            data=_serialize_profiles(user_data),
+            branch=Config.BRANCH,
+            next_url=next_url,
+        )
+
+    return {
+        "results": _dump_profiles(user_data),
+        "next_cursor": next_cursor,
+    }
+
+
+@user.route("/profile/export", methods=["GET"])
+def export_user_profiles():
+    """
+    Download every user profile as an NDJSON or CSV file.
+
+    The response is streamed: profiles are read from a database cursor in batches and serialized row by row while the client downloads, so the worker's memory use does not depend on the number of profiles.
+
+    Query Parameters:
+        format (str, optional): 'ndjson' (default) or 'csv'.
+        gzip (str, optional): '1' or 'true' to download a gzip-compressed file.
+
+    Returns:
+        flask.Response: The streamed file, served as an attachment.
+
+    Raises:
+        BadRequest: If the format is not supported.
+
+    Note:
+        Errors after the first chunk was sent can no longer change the status code; the download is cut short instead.
+    """
+    format, compress, mimetype, filename = _export_args(request.args)
+
+    response = Response(
+        export_profiles(format=format, compress=compress), mimetype=mimetype
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.cache_control.no_store = True
+    return response
+
+
 @user.route("/profile/filter", methods=["POST", "GET"])
 def filter_user_profile():
     """
@@ -191,6 +746,8 @@ def filter_user_profile():
 
     This endpoint expects a POST request with JSON data containing criteria for filtering user profiles. It validates the input data using the `UserSearch` model and then attempts to filter user profiles using the `UserModel`.
 
+    A GET request renders the first page of a named listing (`?type=latest|trending|popular|hot|creative`), accepting the same `limit` and `cursor` query parameters as `get_user_profiles`.
+
     Args:
         None (uses request.json): The request payload containing filtering criteria.
 
@@ -206,24 +763,21 @@ def filter_user_profile():
     """
     if request.method == "GET":
         filter_type = request.args.get("type")
-        user_instance = UserModel()
-        try:
-            user_data = user_instance.filter(filter=filter_type)
-        except Exception as e:
-            raise InternalServerError(f"Failed to retriev user data: {e}")
 
-        if not user_data:
-            raise NotFound("No users found")
+        def render():
+            user_data, next_cursor = _load_page(filter_type=filter_type)
 
-        # Serialize the list of user_data using the UserOut schema
-        data = [UserOut(**user).model_dump() for user in user_data]
+            if not user_data:
+                raise NotFound("No users found")
 
-        for user in data:
-            user["tags"] = (
-                " ".join(user["tags"]) if user["tags"] else "No Hastags found"
+            return render_template(
+                "index.html",
+                data=_serialize_profiles(user_data),
+                branch=Config.BRANCH,
+                next_url=_next_cards_url(filter_type, next_cursor),
             )
 
-        return render_template("index.html", data=data, branch=Config.BRANCH)
+        return _cached_page(render)
 
     elif request.method == "POST":
         data = request.json
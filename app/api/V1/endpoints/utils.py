@@ -1,23 +1,42 @@
 import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-import requests
-from celery import Celery
-from github import Github
-from pyppeteer import launch
+from celery import Celery, chain
+from celery.exceptions import Ignore
+from celery.signals import worker_process_shutdown, worker_shutdown
+from pydantic import ValidationError
 
 from app.config.config import Config
-
-
-def fetch_user_info(username: str):
+from app.exceptions.custom_exceptions import RateLimitedError
+from app.github.client import github_client
+from app.github.publisher import GitHubPublisher, publisher
+from app.metrics.registry import GITHUB_LOOKUP_DURATION
+from app.metrics.tasks import instrument_celery
+from app.models.user import PROFILE_ACTIVE, PROFILE_PENDING
+from app.models.user import User as UserModel
+from app.schemas.user import BaseUser, user_in_list
+from app.storage.backends import get_storage
+from app.worker.browser import browser_pool
+from app.worker.images import content_hash, store_screenshot
+from app.worker.loop import run
+
+
+def fetch_user_info(username: str, wait: float = None):
     """
     Fetches user information from the GitHub API based on the provided username.
 
     Args:
         username (str): The GitHub username.
+        wait (float, optional): Seconds to wait for the shared GitHub rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
 
     Returns:
         tuple: A tuple containing the HTTP status code and the user information (dict).
 
+    Raises:
+        RateLimitedError: If the lookup was deferred by the rate limiter and nothing is cached for the user.
+
     Example:
         To retrieve information for a GitHub user with the username 'example_user', use the function as follows:
 
@@ -29,30 +48,104 @@ def fetch_user_info(username: str):
         information about the GitHub user.
 
     Note:
-        The function uses the GitHub API to fetch user information. If the request to the GitHub API fails for any reason,
-        the function returns a tuple with `None` as the status code and an empty dictionary.
+        The function uses the GitHub API through the shared `GitHubClient`, which keeps connections alive and caches
+        lookups in-process and in Redis. Unknown usernames are cached too, and expired entries are revalidated with
+        ETags. If the user does not exist or the request to the GitHub API fails and nothing is cached, the function
+        returns a tuple with `None` as the status code and an empty dictionary. Every lookup is timed into the
+        `github_user_lookup_duration_seconds` metric, labelled 'found', 'not_found', 'rate_limited' or 'error'.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response_code, response_data = github_client.get_user(username, wait=wait)
+        outcome = "not_found" if response_code is None else "found"
+        return response_code, response_data
+    except RateLimitedError:
+        outcome = "rate_limited"
+        raise
+    finally:
+        GITHUB_LOOKUP_DURATION.labels(outcome).observe(time.perf_counter() - started)
+
+
+def fetch_users_info(
+    usernames: list, concurrency: int = None, wait: float = None
+) -> dict:
+    """
+    Fetches user information for many GitHub usernames in parallel.
+
+    Args:
+        usernames (list): The GitHub usernames.
+        concurrency (int, optional): The maximum number of lookups in flight. Defaults to `Config.GITHUB_LOOKUP_CONCURRENCY`.
+        wait (float, optional): Seconds each lookup waits for the shared GitHub rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
+
+    Returns:
+        dict: The `fetch_user_info` result per username, or None for lookups deferred by the rate limiter.
+
+    Note:
+        Lookups share the keep-alive session, cache and rate limiter of `GitHubClient`, so already known users cost no request at all.
+    """
+    usernames = list(dict.fromkeys(usernames))
+    if not usernames:
+        return {}
+
+    def lookup(username):
+        try:
+            return fetch_user_info(username, wait=wait)
+        except RateLimitedError:
+            return None
 
-    TODO:
-        - Consider adding more error handling or logging based on your application's requirements.
+    workers = min(concurrency or Config.GITHUB_LOOKUP_CONCURRENCY, len(usernames))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(usernames, executor.map(lookup, usernames)))
+
+
+def github_profile_fields(response_data: dict) -> dict:
     """
-    url = f"https://api.github.com/users/{username}"
+    Extracts the profile fields that mirror a GitHub user.
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.status_code, response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching user information: {e}")
-        return None, {}
+    Args:
+        response_data (dict): The user information returned by `fetch_user_info`.
+
+    Returns:
+        dict: The validated 'full_name' and 'github_avatar', plus 'github_updated_at', GitHub's own modification time used to detect changes.
+
+    Raises:
+        ValueError: If GitHub's name or avatar fails the `BaseUser` validation.
+    """
+    github_data = BaseUser(
+        full_name=response_data.get("name"),
+        github_avatar=response_data.get("avatar_url"),
+    )
+    return {
+        **github_data.model_dump(include={"full_name", "github_avatar"}),
+        "github_updated_at": response_data.get("updated_at"),
+    }
 
 
 # Create a Celery instance
 app = Celery("tasks", broker=Config.REDIS_SERVER)
+app.conf.beat_schedule = {
+    "publish-screenshots": {
+        "task": "app.api.V1.endpoints.utils.publish_screenshots",
+        "schedule": Config.PUBLISH_INTERVAL,
+    },
+    "refresh-profiles": {
+        "task": "app.api.V1.endpoints.utils.refresh_profiles",
+        "schedule": Config.REFRESH_INTERVAL,
+    },
+    "rebuild-leaderboards": {
+        "task": "app.api.V1.endpoints.utils.rebuild_leaderboards",
+        "schedule": Config.LEADERBOARD_REBUILD_INTERVAL,
+    },
+}
+
+# Record task runtime and queue wait for every task
+instrument_celery()
 
 
 async def capture_screenshot(github_username: str):
     """
-    Takes a screenshot of a GitHub user's profile page in dark mode and commits it to a GitHub repository.
+    Takes a screenshot of a GitHub user's profile page in dark mode and stores it with the configured media storage.
 
     This function utilizes Pyppeteer, a headless browser automation library, to capture a screenshot
     of the specified GitHub user's profile page in dark mode. The dark mode is achieved by injecting
@@ -62,74 +155,64 @@ async def capture_screenshot(github_username: str):
         github_username (str): The GitHub username of the user whose profile page to capture.
 
     Returns:
-        None
+        bool: True if a new screenshot was stored, False if it matched the stored content hash.
 
     Example:
-        >>> asyncio.get_event_loop().run_until_complete(capture_screenshot('mramitdas'))
+        >>> run(capture_screenshot('mramitdas'))
 
     Note:
         Ensure that you have Pyppeteer installed (`pip install pyppeteer`) and have the necessary
-        dependencies (such as Chromium) available in your environment.
+        dependencies (such as Chromium) available in your environment. The page is borrowed from
+        the worker's `BrowserPool`, so Chromium is launched once per worker process rather than per capture.
 
-    After capturing the screenshot, the function automatically commits the screenshot image to a
-    specified GitHub repository. The GitHub repository and commit details are configured using the
-    settings in the `Config` class. Make sure to set the appropriate values in the `Config` class
-    before running the function.
+    After capturing the screenshot, `store_screenshot` encodes its AVIF/WebP thumbnails and stores every file
+    under the hash of its content with the backend selected by `Config.MEDIA_STORAGE`: the local filesystem,
+    an S3-compatible bucket, or the GitHub repository, where the `publish_screenshots` beat task commits
+    everything staged since the last run as a single commit.
 
     Configuration:
-        - GITHUB_TOKEN: GitHub personal access token with the necessary permissions.
-        - REPO_OWNER: Owner of the GitHub repository.
-        - REPO_NAME: Name of the GitHub repository.
-        - BRANCH: Branch to which the screenshot will be committed.
-
-    The committed file will be named '{github_username}.png', and the commit message will indicate
-    the addition of the screenshot file.
-
-    Example:
-        >>> capture_screenshot('mramitdas')
+        - MEDIA_STORAGE: The storage backend, 'local', 's3' or 'github'.
+        - MEDIA_ROOT, MEDIA_S3_*: The settings of the local and S3 backends.
+        - GITHUB_TOKEN, REPO_OWNER, REPO_NAME, BRANCH: The repository of the GitHub backend.
+        - PUBLISH_INTERVAL: Seconds between commits of staged screenshots.
+
+    The manifest of the stored files is written to the profile's `screenshot` field, so the gallery can serve
+    them through `srcset`. A re-capture gets new keys and never replaces a file a browser may have cached.
+    When the capture has the same content hash as the stored manifest, nothing is encoded, stored or written,
+    so refreshing an unchanged profile costs no upload and no commit.
     """
-    browser = await launch(
-        executablePath=Config.PUPPETEER_EXECUTABLE_PATH, args=["--no-sandbox"]
-    )
-    page = await browser.newPage()
+    # Pages come from the worker's warm browser pool, already emulating a desktop environment
+    async with browser_pool.page() as page:
+        await page.goto(
+            f"https://github.com/{github_username}", {"waitUntil": "domcontentloaded"}
+        )
+
+        # Inject JavaScript code to enable dark mode
+        await page.evaluate(
+            """
+            document.documentElement.setAttribute('data-color-mode', 'dark');
+        """
+        )
 
-    # Emulate desktop environment
-    await page.emulate(
-        {
-            "viewport": {"width": 1920, "height": 1080},
-            "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        }
-    )
+        screenshot = await page.screenshot({"fullPage": True})
 
-    await page.goto(
-        f"https://github.com/{github_username}", {"waitUntil": "domcontentloaded"}
+    # An identical capture would re-encode and re-commit the same files
+    digest = content_hash(screenshot)
+    stored = UserModel().get(
+        username=github_username, projection={"_id": 0, "screenshot.hash": 1}
     )
+    if ((stored or {}).get("screenshot") or {}).get("hash") == digest:
+        return False
 
-    # Inject JavaScript code to enable dark mode
-    await page.evaluate(
-        """
-        document.documentElement.setAttribute('data-color-mode', 'dark');
-    """
+    # Resizing, encoding and uploading block, keep them off the event loop
+    manifest = await asyncio.get_running_loop().run_in_executor(
+        None, store_screenshot, screenshot, get_storage()
     )
 
-    await page.screenshot({"path": f"{github_username}.png", "fullPage": "true"})
-    await browser.close()
-
-    github_token = Config.GITHUB_TOKEN
-    repository_owner = Config.REPO_OWNER
-    repository_name = Config.REPO_NAME
-    target_branch = Config.BRANCH
-    file_path = f"{github_username}.png"
-    commit_message = f"CHORE: added {file_path}"
-
-    commit_file_to_github(
-        github_token,
-        repository_owner,
-        repository_name,
-        target_branch,
-        file_path,
-        commit_message,
+    UserModel().update(
+        data={"github_username": github_username, "user_data": {"screenshot": manifest}}
     )
+    return True
 
 
 def commit_file_to_github(
@@ -148,31 +231,413 @@ def commit_file_to_github(
 
     Returns:
         None
-    """
-    # Create a GitHub instance
-    g = Github(token)
-
-    # Get the repository
-    repo = g.get_repo(f"{repo_owner}/{repo_name}")
 
+    Note:
+        The file is written with a single Git data API commit, so an existing file at the same path is replaced
+        instead of failing. Screenshots are published in batches by `publish_screenshots` instead.
+    """
     # Read the content of the file
     with open(file_path, "rb") as file:
         file_content = file.read()
 
     # Specify the path where the file will be saved in the GitHub repository
-    github_file_path = f"app/static/profiles/{file_path}"
-
-    # Commit the file to GitHub
-    repo.create_file(
-        path=github_file_path,
-        message=commit_message,
-        content=file_content,
-        branch=branch,
-    )
+    github_file_path = f"app/static/profiles/{os.path.basename(file_path)}"
+
+    GitHubPublisher(
+        token=token, repo_owner=repo_owner, repo_name=repo_name, branch=branch
+    ).commit_files({github_file_path: file_content}, message=commit_message)
+
+
+async def capture_screenshots(usernames: list, concurrency: int = None) -> dict:
+    """
+    Capture and commit screenshots for many GitHub users concurrently.
+
+    Parameters:
+        usernames (list): The GitHub usernames to capture.
+        concurrency (int, optional): The maximum number of captures in flight. Defaults to `Config.SCREENSHOT_CONCURRENCY`.
+
+    Returns:
+        dict: The outcome per username: `{"status": "success"}`, `{"status": "unchanged"}` when the capture matched the
+        stored screenshot, or `{"status": "failure", "error": str}`.
+
+    Note:
+        A failure for one user does not affect the others. Concurrency is further bounded by the capacity of the
+        worker's `BrowserPool`.
+    """
+    semaphore = asyncio.Semaphore(concurrency or Config.SCREENSHOT_CONCURRENCY)
+
+    async def capture(username):
+        async with semaphore:
+            try:
+                changed = await capture_screenshot(username)
+            except Exception as e:
+                return username, {"status": "failure", "error": str(e)}
+            return username, {"status": "success" if changed else "unchanged"}
+
+    # dict.fromkeys drops duplicate usernames while keeping their order
+    results = await asyncio.gather(*(capture(u) for u in dict.fromkeys(usernames)))
+    return dict(results)
 
 
 # Define a Celery task
 @app.task
 def async_capture_screenshot(username):
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(capture_screenshot(username))
+    return run(capture_screenshot(username))
+
+
+@app.task
+def async_capture_screenshots(usernames, concurrency=None):
+    """
+    Celery task capturing a batch of screenshots on the worker's persistent event loop.
+
+    Parameters:
+        usernames (list): The GitHub usernames to capture.
+        concurrency (int, optional): The maximum number of captures in flight.
+
+    Returns:
+        dict: The outcome per username, as returned by `capture_screenshots`.
+    """
+    return run(capture_screenshots(usernames, concurrency=concurrency))
+
+
+def register_profiles(profiles: list) -> dict:
+    """
+    Register many user profiles in one batch.
+
+    Every GitHub username is enriched from the GitHub API in parallel, the profiles are validated through `UserIn` in a single pass, inserted with one unordered `insert_many`, and one `async_capture_screenshots` job is queued for all new profiles. Profiles whose lookup the GitHub rate limiter deferred are inserted as pending instead, and each is queued for `enrich_profile`.
+
+    Args:
+        profiles (list): The profile data, each a dict with at least 'github_username', as accepted by `POST /profile`.
+
+    Returns:
+        dict: The outcome per profile:
+            - created (list[str]): The registered GitHub usernames.
+            - deferred (list[str]): Usernames registered as pending, to be enriched once the GitHub rate limit allows.
+            - duplicates (list[str]): Usernames that were already registered, or repeated within the batch.
+            - not_found (list[str]): Usernames unknown to GitHub.
+            - invalid (list[dict]): `{"index": int, "github_username": str | None, "error": str}` for profiles that failed validation.
+    """
+    result = {
+        "created": [],
+        "deferred": [],
+        "duplicates": [],
+        "not_found": [],
+        "invalid": [],
+    }
+
+    # Keep the first occurrence of each username, later ones are duplicates
+    pending, seen = [], set()
+    for index, profile in enumerate(profiles):
+        username = profile.get("github_username") if isinstance(profile, dict) else None
+        if not isinstance(username, str) or not username:
+            result["invalid"].append(
+                {
+                    "index": index,
+                    "github_username": None,
+                    "error": "github_username is required",
+                }
+            )
+        elif username.lower() in seen:
+            result["duplicates"].append(username)
+        else:
+            seen.add(username.lower())
+            pending.append((index, dict(profile)))
+
+    lookups = fetch_users_info([profile["github_username"] for _, profile in pending])
+
+    enriched, deferred = [], set()
+    for index, profile in pending:
+        if lookups[profile["github_username"]] is None:
+            # Name and avatar always come from GitHub, the enrichment fills them in
+            profile.pop("full_name", None)
+            profile.pop("github_avatar", None)
+            deferred.add(profile["github_username"])
+            enriched.append((index, profile))
+            continue
+
+        response_code, response_data = lookups[profile["github_username"]]
+        if response_code is None:
+            result["not_found"].append(profile["github_username"])
+            continue
+        profile["full_name"] = response_data.get("name")
+        profile["github_avatar"] = response_data.get("avatar_url")
+        enriched.append((index, profile))
+
+    try:
+        users = user_in_list.validate_python([profile for _, profile in enriched])
+    except ValidationError as e:
+        # Report every failing profile, then validate the rest once more
+        failed = {}
+        for error in e.errors():
+            position = error["loc"][0]
+            failed.setdefault(
+                position, f"{'.'.join(map(str, error['loc'][1:]))}: {error['msg']}"
+            )
+
+        for position, error in failed.items():
+            index, profile = enriched[position]
+            result["invalid"].append(
+                {
+                    "index": index,
+                    "github_username": profile["github_username"],
+                    "error": error,
+                }
+            )
+
+        enriched = [item for i, item in enumerate(enriched) if i not in failed]
+        users = user_in_list.validate_python([profile for _, profile in enriched])
+
+    if not users:
+        return result
+
+    records = [user.model_dump(exclude_unset=False) for user in users]
+    for record in records:
+        if record["github_username"] in deferred:
+            record["profile_status"] = PROFILE_PENDING
+
+    duplicates = set(UserModel().save_many(records))
+
+    for position, record in enumerate(records):
+        if position in duplicates:
+            key = "duplicates"
+        elif record["github_username"] in deferred:
+            key = "deferred"
+        else:
+            key = "created"
+        result[key].append(record["github_username"])
+
+    if result["created"]:
+        async_capture_screenshots.delay(result["created"])
+
+    for username in result["deferred"]:
+        queue_profile_enrichment(username)
+
+    return result
+
+
+@app.task(
+    bind=True,
+    max_retries=Config.ENRICHMENT_MAX_RETRIES,
+    default_retry_delay=Config.ENRICHMENT_RETRY_DELAY,
+)
+def enrich_profile(self, username):
+    """
+    Celery task completing a pending profile with its GitHub data and activating it.
+
+    Parameters:
+        username (str): The GitHub username of the pending profile.
+
+    Returns:
+        str: The username, once the profile is active.
+
+    Raises:
+        celery.exceptions.Ignore: If the profile was dropped or deferred, which also stops the chained screenshot task.
+        celery.exceptions.Retry: While GitHub is unreachable and retries remain.
+
+    Note:
+        The pending profile is deleted when GitHub does not know the username, when GitHub's name or avatar fails
+        validation, or when GitHub stays unreachable for `Config.ENRICHMENT_MAX_RETRIES` retries. Its username is
+        then free to register again, and the status endpoint answers 404. A lookup deferred by the GitHub rate
+        limiter is not a failure: the enrichment is queued afresh for when the limit allows, without using up
+        a retry.
+    """
+    try:
+        response_code, response_data = fetch_user_info(
+            username, wait=Config.GITHUB_RATE_TASK_WAIT
+        )
+    except RateLimitedError as e:
+        queue_profile_enrichment(username, countdown=e.retry_after)
+        raise Ignore()
+
+    if response_code is None:
+        if (
+            not github_client.is_unknown(username)
+            and self.request.retries < self.max_retries
+        ):
+            raise self.retry()
+
+        UserModel().discard(username, filter={"profile_status": PROFILE_PENDING})
+        raise Ignore()
+
+    try:
+        github_data = github_profile_fields(response_data)
+    except ValueError as e:
+        print(f"Invalid GitHub data for {username}: {e}")
+        UserModel().discard(username, filter={"profile_status": PROFILE_PENDING})
+        raise Ignore()
+
+    UserModel().update(
+        data={
+            "github_username": username,
+            "user_data": {**github_data, "profile_status": PROFILE_ACTIVE},
+        }
+    )
+    return username
+
+
+def queue_profile_enrichment(username: str, countdown: float = None):
+    """
+    Queue the enrichment of a pending profile, followed by its screenshot.
+
+    Parameters:
+        username (str): The GitHub username of the pending profile.
+        countdown (float, optional): Seconds to wait before the enrichment starts.
+
+    Returns:
+        celery.result.AsyncResult: The result of the last task in the chain.
+    """
+    return chain(
+        enrich_profile.si(username), async_capture_screenshot.si(username)
+    ).apply_async(countdown=countdown)
+
+
+# The fields the refresh job compares against GitHub
+REFRESH_PROJECTION = {
+    "_id": 1,
+    "github_username": 1,
+    "full_name": 1,
+    "github_avatar": 1,
+    "github_updated_at": 1,
+}
+
+
+def refresh_profile_batch(profiles: list) -> dict:
+    """
+    Bring a batch of profiles up to date with GitHub.
+
+    Each GitHub user is looked up through the shared `GitHubClient`, whose cache answers recent lookups without a request and revalidates older ones with `If-None-Match`, so an unchanged user costs at most a 304. Only profiles whose GitHub data changed are written, and only profiles whose GitHub `updated_at` moved are queued for a new screenshot.
+
+    Parameters:
+        profiles (list): The profiles, with at least the fields of `REFRESH_PROJECTION`.
+
+    Returns:
+        dict: The usernames per outcome:
+            - updated (list[str]): Profiles whose name, avatar or GitHub `updated_at` were written.
+            - recaptured (list[str]): Profiles queued for a new screenshot.
+            - unavailable (list[str]): Profiles GitHub did not answer for; they are left untouched until the next run.
+            - deferred (list[str]): Profiles whose lookup the GitHub rate limiter deferred; likewise left for the next run.
+
+    Note:
+        A profile without a stored `github_updated_at` predates change tracking. Its baseline is recorded without a re-capture; the screenshot taken at registration is kept.
+    """
+    result = {"updated": [], "recaptured": [], "unavailable": [], "deferred": []}
+    lookups = fetch_users_info(
+        [profile["github_username"] for profile in profiles],
+        wait=Config.GITHUB_RATE_TASK_WAIT,
+    )
+
+    for profile in profiles:
+        username = profile["github_username"]
+        if lookups[username] is None:
+            result["deferred"].append(username)
+            continue
+
+        response_code, response_data = lookups[username]
+        if response_code is None:
+            result["unavailable"].append(username)
+            continue
+
+        try:
+            github_data = github_profile_fields(response_data)
+        except ValueError as e:
+            print(f"Invalid GitHub data for {username}: {e}")
+            continue
+
+        changes = {
+            field: value
+            for field, value in github_data.items()
+            if profile.get(field) != value
+        }
+        if not changes:
+            continue
+
+        UserModel().update(data={"github_username": username, "user_data": changes})
+        result["updated"].append(username)
+
+        if "github_updated_at" in changes and profile.get("github_updated_at"):
+            result["recaptured"].append(username)
+
+    if result["recaptured"]:
+        async_capture_screenshots.delay(result["recaptured"])
+
+    return result
+
+
+@app.task
+def refresh_profiles(batch_size=None):
+    """
+    Celery beat task walking every profile and refreshing the ones that changed on GitHub.
+
+    Profiles are read in keyset pages of `batch_size`, projected to the compared fields, and handed to `refresh_profile_batch`. The cost of a run therefore scales with the number of changed profiles: unchanged ones cost one cheap conditional lookup, no write, no Chromium launch and no commit.
+
+    Parameters:
+        batch_size (int, optional): The number of profiles per batch. Defaults to `Config.REFRESH_BATCH_SIZE`.
+
+    Returns:
+        dict: The number of profiles `checked`, `updated`, `recaptured`, `unavailable` and `deferred`.
+    """
+    totals = {
+        "checked": 0,
+        "updated": 0,
+        "recaptured": 0,
+        "unavailable": 0,
+        "deferred": 0,
+    }
+
+    cursor = None
+    while True:
+        profiles, cursor = UserModel().paginate(
+            limit=batch_size or Config.REFRESH_BATCH_SIZE,
+            cursor=cursor,
+            projection=REFRESH_PROJECTION,
+        )
+        if profiles:
+            result = refresh_profile_batch(profiles)
+            totals["checked"] += len(profiles)
+            for key, usernames in result.items():
+                totals[key] += len(usernames)
+
+        if cursor is None:
+            return totals
+
+
+@app.task
+def rebuild_leaderboards():
+    """
+    Celery beat task rebuilding the Redis leaderboards from MongoDB.
+
+    Counter flushes keep the leaderboards current between runs; the rebuild reconciles any increment they missed and restores the leaderboards after Redis lost them.
+
+    Returns:
+        int: The number of profiles ranked.
+    """
+    return UserModel().rebuild_leaderboards()
+
+
+@app.task
+def publish_screenshots():
+    """
+    Celery beat task committing every staged screenshot as a single commit.
+
+    Returns:
+        str | None: The SHA of the new commit, or None if nothing was staged or the GitHub rate limit deferred the
+        commit. Deferred screenshots stay staged for the next run.
+    """
+    try:
+        return publisher.flush()
+    except RateLimitedError as e:
+        print(f"Publishing screenshots deferred: {e}")
+        return None
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_browser_pool(**kwargs):
+    """
+    Close the pooled Chromium instances when a worker process stops.
+    """
+    loop = browser_pool.loop
+    if loop is None or loop.is_closed() or loop.is_running():
+        return
+
+    loop.run_until_complete(browser_pool.close())
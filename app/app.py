@@ -1,5 +1,14 @@
 from flask import Flask
+
+from .api.V1.endpoints.media import media
+from .api.V1.endpoints.metrics import metrics
 from .api.V1.endpoints.user import user
+from .cli import db_cli
+from .config.config import Config
 
 app = Flask(__name__)
+app.config["USE_X_SENDFILE"] = Config.MEDIA_X_SENDFILE
 app.register_blueprint(user, url_prefix="/")
+app.register_blueprint(media)
+app.register_blueprint(metrics)
+app.cli.add_command(db_cli)
@@ -0,0 +1,26 @@
+import asyncio
+
+from quart import Quart
+
+from .api.V1.endpoints.aio_media import media
+from .api.V1.endpoints.aio_metrics import metrics
+from .api.V1.endpoints.aio_user import user
+from .github.aio import async_github_client
+from .models.user import User as UserModel
+
+app = Quart(__name__)
+app.register_blueprint(user, url_prefix="/")
+app.register_blueprint(media)
+app.register_blueprint(metrics)
+
+
+@app.before_serving
+async def create_indexes():
+    # Registrations rely on the unique github_username index to reject duplicates;
+    # an error here aborts the lifespan startup, so the worker never serves without it
+    await asyncio.to_thread(UserModel().ensure_startup_indexes)
+
+
+@app.after_serving
+async def close_clients():
+    await async_github_client.aclose()
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    A thread-safe, size-bounded LRU cache whose entries expire after a time-to-live.
+
+    Attributes:
+        maxsize (int): The maximum number of entries kept; the least recently used entry is evicted first.
+        ttl (float): The default lifetime of an entry in seconds.
+
+    Methods:
+        - get(key) -> object | None: Returns a live entry and marks it as recently used.
+        - set(key, value, ttl: float) -> None: Stores an entry.
+        - delete(key) -> None: Removes an entry.
+        - clear() -> None: Removes every entry.
+
+    Note:
+        - The cache is per process. Use it as the first tier in front of a shared store such as Redis.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a live entry, or None if it is missing or expired.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            object | None: The cached value.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None) -> None:
+        """
+        Store an entry.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+            ttl (float, optional): The lifetime of this entry in seconds. Defaults to `ttl`.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: The cache key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import threading
+
+import redis
+
+from app.cache.lru import TTLCache
+from app.cache.redis import get_redis
+from app.config.config import Config
+
+VERSION_KEY = "page:version"
+
+
+class PageCache:
+    """
+    A cache of rendered pages that is invalidated by bumping a data version.
+
+    Every cached page is stored under the data version that was current when it was rendered. A write to the profiles bumps the version, which orphans all earlier pages at once without having to enumerate them. Pages live in Redis so every worker shares them, with a per-process LRU as fallback when Redis is unavailable.
+
+    Attributes:
+        ttl (int): Seconds a rendered page is kept.
+
+    Methods:
+        - version() -> int: Returns the current data version.
+        - bump() -> None: Invalidates every cached page.
+        - get(key: str, version: int) -> dict | None: Returns a cached page `{"etag": str, "body": str}`.
+        - set(key: str, version: int, body: str) -> dict: Caches a rendered page and returns it with its ETag.
+
+    Note:
+        - The ETag is a hash of the body, so it is a valid strong validator: equal ETags always mean byte-identical responses.
+        - Without Redis, a bump is only seen by the process that made it; other workers catch up within `ttl`.
+    """
+
+    def __init__(self, ttl: int = None):
+        self.ttl = ttl or Config.PAGE_CACHE_TTL
+        self._local = TTLCache(maxsize=Config.PAGE_CACHE_MAXSIZE, ttl=self.ttl)
+        self._local_version = 0
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        """
+        Return the current data version.
+
+        Returns:
+            int: The version pages are currently rendered under.
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                return int(client.get(VERSION_KEY) or 0)
+            except redis.RedisError:
+                pass
+
+        return self._local_version
+
+    def bump(self) -> None:
+        """
+        Invalidate every cached page by moving to a new data version.
+        """
+        with self._lock:
+            self._local_version += 1
+        self._local.clear()
+
+        client = get_redis()
+        if client is not None:
+            try:
+                client.incr(VERSION_KEY)
+            except redis.RedisError as e:
+                print(f"Error bumping the page cache version: {e}")
+
+    def get(self, key: str, version: int) -> dict | None:
+        """
+        Return a cached page.
+
+        Args:
+            key (str): The page key, e.g. the request path and query string.
+            version (int): The data version returned by `version`.
+
+        Returns:
+            dict | None: `{"etag": str, "body": str}`, or None on a miss.
+        """
+        cache_key = self._cache_key(key, version)
+
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(cache_key)
+                return json.loads(raw) if raw is not None else None
+            except redis.RedisError:
+                pass
+
+        return self._local.get(cache_key)
+
+    def set(self, key: str, version: int, body: str) -> dict:
+        """
+        Cache a rendered page.
+
+        Args:
+            key (str): The page key.
+            version (int): The data version the page was rendered under.
+            body (str): The rendered page.
+
+        Returns:
+            dict: The cached page, `{"etag": str, "body": str}`.
+        """
+        page = {"etag": hashlib.sha256(body.encode()).hexdigest()[:32], "body": body}
+        cache_key = self._cache_key(key, version)
+
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(cache_key, json.dumps(page), ex=self.ttl)
+                return page
+            except redis.RedisError:
+                pass
+
+        self._local.set(cache_key, page)
+        return page
+
+    @staticmethod
+    def _cache_key(key: str, version: int) -> str:
+        return f"page:{version}:{key}"
+
+
+page_cache = PageCache()
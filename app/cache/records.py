@@ -0,0 +1,392 @@
+import asyncio
+import json
+import random
+import struct
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+import msgpack
+import redis
+from bson import ObjectId
+
+from app.cache.redis import get_redis, release_lock
+from app.config.config import Config
+from app.metrics.registry import RECORD_CACHE_REQUESTS
+
+# msgpack extension types for the BSON values a record may hold
+DATETIME_EXT = 1
+OBJECTID_EXT = 2
+
+EPOCH = datetime(1970, 1, 1)
+
+# Seconds a reader waits between checks while another process fills the cache
+POLL_INTERVAL = 0.01
+
+
+def _default(value):
+    """
+    Encode the values msgpack has no native type for.
+
+    Datetimes are stored as microseconds since the epoch. pymongo returns naive UTC datetimes, so aware ones are converted to UTC and decoded as naive as well.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        microseconds = (value - EPOCH) // timedelta(microseconds=1)
+        return msgpack.ExtType(DATETIME_EXT, struct.pack(">q", microseconds))
+    if isinstance(value, ObjectId):
+        return msgpack.ExtType(OBJECTID_EXT, value.binary)
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _ext_hook(code: int, data: bytes):
+    if code == DATETIME_EXT:
+        return EPOCH + timedelta(microseconds=struct.unpack(">q", data)[0])
+    if code == OBJECTID_EXT:
+        return ObjectId(data)
+    return msgpack.ExtType(code, data)
+
+
+def encode(record: dict | None) -> bytes:
+    """
+    Serialize a record, or a missing one, with msgpack.
+
+    Args:
+        record (dict | None): The record as returned by pymongo.
+
+    Returns:
+        bytes: The packed record.
+    """
+    return msgpack.packb(record, default=_default)
+
+
+def decode(raw: bytes) -> dict | None:
+    """
+    Deserialize a record packed by `encode`.
+
+    Args:
+        raw (bytes): The packed record.
+
+    Returns:
+        dict | None: A fresh copy of the record, or None for a cached miss.
+    """
+    return msgpack.unpackb(raw, ext_hook=_ext_hook)
+
+
+class RecordCache:
+    """
+    A read-through Redis cache of single records, keyed by github_username.
+
+    Every record is one Redis hash holding a field per projection it was read with, so a single DEL invalidates all of them. The hash expires `ttl` seconds after it was first filled, give or take `jitter`, so entries filled together by a burst do not all expire in the same second. Lookups of unknown usernames are cached as well.
+
+    A miss is loaded once, however many readers ask at the same time: threads of one process wait for the first one's result, and processes agree through a short-lived Redis lock, the losers polling the cache until the winner has filled it.
+
+    Attributes:
+        table (str): The table the records belong to, part of every key.
+        ttl (int): Seconds a record is cached; 0 disables the cache.
+        jitter (float): The fraction by which each TTL is randomly shortened or lengthened.
+        lock_timeout (float): Seconds a fill may hold the lock, and readers wait for it before reading the database themselves.
+
+    Methods:
+        - get(username: str, projection: dict, load: Callable) -> dict | None: Returns a cached record, loading it on a miss.
+        - aget(username: str, projection: dict, load: Callable) -> dict | None: The coroutine variant of `get`, for the ASGI app.
+        - invalidate(*usernames: str) -> None: Drops the cached records of the given users.
+
+    Note:
+        - Writers must call `invalidate` after changing a record. A fill that overlaps an invalidation is discarded rather than stored, since it may have read the record before the write.
+        - Without Redis every read goes to the database; a per-process copy could not be invalidated by the other workers.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        ttl: int = None,
+        jitter: float = None,
+        lock_timeout: float = None,
+    ):
+        self.table = table
+        self.ttl = Config.RECORD_CACHE_TTL if ttl is None else ttl
+        self.jitter = Config.RECORD_CACHE_TTL_JITTER if jitter is None else jitter
+        self.lock_timeout = (
+            Config.RECORD_CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+        )
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get(self, username: str, projection: dict, load) -> dict | None:
+        """
+        Return a record from the cache, loading and caching it on a miss.
+
+        Args:
+            username (str): The github_username of the record.
+            projection (dict | None): The projection the record is read with.
+            load (Callable[[], dict | None]): Reads the record from the database.
+
+        Returns:
+            dict | None: The record, or None if there is no such user.
+        """
+        client = self._client()
+        if client is None:
+            return load()
+
+        key, field = self._key(username), self._field(projection)
+        raw = self._read(client, key, field)
+        if raw is not None:
+            return decode(raw)
+
+        return decode(
+            self._coalesce((key, field), lambda: self._fill(client, key, field, load))
+        )
+
+    async def aget(self, username: str, projection: dict, load) -> dict | None:
+        """
+        Return a record from the cache, awaiting `load` on a miss.
+
+        Concurrent misses within the event loop are coalesced by the same Redis lock as those of other processes.
+
+        Args:
+            username (str): The github_username of the record.
+            projection (dict | None): The projection the record is read with.
+            load (Callable[[], Awaitable[dict | None]]): Reads the record from the database.
+
+        Returns:
+            dict | None: The record, or None if there is no such user.
+        """
+        client = self._client()
+        if client is None:
+            return await load()
+
+        key, field = self._key(username), self._field(projection)
+        raw = self._read(client, key, field)
+        if raw is not None:
+            return decode(raw)
+
+        try:
+            token = self._acquire(client, key, field)
+            if token is None:
+                deadline = time.monotonic() + self.lock_timeout
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(POLL_INTERVAL)
+                    raw = client.hget(key, field)
+                    if raw is not None:
+                        self._count("coalesced")
+                        return decode(raw)
+            pipe = self._watch(client, key)
+        except redis.RedisError:
+            return await load()
+
+        self._count("miss")
+        try:
+            raw = encode(await load())
+            self._store(pipe, key, field, raw)
+        finally:
+            pipe.reset()
+            self._release(client, key, field, token)
+
+        return decode(raw)
+
+    def invalidate(self, *usernames: str) -> None:
+        """
+        Drop the cached records of the given users, with every projection.
+
+        Args:
+            *usernames (str): The github_usernames of the changed records.
+        """
+        client = self._client()
+        if client is None or not usernames:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for username in usernames:
+                key = self._key(username)
+                pipe.incr(self._version_key(key))
+                pipe.expire(self._version_key(key), self.ttl)
+                pipe.delete(key)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Error invalidating cached {self.table} records: {e}")
+
+    def _client(self):
+        return get_redis() if self.ttl > 0 else None
+
+    def _key(self, username: str) -> str:
+        return f"record:{self.table}:{username}"
+
+    def _field(self, projection: dict | None) -> str:
+        if not projection:
+            return "*"
+        return json.dumps(projection, sort_keys=True, separators=(",", ":"))
+
+    def _version_key(self, key: str) -> str:
+        return f"{key}:version"
+
+    def _lock_key(self, key: str, field: str) -> str:
+        return f"{key}:lock:{field}"
+
+    def _count(self, outcome: str) -> None:
+        RECORD_CACHE_REQUESTS.labels(table=self.table, outcome=outcome).inc()
+
+    def _read(self, client, key: str, field: str) -> bytes | None:
+        try:
+            raw = client.hget(key, field)
+        except redis.RedisError:
+            return None
+
+        if raw is not None:
+            self._count("hit")
+        return raw
+
+    def _coalesce(self, flight: tuple, fill) -> bytes:
+        """
+        Run `fill` once for all threads of this process missing the same entry.
+
+        Returns:
+            bytes: The packed record; every caller decodes its own copy.
+        """
+        with self._lock:
+            future = self._inflight.get(flight)
+            leader = future is None
+            if leader:
+                future = self._inflight[flight] = Future()
+
+        if not leader:
+            self._count("coalesced")
+            return future.result()
+
+        try:
+            raw = fill()
+            future.set_result(raw)
+            return raw
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[flight]
+
+    def _fill(self, client, key: str, field: str, load) -> bytes:
+        """
+        Load a missing record and cache it, unless another process already is.
+
+        Returns:
+            bytes: The packed record.
+        """
+        try:
+            token = self._acquire(client, key, field)
+            if token is None:
+                raw = self._wait(client, key, field)
+                if raw is not None:
+                    self._count("coalesced")
+                    return raw
+            pipe = self._watch(client, key)
+        except redis.RedisError:
+            return encode(load())
+
+        self._count("miss")
+        try:
+            raw = encode(load())
+            self._store(pipe, key, field, raw)
+        finally:
+            pipe.reset()
+            self._release(client, key, field, token)
+
+        return raw
+
+    def _acquire(self, client, key: str, field: str) -> str | None:
+        """
+        Take the lock for filling an entry.
+
+        Returns:
+            str | None: The lock token, or None if another reader holds the lock.
+        """
+        token = uuid.uuid4().hex
+        acquired = client.set(
+            self._lock_key(key, field),
+            token,
+            nx=True,
+            px=int(self.lock_timeout * 1000),
+        )
+        return token if acquired else None
+
+    def _release(self, client, key: str, field: str, token: str | None) -> None:
+        """
+        Release the fill lock, unless it expired during a slow load and another reader holds it now.
+        """
+        if token is None:
+            return
+
+        try:
+            release_lock(client, self._lock_key(key, field), token)
+        except redis.RedisError:
+            pass
+
+    def _wait(self, client, key: str, field: str) -> bytes | None:
+        """
+        Poll the cache while another reader fills an entry.
+
+        Returns:
+            bytes | None: The packed record, or None if it did not appear within `lock_timeout`.
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            raw = client.hget(key, field)
+            if raw is not None:
+                return raw
+        return None
+
+    def _watch(self, client, key: str):
+        """
+        Start watching a record's version before it is read from the database.
+
+        Deleting a hash that does not exist yet would not trip a WATCH, so `invalidate` also increments a version counter, which always does.
+
+        Returns:
+            redis.client.Pipeline: The pipeline that stores the entry, see `_store`.
+        """
+        pipe = client.pipeline()
+        try:
+            pipe.watch(self._version_key(key))
+        except redis.RedisError:
+            pipe.reset()
+            raise
+        return pipe
+
+    def _store(self, pipe, key: str, field: str, raw: bytes) -> None:
+        """
+        Cache a loaded record, unless it was invalidated since `_watch`.
+
+        An invalidation in the meantime means the record may have been read before a write, so it is not stored.
+        """
+        ttl = max(1, round(self.ttl * random.uniform(1 - self.jitter, 1 + self.jitter)))
+        try:
+            pipe.multi()
+            pipe.hset(key, field, raw)
+            pipe.expire(key, ttl, nx=True)
+            pipe.execute()
+        except redis.RedisError:
+            pass
+
+
+_caches = {}
+
+
+def record_cache(table: str) -> RecordCache:
+    """
+    Return the record cache of a table, created once per process.
+
+    The cache is shared by every model instance of the table, so concurrent misses of one process are coalesced.
+
+    Args:
+        table (str): The table name.
+
+    Returns:
+        RecordCache: The cache.
+    """
+    if table not in _caches:
+        _caches[table] = RecordCache(table)
+    return _caches[table]
@@ -0,0 +1,58 @@
+import redis
+
+from app.config.config import Config
+
+_client = None
+
+
+def get_redis():
+    """
+    Return the shared Redis client for `Config.REDIS_SERVER`.
+
+    The client is created on first use. redis-py connection pools detect a fork and reconnect in the child on their own, so one module-level client is safe to share between gunicorn and Celery worker processes.
+
+    Returns:
+        redis.Redis | None: The client, or None if no Redis server is configured.
+
+    Note:
+        Callers treat Redis as an optional shared tier: they catch `redis.RedisError` and fall back to in-process state rather than failing the request.
+    """
+    global _client
+
+    if _client is None and Config.REDIS_SERVER:
+        _client = redis.Redis.from_url(
+            Config.REDIS_SERVER,
+            socket_timeout=Config.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=Config.REDIS_SOCKET_TIMEOUT,
+        )
+
+    return _client
+
+
+# Deletes a lock only while it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def release_lock(client: redis.Redis, key: str, token: str) -> bool:
+    """
+    Release a lock taken with `SET key token NX PX`, unless it expired and was taken by someone else meanwhile.
+
+    Comparing and deleting in one script keeps a slow holder from deleting the lock of the next one.
+
+    Args:
+        client (redis.Redis): The Redis client.
+        key (str): The lock key.
+        token (str): The unique value the lock was set to.
+
+    Returns:
+        bool: True if the lock was still held with `token` and is now released.
+
+    Raises:
+        redis.RedisError: If Redis is unavailable.
+    """
+    return bool(client.eval(RELEASE_LOCK_SCRIPT, 1, key, token))
@@ -0,0 +1,131 @@
+from itertools import islice
+
+import click
+from flask.cli import AppGroup
+
+from app.api.V1.endpoints.utils import register_profiles
+from app.config.config import Config
+from app.models.export import EXPORT_FORMATS, export_profiles, read_profiles
+from app.models.user import User as UserModel
+
+db_cli = AppGroup("db", help="Database maintenance commands.")
+
+
+@db_cli.command("init")
+def init_db():
+    """
+    Create the MongoDB indexes and backfill derived fields.
+
+    Safe to run repeatedly; existing indexes and populated fields are left untouched.
+    """
+    names = UserModel().ensure_indexes()
+    click.echo(f"Indexes ready: {', '.join(names)}")
+
+
+@db_cli.command("migrate-timestamps")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=1000,
+    show_default=True,
+    help="Documents converted per database round trip.",
+)
+def migrate_timestamps(batch_size):
+    """
+    Convert created_at/updated_at strings to native MongoDB dates.
+
+    Records written before timestamps were stored as UTC dates hold strings in the old Asia/Kolkata format. They are converted in batches while the app keeps serving; the command can be interrupted and re-run at any time.
+    """
+    converted = skipped = 0
+    for progress in UserModel().migrate_timestamps(batch_size=batch_size):
+        converted += progress["converted"]
+        skipped += progress["skipped"]
+        click.echo(
+            f"Converted {converted} timestamps (up to _id {progress['last_id']})"
+        )
+
+    click.echo(f"converted: {converted}, skipped: {skipped}")
+
+
+@db_cli.command("leaderboards")
+def rebuild_leaderboards():
+    """
+    Rebuild the Redis leaderboards of the trending, popular and hot listings.
+
+    Run once after deploying, and whenever Redis lost its data; the `rebuild_leaderboards` beat task repeats it every LEADERBOARD_REBUILD_INTERVAL seconds. Listings are served by MongoDB until the first rebuild.
+    """
+    count = UserModel().rebuild_leaderboards()
+    click.echo(f"Ranked {count} profiles")
+
+
+@db_cli.command("export")
+@click.option(
+    "--format",
+    "format",
+    type=click.Choice(list(EXPORT_FORMATS)),
+    default="ndjson",
+    show_default=True,
+)
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output.")
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="Documents per database round trip. Defaults to EXPORT_BATCH_SIZE.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("wb"),
+    default="-",
+    help="Output file. Defaults to stdout.",
+)
+def export_db(format, compress, batch_size, output):
+    """
+    Stream every profile to a file as NDJSON or CSV.
+
+    Rows are written as they are read, so exports of any size run in constant memory.
+    """
+    for chunk in export_profiles(
+        format=format, compress=compress, batch_size=batch_size
+    ):
+        output.write(chunk)
+
+
+@db_cli.command("import")
+@click.argument("source", type=click.File("r"))
+@click.option(
+    "--format",
+    "format",
+    type=click.Choice(list(EXPORT_FORMATS)),
+    default="ndjson",
+    show_default=True,
+)
+def import_db(source, format):
+    """
+    Register every profile listed in SOURCE.
+
+    SOURCE is an NDJSON or CSV file with a 'github_username' and optional 'email' and 'tags' per row, e.g. the output of `flask db export`. Profiles are registered in batches of BULK_MAX_PROFILES, each with parallel GitHub lookups, one insert and one screenshot job.
+    """
+    # Duplicates are only rejected by the unique index
+    UserModel().ensure_unique_indexes()
+
+    totals = {
+        "created": 0,
+        "deferred": 0,
+        "duplicates": 0,
+        "not_found": 0,
+        "invalid": 0,
+    }
+
+    profiles = read_profiles(source, format=format)
+    while batch := list(islice(profiles, Config.BULK_MAX_PROFILES)):
+        result = register_profiles(batch)
+        for key in totals:
+            totals[key] += len(result[key])
+        for invalid in result["invalid"]:
+            click.echo(
+                f"Skipped {invalid['github_username']}: {invalid['error']}", err=True
+            )
+
+    click.echo(", ".join(f"{key}: {count}" for key, count in totals.items()))
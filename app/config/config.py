@@ -15,11 +15,74 @@ class Config:
         - DB_URL (str): The URL for connecting to the database.
         - DB_NAME (str): The name of the database.
         - TABLE_NAME (str): The name of the table within the database.
+        - COUNTERS_TABLE_NAME (str): The name of the table holding the ID sequences.
+        - ID_BLOCK_SIZE (int): How many IDs a worker process reserves per sequence round trip.
+        - DB_MAX_POOL_SIZE (int): The maximum number of pooled connections per MongoDB client.
+        - DB_MIN_POOL_SIZE (int): The number of connections kept open per MongoDB client.
+        - DB_MAX_IDLE_TIME_MS (int): How long a pooled connection may stay idle before it is closed.
+        - DB_CONNECT_TIMEOUT_MS (int): The timeout for opening a connection to MongoDB.
+        - DB_SOCKET_TIMEOUT_MS (int): The timeout for a single MongoDB round trip.
+        - DB_SERVER_SELECTION_TIMEOUT_MS (int): How long to wait for a suitable MongoDB server.
+        - DB_WAIT_QUEUE_TIMEOUT_MS (int): How long to wait for a free pooled connection.
+        - DB_READ_PREFERENCE (str): The MongoDB read preference, e.g. 'primary' or 'secondaryPreferred'.
         - REDIS_SERVER (str): The URL or IP address of the Redis server.
+        - REDIS_SOCKET_TIMEOUT (float): Seconds to wait on Redis before falling back to in-process caches.
+        - PAGE_CACHE_TTL (int): Seconds a rendered gallery page is cached. Profile writes invalidate it earlier; view/like counts converge within this window.
+        - PAGE_CACHE_MAXSIZE (int): The number of rendered pages kept in each worker's in-process fallback cache.
+        - RECORD_CACHE_TTL (int): Seconds a profile looked up by username is cached in Redis; 0 disables the cache. Writes invalidate it earlier.
+        - RECORD_CACHE_TTL_JITTER (float): The fraction by which each record's TTL is randomly varied, so records cached together do not expire together.
+        - RECORD_CACHE_LOCK_TIMEOUT (float): Seconds concurrent lookups of an uncached record wait for the one loading it before reading the database themselves.
+        - SEARCH_INDEX_MIN_AGE (int): The minimum seconds between search index rebuilds triggered by profile writes.
+        - SEARCH_INDEX_MAX_AGE (int): Seconds after which the search index is rebuilt even without a recorded write.
+        - PAGE_SIZE (int): The default number of profiles rendered per gallery page.
+        - MAX_PAGE_SIZE (int): The upper bound a client may request through the `limit` query parameter.
+        - EXPORT_BATCH_SIZE (int): The number of documents fetched per MongoDB round trip while streaming an export.
+        - BULK_MAX_PROFILES (int): The maximum number of profiles accepted by one bulk registration.
+        - GITHUB_LOOKUP_CONCURRENCY (int): The number of GitHub user lookups run in parallel during a bulk registration.
+        - ASYNC_REGISTRATION (bool): Whether `POST /profile` stores a pending profile and answers 202 at once, leaving the GitHub lookup to a Celery task.
+        - ENRICHMENT_MAX_RETRIES (int): How often the enrichment task retries while GitHub is unreachable before it drops the pending profile.
+        - ENRICHMENT_RETRY_DELAY (float): Seconds between two attempts of the enrichment task.
+        - CREATE_INDEXES_ON_STARTUP (bool): Whether the app creates all of its MongoDB indexes when it starts. They can also be created with `flask db init`. The unique indexes are created on every start regardless, and the server refuses to start if they cannot be.
+        - COUNTER_FLUSH_INTERVAL (float): Seconds between flushes of buffered view/like increments. 0 writes every increment through immediately.
+        - COUNTER_FLUSH_MAX_PENDING (int): The number of buffered profiles that triggers an early flush.
+        - COUNTER_FLUSH_BATCH_SIZE (int): The maximum number of updates sent in one bulk write.
+        - PUPPETEER_EXECUTABLE_PATH (str): The Chromium binary used for screenshots.
+        - BROWSER_POOL_SIZE (int): The number of warm Chromium instances kept by each Celery worker process.
+        - BROWSER_PAGES_PER_BROWSER (int): The number of pages each Chromium instance may render concurrently.
+        - BROWSER_PAGE_MAX_USES (int): How many screenshots a page takes before it is closed and replaced.
+        - BROWSER_HEALTH_TIMEOUT (float): Seconds a Chromium instance has to answer a health check before it is relaunched.
+        - SCREENSHOT_CONCURRENCY (int): The number of captures a batch task drives concurrently.
+        - SCREENSHOT_WIDTHS (list[int]): The widths, in pixels, of the thumbnail variants generated per capture.
+        - SCREENSHOT_CROP_HEIGHT (int): The height, in source pixels, of the top-of-page region kept for thumbnails.
+        - SCREENSHOT_QUALITY (int): The encoder quality (0-100) of the WebP/AVIF variants.
         - GITHUB_TOKEN (str): GitHub personal access token with the necessary permissions.
+        - GITHUB_API_URL (str): The base URL of the GitHub REST API. Point it at a local stub for testing.
+        - GITHUB_TIMEOUT (float): Seconds to wait for a GitHub API response.
+        - GITHUB_CACHE_TTL (int): Seconds a cached GitHub user lookup is served without revalidation.
+        - GITHUB_NEGATIVE_CACHE_TTL (int): Seconds an unknown GitHub username is remembered.
+        - GITHUB_CACHE_STALE_TTL (int): Seconds an expired lookup is kept for cheap ETag revalidation.
+        - GITHUB_CACHE_MAXSIZE (int): The number of lookups kept in each worker's in-process cache.
+        - GITHUB_RATE_LIMIT (int): GitHub API requests per hour assumed until GitHub's rate limit headers say otherwise.
+        - GITHUB_RATE_BURST (int): The number of GitHub API requests any workers together may send back to back.
+        - GITHUB_RATE_WAIT (float): Seconds a web request waits for the rate limiter before its GitHub work is deferred.
+        - GITHUB_RATE_TASK_WAIT (float): Seconds a Celery task waits for the rate limiter before its GitHub work is deferred.
         - REPO_OWNER (str): Owner of the GitHub repository.
         - REPO_NAME (str): Name of the GitHub repository.
         - BRANCH (str): Default branch for GitHub operations.
+        - DISPLAY_TIMEZONE (str): The timezone timestamps are shown in on rendered pages. They are stored in UTC.
+        - PUBLISH_INTERVAL (float): Seconds between commits of queued screenshots to the GitHub repository.
+        - MEDIA_STORAGE (str): Where new screenshots are stored: 'local', 's3' or 'github'.
+        - MEDIA_ROOT (str): The directory of the 'local' storage, shared by the web and Celery workers.
+        - MEDIA_PUBLIC_URL (str): Base URL serving the screenshots of the configured backend directly, e.g. a CDN or public bucket. Defaults to the app's `/media` route, which also serves files of the previously configured backend.
+        - MEDIA_X_SENDFILE (bool): Whether the `/media` route hands local files to the front server through `X-Sendfile`.
+        - MEDIA_S3_BUCKET (str): The bucket of the 's3' storage.
+        - MEDIA_S3_PREFIX (str): The prefix of the object keys in the bucket.
+        - MEDIA_S3_ENDPOINT_URL (str): The S3 API endpoint, e.g. of a MinIO server. Unset for AWS.
+        - MEDIA_S3_REGION (str): The region of the bucket.
+        - REFRESH_INTERVAL (float): Seconds between runs of the job that refreshes profiles changed on GitHub.
+        - REFRESH_BATCH_SIZE (int): The number of profiles the refresh job reads and looks up per batch.
+        - LEADERBOARD_REBUILD_INTERVAL (float): Seconds between rebuilds of the Redis leaderboards from MongoDB.
+        - CELERY_METRICS_PORT (int): The port on which a Celery worker exposes its Prometheus metrics. 0 disables the endpoint.
 
     Note:
         Ensure that you have a .env file in the project root directory with the
@@ -31,11 +94,87 @@ class Config:
     DB_URL = os.environ.get("DB_URL")
     DB_NAME = os.environ.get("DB_NAME")
     TABLE_NAME = os.environ.get("PROFILE_TABLE_NAME")
+    COUNTERS_TABLE_NAME = os.environ.get("COUNTERS_TABLE_NAME", "counters")
+    ID_BLOCK_SIZE = int(os.environ.get("ID_BLOCK_SIZE", 20))
+
+    DB_MAX_POOL_SIZE = int(os.environ.get("DB_MAX_POOL_SIZE", 50))
+    DB_MIN_POOL_SIZE = int(os.environ.get("DB_MIN_POOL_SIZE", 0))
+    DB_MAX_IDLE_TIME_MS = int(os.environ.get("DB_MAX_IDLE_TIME_MS", 60000))
+    DB_CONNECT_TIMEOUT_MS = int(os.environ.get("DB_CONNECT_TIMEOUT_MS", 5000))
+    DB_SOCKET_TIMEOUT_MS = int(os.environ.get("DB_SOCKET_TIMEOUT_MS", 20000))
+    DB_SERVER_SELECTION_TIMEOUT_MS = int(
+        os.environ.get("DB_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    )
+    DB_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("DB_WAIT_QUEUE_TIMEOUT_MS", 5000))
+    DB_READ_PREFERENCE = os.environ.get("DB_READ_PREFERENCE", "primary")
+    CREATE_INDEXES_ON_STARTUP = (
+        os.environ.get("CREATE_INDEXES_ON_STARTUP", "false").lower() == "true"
+    )
+
     REDIS_SERVER = os.environ.get("REDIS_SERVER")
+    REDIS_SOCKET_TIMEOUT = float(os.environ.get("REDIS_SOCKET_TIMEOUT", 0.5))
+    PAGE_CACHE_TTL = int(os.environ.get("PAGE_CACHE_TTL", 60))
+    PAGE_CACHE_MAXSIZE = int(os.environ.get("PAGE_CACHE_MAXSIZE", 256))
+    RECORD_CACHE_TTL = int(os.environ.get("RECORD_CACHE_TTL", 300))
+    RECORD_CACHE_TTL_JITTER = float(os.environ.get("RECORD_CACHE_TTL_JITTER", 0.1))
+    RECORD_CACHE_LOCK_TIMEOUT = float(os.environ.get("RECORD_CACHE_LOCK_TIMEOUT", 0.5))
+    SEARCH_INDEX_MIN_AGE = int(os.environ.get("SEARCH_INDEX_MIN_AGE", 10))
+    SEARCH_INDEX_MAX_AGE = int(os.environ.get("SEARCH_INDEX_MAX_AGE", 300))
+
+    PAGE_SIZE = int(os.environ.get("PAGE_SIZE", 24))
+    MAX_PAGE_SIZE = int(os.environ.get("MAX_PAGE_SIZE", 100))
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+    BULK_MAX_PROFILES = int(os.environ.get("BULK_MAX_PROFILES", 500))
+    GITHUB_LOOKUP_CONCURRENCY = int(os.environ.get("GITHUB_LOOKUP_CONCURRENCY", 8))
+    ASYNC_REGISTRATION = os.environ.get("ASYNC_REGISTRATION", "false").lower() == "true"
+    ENRICHMENT_MAX_RETRIES = int(os.environ.get("ENRICHMENT_MAX_RETRIES", 5))
+    ENRICHMENT_RETRY_DELAY = float(os.environ.get("ENRICHMENT_RETRY_DELAY", 10))
+
+    COUNTER_FLUSH_INTERVAL = float(os.environ.get("COUNTER_FLUSH_INTERVAL", 2))
+    COUNTER_FLUSH_MAX_PENDING = int(os.environ.get("COUNTER_FLUSH_MAX_PENDING", 1000))
+    COUNTER_FLUSH_BATCH_SIZE = int(os.environ.get("COUNTER_FLUSH_BATCH_SIZE", 500))
 
     PUPPETEER_EXECUTABLE_PATH = os.environ.get("PUPPETEER_EXECUTABLE_PATH")
+    BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 1))
+    BROWSER_PAGES_PER_BROWSER = int(os.environ.get("BROWSER_PAGES_PER_BROWSER", 4))
+    BROWSER_PAGE_MAX_USES = int(os.environ.get("BROWSER_PAGE_MAX_USES", 50))
+    BROWSER_HEALTH_TIMEOUT = float(os.environ.get("BROWSER_HEALTH_TIMEOUT", 5))
+    SCREENSHOT_CONCURRENCY = int(os.environ.get("SCREENSHOT_CONCURRENCY", 4))
+    SCREENSHOT_WIDTHS = [
+        int(width)
+        for width in os.environ.get("SCREENSHOT_WIDTHS", "320,640,960").split(",")
+    ]
+    SCREENSHOT_CROP_HEIGHT = int(os.environ.get("SCREENSHOT_CROP_HEIGHT", 2160))
+    SCREENSHOT_QUALITY = int(os.environ.get("SCREENSHOT_QUALITY", 70))
 
     GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
+    GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+    GITHUB_TIMEOUT = float(os.environ.get("GITHUB_TIMEOUT", 5))
+    GITHUB_CACHE_TTL = int(os.environ.get("GITHUB_CACHE_TTL", 3600))
+    GITHUB_NEGATIVE_CACHE_TTL = int(os.environ.get("GITHUB_NEGATIVE_CACHE_TTL", 300))
+    GITHUB_CACHE_STALE_TTL = int(os.environ.get("GITHUB_CACHE_STALE_TTL", 86400))
+    GITHUB_CACHE_MAXSIZE = int(os.environ.get("GITHUB_CACHE_MAXSIZE", 1024))
+    GITHUB_RATE_LIMIT = int(os.environ.get("GITHUB_RATE_LIMIT", 5000))
+    GITHUB_RATE_BURST = int(os.environ.get("GITHUB_RATE_BURST", 100))
+    GITHUB_RATE_WAIT = float(os.environ.get("GITHUB_RATE_WAIT", 2))
+    GITHUB_RATE_TASK_WAIT = float(os.environ.get("GITHUB_RATE_TASK_WAIT", 30))
     REPO_OWNER = os.environ.get("REPO_OWNER")
     REPO_NAME = os.environ.get("REPO_NAME")
     BRANCH = os.environ.get("BRANCH")
+    DISPLAY_TIMEZONE = os.environ.get("DISPLAY_TIMEZONE", "Asia/Kolkata")
+    PUBLISH_INTERVAL = float(os.environ.get("PUBLISH_INTERVAL", 60))
+    MEDIA_STORAGE = os.environ.get("MEDIA_STORAGE", "local")
+    MEDIA_ROOT = os.environ.get("MEDIA_ROOT", "media")
+    MEDIA_PUBLIC_URL = os.environ.get("MEDIA_PUBLIC_URL")
+    MEDIA_X_SENDFILE = os.environ.get("MEDIA_X_SENDFILE", "false").lower() == "true"
+    MEDIA_S3_BUCKET = os.environ.get("MEDIA_S3_BUCKET")
+    MEDIA_S3_PREFIX = os.environ.get("MEDIA_S3_PREFIX", "profiles/")
+    MEDIA_S3_ENDPOINT_URL = os.environ.get("MEDIA_S3_ENDPOINT_URL")
+    MEDIA_S3_REGION = os.environ.get("MEDIA_S3_REGION")
+    REFRESH_INTERVAL = float(os.environ.get("REFRESH_INTERVAL", 21600))
+    REFRESH_BATCH_SIZE = int(os.environ.get("REFRESH_BATCH_SIZE", 100))
+    LEADERBOARD_REBUILD_INTERVAL = float(
+        os.environ.get("LEADERBOARD_REBUILD_INTERVAL", 3600)
+    )
+
+    CELERY_METRICS_PORT = int(os.environ.get("CELERY_METRICS_PORT", 0))
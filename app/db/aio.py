@@ -0,0 +1,198 @@
+import asyncio
+import os
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.config.config import Config
+from app.exceptions.custom_exceptions import DuplicateRecordError
+from app.metrics.mongo import command_metrics
+
+from .base import DataBase
+from .client import ClientRegistry
+
+
+class AsyncClientRegistry(ClientRegistry):
+    """
+    A per-process registry of pooled Motor clients for the ASGI app.
+
+    Behaves like `ClientRegistry`, including discarding clients inherited across a fork, but hands out `AsyncIOMotorClient` instances built with the same pool settings.
+
+    Note:
+        - A Motor client attaches to the event loop of its first operation. ASGI servers run one event loop per worker process, so one client per process and URL is enough.
+    """
+
+    def _create_client(self, db_url: str) -> AsyncIOMotorClient:
+        """
+        Build a Motor client using the pool settings from `Config`.
+
+        Args:
+            db_url (str): The database connection URL.
+
+        Returns:
+            motor.motor_asyncio.AsyncIOMotorClient: A lazily connecting client.
+        """
+        return AsyncIOMotorClient(
+            db_url,
+            connect=False,
+            maxPoolSize=Config.DB_MAX_POOL_SIZE,
+            minPoolSize=Config.DB_MIN_POOL_SIZE,
+            maxIdleTimeMS=Config.DB_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=Config.DB_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=Config.DB_SOCKET_TIMEOUT_MS,
+            serverSelectionTimeoutMS=Config.DB_SERVER_SELECTION_TIMEOUT_MS,
+            waitQueueTimeoutMS=Config.DB_WAIT_QUEUE_TIMEOUT_MS,
+            readPreference=Config.DB_READ_PREFERENCE,
+            event_listeners=[command_metrics],
+        )
+
+
+async_registry = AsyncClientRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=async_registry._check_pid)
+
+
+class AsyncDataBase(DataBase):
+    """
+    The non-blocking counterpart of `DataBase`, backed by Motor.
+
+    Validation, ID allocation and update building are inherited from `DataBase`, so both variants read and write identical documents. Only the round trips differ: every operation is a coroutine that yields to the event loop while MongoDB works.
+
+    Attributes:
+        database_url (str): The URL of the connected MongoDB instance.
+        mongod (motor.motor_asyncio.AsyncIOMotorClient): The pooled Motor client shared by every `AsyncDataBase` in the current process.
+
+    Methods:
+        - upload(): Inserts data into a specified database and collection.
+        - query(): Retrieves data from a specified database and collection based on provided filters.
+        - update(): Updates data in a specified database and collection based on provided filters.
+
+    Note:
+        - Bulk queries are fully read into a list; the listing paths using them are bounded by a `limit`.
+        - `_id` blocks are still reserved through the synchronous `SequenceAllocator`, which runs in a thread so the rare round trip for a new block never blocks the event loop.
+    """
+
+    def connect(self):
+        """
+        Return the Motor client for the configured MongoDB instance.
+
+        Returns:
+            motor.motor_asyncio.AsyncIOMotorClient: The pooled client owned by the current process.
+        """
+        return async_registry.get_client(self.database_url)
+
+    async def upload(self, db_name=None, table_name=None, data=None):
+        """Insert data into a specified database and collection.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            data (dict or list): The data to be inserted.
+                - If dict, used for single insertion.
+                - If list, used for bulk insertion.
+
+        Returns:
+            pymongo.InsertOneResult or pymongo.InsertManyResult: The response object indicating the result of the insertion.
+
+        Raises:
+            DuplicateRecordError: If inserted records violate a unique index. Lists are inserted unordered, so every other record is still inserted; the positions of the rejected ones are in `duplicates`.
+            pymongo.errors.BulkWriteError: If a bulk insertion fails for any other reason.
+        """
+        self.validate(db_name, table_name, data_opt=True, data=data)
+
+        database = self.mongod[db_name]
+        dataset = database[table_name]
+
+        await asyncio.to_thread(self._assign_ids, db_name, table_name, data)
+
+        if isinstance(data, dict):
+            try:
+                response = await dataset.insert_one(data)
+            except DuplicateKeyError as e:
+                raise DuplicateRecordError(str((e.details or {}).get("keyValue") or e))
+        else:
+            try:
+                response = await dataset.insert_many(data, ordered=False)
+            except BulkWriteError as e:
+                raise self._bulk_insert_error(e, data)
+
+        return response
+
+    async def query(
+        self,
+        db_name=None,
+        table_name=None,
+        filter=None,
+        bulk=False,
+        pipeline=None,
+        sort=None,
+        limit=None,
+        projection=None,
+    ):
+        """Retrieve data from a specified database and collection based on filters.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            filter (dict): The filter to be applied to the search query.
+            bulk (bool): If True, multiple results will be returned.
+            pipeline (list, optional): An aggregation pipeline to run instead of a plain query.
+            sort (dict, optional): The sort specification applied to bulk queries.
+            limit (int, optional): The maximum number of documents returned by bulk queries.
+            projection (dict, optional): The fields returned by plain queries.
+
+        Returns:
+            list[dict] or dict: The retrieved documents, or a single document unless `bulk` or `pipeline` is given.
+        """
+        self.validate(
+            db_name,
+            table_name,
+            filter_opt=True if filter else False,
+            filter=filter,
+            bulk=bulk,
+        )
+
+        database = self.mongod[db_name]
+        dataset = database[table_name]
+
+        if pipeline:
+            return await dataset.aggregate(pipeline).to_list(length=None)
+
+        if bulk:
+            cursor = dataset.find(filter or {}, projection)
+            if sort:
+                cursor = cursor.sort(list(sort.items()))
+            if limit:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(length=None)
+
+        return await dataset.find_one(filter or {}, projection)
+
+    async def update(
+        self, db_name=None, table_name=None, data=None, bulk=False, derived=None
+    ):
+        """Update data in a specified database and collection based on filters.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            data (dict): The data to be updated.
+            bulk (bool): If True, multiple results will be updated.
+            derived (dict, optional): Fields recomputed from the updated document, see `DataBase.update`.
+
+        Returns:
+            pymongo.UpdateResult: The response object indicating the result of the update operation.
+        """
+        self.validate(db_name, table_name, data_opt=True, data=data, bulk=bulk)
+
+        database = self.mongod[db_name]
+        dataset = database[table_name]
+
+        update = self._update_document(data, derived)
+        filter = {"github_username": data["github_username"]}
+
+        if bulk:
+            return await dataset.update_many(filter, update)
+
+        return await dataset.update_one(filter, update)
@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
-import pymongo
-import pytz
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from app.exceptions.custom_exceptions import MissingAttributeError
+from app.exceptions.custom_exceptions import DuplicateRecordError, MissingAttributeError
+
+from .client import registry
+from .sequence import get_allocator
 
 
 class DataBase:
@@ -17,7 +19,7 @@ class DataBase:
 
     Attributes:
         database_url (str): The URL of the connected MongoDB instance.
-        mongod (pymongo.MongoClient): The MongoDB client instance established using the provided URL.
+        mongod (pymongo.MongoClient): The pooled MongoDB client shared by every `DataBase` in the current process.
 
     Methods:
         - connect(): Establishes a connection to the MongoDB instance.
@@ -25,11 +27,14 @@ class DataBase:
         - upload(): Inserts data into a specified database and collection.
         - query(): Retrieves data from a specified database and collection based on provided filters.
         - update(): Updates data in a specified database and collection based on provided filters.
+        - bulk_write(): Sends a batch of write operations to a specified database and collection in one round trip.
+        - create_indexes(): Creates indexes on a specified database and collection.
         - delete(): Deletes data from a specified database and collection based on provided filters.
 
     Notes:
         - This class is designed for MongoDB database interactions.
         - You can connect to a MongoDB instance by providing the `db_url` parameter during initialization.
+        - Instances are cheap to create: the underlying client comes from the process-wide `ClientRegistry`, so no connection is opened per instance.
         - The provided methods handle data validation and various database operations.
     """
 
@@ -50,15 +55,22 @@ class DataBase:
                 f"Expected a str for 'db_url' but received a {type(db_url).__name__}."
             )
         self.database_url = db_url
-        self.mongod = self.connect()
+
+    @property
+    def mongod(self):
+        """The pooled MongoDB client for `database_url`.
+
+        Resolved on every access so that an instance which outlives a fork picks up the child's client instead of the parent's.
+        """
+        return self.connect()
 
     def connect(self):
-        """Establish a connection to the MongoDB instance.
+        """Return the pooled client for the MongoDB instance.
 
         Returns:
-            pymongo.MongoClient: The MongoDB client instance.
+            pymongo.MongoClient: The MongoDB client instance owned by the current process.
         """
-        return pymongo.MongoClient(self.database_url)
+        return registry.get_client(self.database_url)
 
     def validate(
         self,
@@ -134,31 +146,46 @@ class DataBase:
 
         Returns:
             pymongo.InsertOneResult or pymongo.InsertManyResult: The response object indicating the result of the insertion.
+
+        Raises:
+            DuplicateRecordError: If inserted records violate a unique index. Lists are inserted unordered, so every other record is still inserted; the positions of the rejected ones are in `duplicates`.
+            pymongo.errors.BulkWriteError: If a bulk insertion fails for any other reason.
+
+        Note:
+            Records without a `user_uuid` get their `_id` from the collection's `SequenceAllocator`, which hands out IDs from a block reserved atomically per worker process.
         """
         self.validate(db_name, table_name, data_opt=True, data=data)
 
         database = self.mongod[db_name]
         dataset = database[table_name]
 
-        if data["user_uuid"] is None:
-            try:
-                user_id = (
-                    dataset.find().sort("_id", pymongo.DESCENDING).limit(1)[0]["_id"]
-                )
-            except Exception as e:
-                user_id = 0
-
-            del data["user_uuid"]
-            data.update({"_id": user_id + 1})
+        self._assign_ids(db_name, table_name, data)
 
         if isinstance(data, dict):
-            response = dataset.insert_one(data)
+            try:
+                response = dataset.insert_one(data)
+            except DuplicateKeyError as e:
+                raise DuplicateRecordError(str((e.details or {}).get("keyValue") or e))
         else:
-            response = dataset.insert_many(data)
+            try:
+                response = dataset.insert_many(data, ordered=False)
+            except BulkWriteError as e:
+                raise self._bulk_insert_error(e, data)
 
         return response
 
-    def query(self, db_name=None, table_name=None, filter=None, bulk=False, pipeline=None):
+    def query(
+        self,
+        db_name=None,
+        table_name=None,
+        filter=None,
+        bulk=False,
+        pipeline=None,
+        sort=None,
+        limit=None,
+        projection=None,
+        batch_size=None,
+    ):
         """Retrieve data from a specified database and collection based on filters.
 
         Args:
@@ -166,6 +193,11 @@ class DataBase:
             table_name (str): The name of the collection (table).
             filter (dict): The filter to be applied to the search query.
             bulk (bool): If True, multiple results will be returned.
+            pipeline (list, optional): An aggregation pipeline to run instead of a plain query.
+            sort (dict, optional): The sort specification applied to bulk queries.
+            limit (int, optional): The maximum number of documents returned by bulk queries.
+            projection (dict, optional): The fields returned by plain queries, so unused fields never leave the server. Pipelines carry their own `$project` stage.
+            batch_size (int, optional): The number of documents fetched per round trip by bulk queries.
 
         Returns:
             pymongo.cursor.Cursor or dict: The retrieved data.
@@ -180,22 +212,31 @@ class DataBase:
 
         database = self.mongod[db_name]
         dataset = database[table_name]
-        
+
         if pipeline:
             response = dataset.aggregate(pipeline)
         elif bulk:
             if filter:
-                response = dataset.find(filter)
+                response = dataset.find(filter, projection)
             else:
-                response = dataset.find()
+                response = dataset.find({}, projection)
+
+            if sort:
+                response = response.sort(list(sort.items()))
+            if limit:
+                response = response.limit(limit)
+            if batch_size:
+                response = response.batch_size(batch_size)
         elif filter:
-            response = dataset.find_one(filter)
+            response = dataset.find_one(filter, projection)
         else:
-            response = dataset.find_one()
+            response = dataset.find_one({}, projection)
 
         return response
 
-    def update(self, db_name=None, table_name=None, data=None, bulk=False):
+    def update(
+        self, db_name=None, table_name=None, data=None, bulk=False, derived=None
+    ):
         """Update data in a specified database and collection based on filters.
 
         Args:
@@ -203,6 +244,8 @@ class DataBase:
             table_name (str): The name of the collection (table).
             data (dict): The data to be updated.
             bulk (bool): If True, multiple results will be updated.
+            derived (dict, optional): Fields recomputed from the updated document, as aggregation expressions keyed by field name.
+                When given, the update is sent as a pipeline so the derived fields see the new values in the same atomic write.
 
         Returns:
             pymongo.UpdateResult: The response object indicating the result of the update operation.
@@ -212,10 +255,7 @@ class DataBase:
         database = self.mongod[db_name]
         dataset = database[table_name]
 
-        data.get("user_data")["updated_at"] = datetime.now(
-            pytz.timezone("Asia/Kolkata")
-        ).strftime("%Y-%m-%d || %H:%M:%S:%f")
-        update = {"$set": data["user_data"]}
+        update = self._update_document(data, derived)
 
         if bulk:
             response = dataset.update_many(
@@ -228,6 +268,106 @@ class DataBase:
 
         return response
 
+    def _assign_ids(self, db_name, table_name, data):
+        """Give records without a `user_uuid` an `_id` from the collection's `SequenceAllocator`.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            data (dict or list): The record, or records, about to be inserted. Updated in place.
+        """
+        records = [data] if isinstance(data, dict) else data
+        new_records = [record for record in records if record.get("user_uuid") is None]
+        if new_records:
+            allocator = get_allocator(self.database_url, db_name, table_name)
+            for record, user_id in zip(
+                new_records, allocator.allocate(len(new_records))
+            ):
+                record.pop("user_uuid", None)
+                record.update({"_id": user_id})
+
+    @staticmethod
+    def _bulk_insert_error(error, data):
+        """Map a failed unordered `insert_many` to the error `upload` raises.
+
+        Args:
+            error (pymongo.errors.BulkWriteError): The error of the insertion.
+            data (list): The records that were inserted.
+
+        Returns:
+            Exception: A `DuplicateRecordError` listing the rejected positions if every rejection was a unique index violation, otherwise `error` itself.
+        """
+        errors = error.details.get("writeErrors", [])
+        if not errors or any(e.get("code") != 11000 for e in errors):
+            return error
+        return DuplicateRecordError(
+            f"{len(errors)} of {len(data)} records already exist",
+            duplicates=[e["index"] for e in errors],
+        )
+
+    @staticmethod
+    def _update_document(data, derived=None):
+        """Build the update sent by `update`, stamping `updated_at` on the new user data with the current UTC time.
+
+        Args:
+            data (dict): The data to be updated, with the new values under `user_data`.
+            derived (dict, optional): Fields recomputed from the updated document.
+
+        Returns:
+            dict or list: A `$set` update, or an update pipeline when `derived` is given.
+        """
+        data.get("user_data")["updated_at"] = datetime.now(timezone.utc)
+        if derived:
+            # Values are wrapped in $literal so strings starting with "$" are
+            # not mistaken for field paths inside the pipeline
+            return [
+                {"$set": {k: {"$literal": v} for k, v in data["user_data"].items()}},
+                {"$set": derived},
+            ]
+
+        return {"$set": data["user_data"]}
+
+    def bulk_write(self, db_name=None, table_name=None, operations=None, ordered=False):
+        """Send a batch of write operations to a specified database and collection.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            operations (list): The `pymongo` write operations (e.g. `UpdateOne`) to execute.
+            ordered (bool): If True, stop at the first failing operation.
+
+        Returns:
+            pymongo.results.BulkWriteResult: The response object indicating the result of the bulk write.
+        """
+        self.validate(db_name, table_name, data_opt=True, data=operations)
+
+        database = self.mongod[db_name]
+        dataset = database[table_name]
+        response = dataset.bulk_write(operations, ordered=ordered)
+
+        return response
+
+    def create_indexes(self, db_name=None, table_name=None, indexes=None):
+        """Create indexes on a specified database and collection.
+
+        Creating an index that already exists with the same definition is a no-op, so this is safe to run on every startup.
+
+        Args:
+            db_name (str): The name of the database.
+            table_name (str): The name of the collection (table).
+            indexes (list): The `pymongo.IndexModel` definitions to create.
+
+        Returns:
+            list[str]: The names of the indexes.
+        """
+        self.validate(db_name, table_name, data_opt=True, data=indexes)
+
+        database = self.mongod[db_name]
+        dataset = database[table_name]
+        response = dataset.create_indexes(indexes)
+
+        return response
+
     def delete(self, db_name=None, table_name=None, filter=None):
         """
         Delete data from a specified database collection based on a filter.
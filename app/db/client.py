@@ -0,0 +1,127 @@
+import os
+import threading
+
+import pymongo
+
+from app.config.config import Config
+from app.metrics.mongo import command_metrics
+
+
+class ClientRegistry:
+    """
+    A per-process registry of pooled MongoDB clients.
+
+    `pymongo.MongoClient` owns a connection pool, monitoring threads and the server discovery state, so it is meant to be created once per process and shared. This registry hands out one client per connection URL and keeps it for the lifetime of the process, so request handlers no longer pay for a TCP handshake and server discovery on every call.
+
+    Attributes:
+        _clients (dict): The clients created by this process, keyed by connection URL.
+        _pid (int): The id of the process that owns `_clients`.
+        _lock (threading.Lock): Guards `_clients` against concurrent creation from worker threads.
+
+    Methods:
+        - get_client(db_url: str) -> pymongo.MongoClient: Returns the shared client for a URL, creating it on first use.
+        - register(db_url: str, client) -> None: Installs an externally built client for a URL.
+        - reset() -> None: Forgets every client owned by this process.
+
+    Note:
+        - PyMongo clients are not fork-safe. Gunicorn imports the application in the master process and then forks its workers, so any client inherited from the parent is discarded and a fresh one is created lazily on first use in the child.
+        - Clients are created with `connect=False`; the first database operation opens the pool, never the import or the fork.
+        - Every client reports its commands to the `CommandMetrics` listener, which feeds the latency and document count metrics on `/metrics`.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _check_pid(self):
+        """
+        Drop clients inherited from a parent process.
+
+        The inherited clients are not closed: their sockets and monitor threads belong to the parent, so closing them from the child would tear down the parent's connections.
+        """
+        if self._pid != os.getpid():
+            self._clients = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+
+    def get_client(self, db_url: str) -> pymongo.MongoClient:
+        """
+        Return the shared client for a connection URL.
+
+        Args:
+            db_url (str): The database connection URL.
+
+        Returns:
+            pymongo.MongoClient: The pooled client owned by the current process.
+        """
+        self._check_pid()
+
+        client = self._clients.get(db_url)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(db_url)
+            if client is None:
+                client = self._create_client(db_url)
+                self._clients[db_url] = client
+
+        return client
+
+    def register(self, db_url: str, client) -> None:
+        """
+        Install an externally built client for a connection URL.
+
+        Useful for benchmarks and local tooling that want `DataBase` to talk to an in-process fake instead of a real server.
+
+        Args:
+            db_url (str): The database connection URL the client should answer for.
+            client: A `pymongo.MongoClient` compatible object.
+        """
+        self._check_pid()
+
+        with self._lock:
+            self._clients[db_url] = client
+
+    def reset(self) -> None:
+        """
+        Close and forget every client owned by the current process.
+        """
+        self._check_pid()
+
+        with self._lock:
+            clients, self._clients = self._clients, {}
+
+        for client in clients.values():
+            client.close()
+
+    def _create_client(self, db_url: str) -> pymongo.MongoClient:
+        """
+        Build a client using the pool settings from `Config`.
+
+        Args:
+            db_url (str): The database connection URL.
+
+        Returns:
+            pymongo.MongoClient: A lazily connecting client.
+        """
+        return pymongo.MongoClient(
+            db_url,
+            connect=False,
+            maxPoolSize=Config.DB_MAX_POOL_SIZE,
+            minPoolSize=Config.DB_MIN_POOL_SIZE,
+            maxIdleTimeMS=Config.DB_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=Config.DB_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=Config.DB_SOCKET_TIMEOUT_MS,
+            serverSelectionTimeoutMS=Config.DB_SERVER_SELECTION_TIMEOUT_MS,
+            waitQueueTimeoutMS=Config.DB_WAIT_QUEUE_TIMEOUT_MS,
+            readPreference=Config.DB_READ_PREFERENCE,
+            event_listeners=[command_metrics],
+        )
+
+
+registry = ClientRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._check_pid)
@@ -0,0 +1,146 @@
+import os
+import threading
+
+import pymongo
+from pymongo import ReturnDocument
+
+from app.config.config import Config
+
+from .client import registry
+
+
+class SequenceAllocator:
+    """
+    Allocates increasing integer IDs for a collection from a shared counters collection.
+
+    Each worker process atomically reserves a block of IDs with a single `find_one_and_update` `$inc` and then hands them out from memory, so concurrent workers never receive the same ID and most inserts need no extra round trip.
+
+    Attributes:
+        _database_url (str): The connection URL of the database holding the counters collection.
+        _db_name (str): The name of the database.
+        _table_name (str): The name of the collection the IDs are allocated for.
+        _block_size (int): How many IDs are reserved per round trip.
+
+    Methods:
+        - allocate(count: int) -> list[int]: Returns `count` unused IDs.
+
+    Note:
+        - IDs are unique and increasing per process but not gap-free: a block that is only partially used when a worker exits is never reissued.
+        - On first use the sequence is raised to the collection's current maximum `_id` with `$max`, so collections populated before the sequence existed keep working.
+    """
+
+    def __init__(
+        self, database_url: str, db_name: str, table_name: str, block_size: int
+    ):
+        self._database_url = database_url
+        self._db_name = db_name
+        self._table_name = table_name
+        self._block_size = max(block_size, 1)
+        self._next = 0
+        self._end = 0
+        self._seeded = False
+        self._lock = threading.Lock()
+
+    @property
+    def _key(self) -> str:
+        return f"{self._table_name}._id"
+
+    def allocate(self, count: int = 1) -> list[int]:
+        """
+        Return `count` unused IDs.
+
+        Args:
+            count (int): The number of IDs needed.
+
+        Returns:
+            list[int]: The allocated IDs in increasing order.
+        """
+        ids = []
+        with self._lock:
+            while len(ids) < count:
+                if self._next >= self._end:
+                    self._reserve(max(self._block_size, count - len(ids)))
+
+                take = min(count - len(ids), self._end - self._next)
+                ids.extend(range(self._next, self._next + take))
+                self._next += take
+
+        return ids
+
+    def _reserve(self, size: int) -> None:
+        database = registry.get_client(self._database_url)[self._db_name]
+        counters = database[Config.COUNTERS_TABLE_NAME]
+
+        if not self._seeded:
+            self._seed(database, counters)
+
+        sequence = counters.find_one_and_update(
+            {"_id": self._key},
+            {"$inc": {"seq": size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        self._end = sequence["seq"] + 1
+        self._next = self._end - size
+
+    def _seed(self, database, counters) -> None:
+        dataset = database[self._table_name]
+        latest = dataset.find_one(
+            {"_id": {"$type": "number"}},
+            projection={"_id": 1},
+            sort=[("_id", pymongo.DESCENDING)],
+        )
+        if latest is not None:
+            counters.update_one(
+                {"_id": self._key}, {"$max": {"seq": latest["_id"]}}, upsert=True
+            )
+        self._seeded = True
+
+
+_allocators = {}
+_allocators_pid = os.getpid()
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(database_url: str, db_name: str, table_name: str):
+    """
+    Return the process-wide allocator for a collection.
+
+    Args:
+        database_url (str): The database connection URL.
+        db_name (str): The name of the database.
+        table_name (str): The name of the collection.
+
+    Returns:
+        SequenceAllocator: The allocator owned by the current process.
+    """
+    global _allocators, _allocators_pid, _allocators_lock
+
+    # Reserved blocks must not be shared with forked children
+    if _allocators_pid != os.getpid():
+        _allocators = {}
+        _allocators_lock = threading.Lock()
+        _allocators_pid = os.getpid()
+
+    key = (database_url, db_name, table_name)
+    with _allocators_lock:
+        allocator = _allocators.get(key)
+        if allocator is None:
+            allocator = SequenceAllocator(
+                database_url, db_name, table_name, block_size=Config.ID_BLOCK_SIZE
+            )
+            _allocators[key] = allocator
+
+    return allocator
+
+
+def reset_allocators() -> None:
+    """
+    Forget every allocator of the current process.
+
+    Blocks already reserved are abandoned, so the next allocation reads the counters table again. Needed after the counters table or the collection has been reset, e.g. when a benchmark reseeds its data.
+    """
+    global _allocators
+
+    with _allocators_lock:
+        _allocators = {}
@@ -16,3 +16,60 @@ class MissingAttributeError(Exception):
     """
 
     pass
+
+
+class InvalidCursorError(ValueError):
+    """
+    Exception raised when a pagination cursor cannot be decoded.
+
+    Continuation tokens are opaque to clients. This exception is raised when a token has been tampered with, truncated, or was issued for a different listing than the one it is being replayed against.
+
+    Attributes:
+        message (str): A descriptive error message explaining why the cursor was rejected.
+
+    Example:
+        >>> raise InvalidCursorError("Cursor was issued for a different sort order")
+        InvalidCursorError: Cursor was issued for a different sort order
+    """
+
+    pass
+
+
+class DuplicateRecordError(Exception):
+    """
+    Exception raised when a write violates a unique index.
+
+    This custom exception wraps the database driver's duplicate-key error so that callers can react to a conflicting record (for example, an already registered GitHub username) without depending on driver-specific exception types.
+
+    Attributes:
+        message (str): A descriptive error message identifying the conflicting record.
+        duplicates (list[int]): For bulk inserts, the positions of the rejected records in the inserted list. Every other record was inserted.
+
+    Example:
+        >>> raise DuplicateRecordError("github_username 'mramitdas' already exists")
+        DuplicateRecordError: github_username 'mramitdas' already exists
+    """
+
+    def __init__(self, message: str = "", duplicates: list = None):
+        super().__init__(message)
+        self.duplicates = duplicates or []
+
+
+class RateLimitedError(Exception):
+    """
+    Exception raised when a GitHub API call is deferred by the shared rate limiter.
+
+    This custom exception is raised instead of sending a request that GitHub would reject, either because the shared token bucket is empty or because GitHub answered with a primary or secondary rate limit. Callers are expected to defer the work, e.g. retry a task later or serve a stale cached answer, rather than report a failure.
+
+    Attributes:
+        message (str): A descriptive error message explaining why the call was deferred.
+        retry_after (float): Seconds until a request is expected to be accepted again.
+
+    Example:
+        >>> raise RateLimitedError("GitHub rate limit reached", retry_after=42)
+        RateLimitedError: GitHub rate limit reached
+    """
+
+    def __init__(self, message: str = "", retry_after: float = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
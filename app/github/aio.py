@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+
+from app.exceptions.custom_exceptions import RateLimitedError
+
+from .client import GitHubClient
+
+
+class AsyncGitHubClient(GitHubClient):
+    """
+    The non-blocking counterpart of `GitHubClient`, for the ASGI app.
+
+    Requests go through a keep-alive `httpx.AsyncClient`, so a worker keeps serving other requests while it waits on GitHub. Lookups share the two-tier cache, entry format, rate limiter and stale-on-error behaviour of `GitHubClient`, so both apps warm the same Redis entries and draw from the same token bucket.
+
+    Methods:
+        - get_user(username: str, wait: float) -> tuple[int | None, dict]: Fetches a GitHub user, using the cache where possible.
+        - request(method: str, path: str, wait: float, **kwargs) -> httpx.Response: Sends a raw API request over the shared client.
+        - aclose() -> None: Closes the HTTP client.
+
+    Note:
+        - `httpx.AsyncClient` is bound to the event loop it was first used on, so the client is recreated when the loop changes, e.g. between test runs.
+        - Cache reads and writes, like rate limiter updates, are plain Redis calls; they take well under a millisecond and are made directly from the event loop.
+    """
+
+    def __init__(self, base_url: str = None, token: str = None, timeout: float = None):
+        super().__init__(base_url=base_url, token=token, timeout=timeout)
+        self._client = None
+        self._loop = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The keep-alive HTTP client owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            headers = {
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "AwesomeBioVault",
+            }
+            if self._token:
+                headers["Authorization"] = f"Bearer {self._token}"
+
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=10),
+            )
+            self._loop = loop
+
+        return self._client
+
+    async def request(
+        self, method: str, path: str, wait: float = None, **kwargs
+    ) -> httpx.Response:
+        """
+        Send a raw API request over the shared client, once the rate limiter allows it.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The API path, e.g. '/users/mramitdas'.
+            wait (float, optional): Seconds to wait for the rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
+            **kwargs: Extra arguments for `httpx.AsyncClient.request`.
+
+        Returns:
+            httpx.Response: The response.
+
+        Raises:
+            RateLimitedError: If the rate limiter defers the request, or GitHub answers it with a rate limit.
+            httpx.HTTPError: If the request fails at the transport level.
+        """
+        await self.limiter.acquire_async(timeout=wait)
+
+        response = await self.client.request(method, path, **kwargs)
+
+        retry_after = self.limiter.observe(response.headers, response.status_code)
+        if retry_after:
+            raise RateLimitedError(
+                f"GitHub rate limit reached, retry in {retry_after:.0f}s",
+                retry_after=retry_after,
+            )
+
+        return response
+
+    async def get_user(self, username: str, wait: float = None) -> tuple:
+        """
+        Fetch a GitHub user, using the cache where possible.
+
+        Args:
+            username (str): The GitHub username.
+            wait (float, optional): Seconds to wait for the rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
+
+        Returns:
+            tuple: The HTTP status code and the user information (dict), or `(None, {})` if the user does not exist or cannot be fetched.
+
+        Raises:
+            RateLimitedError: If the lookup was deferred by the rate limiter and nothing is cached for the user.
+        """
+        key = self._cache_key(username)
+        entry = self._cache_get(key)
+
+        if entry is not None and self._is_fresh(entry):
+            return self._result(entry)
+
+        try:
+            response = await self.request(
+                "GET",
+                f"/users/{username}",
+                wait=wait,
+                headers=self._revalidation_headers(entry),
+            )
+        except RateLimitedError:
+            if entry is None:
+                raise
+            return self._result(entry)
+        except httpx.HTTPError as e:
+            print(f"Error fetching user information: {e}")
+            return self._result(entry)
+
+        return self._result(self._apply_response(key, entry, response))
+
+    async def aclose(self) -> None:
+        """
+        Close the HTTP client and its pooled connections.
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+async_github_client = AsyncGitHubClient()
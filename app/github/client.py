@@ -0,0 +1,257 @@
+import json
+import os
+import time
+
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.cache.lru import TTLCache
+from app.cache.redis import get_redis
+from app.config.config import Config
+from app.exceptions.custom_exceptions import RateLimitedError
+
+from .ratelimit import limiter_for
+
+
+class GitHubClient:
+    """
+    A keep-alive GitHub REST client with a two-tier cache for user lookups.
+
+    Lookups are served from an in-process LRU first and from Redis second. Both tiers hold the same entry:
+
+        {"status": 200 | 404, "data": dict, "etag": str | None, "fetched_at": float}
+
+    An entry is fresh for `GITHUB_CACHE_TTL` seconds (`GITHUB_NEGATIVE_CACHE_TTL` for unknown users). After that it is kept for up to `GITHUB_CACHE_STALE_TTL` seconds so it can be revalidated with `If-None-Match`. GitHub answers a matching ETag with 304 Not Modified, which carries no body.
+
+    Every request goes through the `RateLimiter` of the token, shared with every other client, process and host using it, and feeds GitHub's rate limit headers back into it.
+
+    Attributes:
+        base_url (str): The base URL of the GitHub REST API.
+        timeout (float): Seconds to wait for a response.
+        limiter (RateLimiter): The rate limiter of the token.
+
+    Methods:
+        - get_user(username: str, wait: float) -> tuple[int | None, dict]: Fetches a GitHub user, using the cache where possible.
+        - is_unknown(username: str) -> bool: Tells whether GitHub reported the user as nonexistent.
+        - request(method: str, path: str, wait: float, **kwargs) -> requests.Response: Sends a raw API request over the shared session.
+
+    Note:
+        - If GitHub is unreachable, errors or is rate limited, a stale cached entry is served rather than failing the caller.
+        - The HTTP session is created per process, so pooled sockets are never shared across a fork.
+    """
+
+    def __init__(self, base_url: str = None, token: str = None, timeout: float = None):
+        self.base_url = (base_url or Config.GITHUB_API_URL).rstrip("/")
+        self.timeout = Config.GITHUB_TIMEOUT if timeout is None else timeout
+        self._token = token if token is not None else Config.GITHUB_TOKEN
+        self.limiter = limiter_for(self._token)
+        self._local = TTLCache(
+            maxsize=Config.GITHUB_CACHE_MAXSIZE, ttl=Config.GITHUB_CACHE_STALE_TTL
+        )
+        self._session = None
+        self._pid = None
+
+    @property
+    def session(self) -> requests.Session:
+        """The keep-alive HTTP session owned by the current process."""
+        if self._session is None or self._pid != os.getpid():
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=10))
+            session.mount("http://", HTTPAdapter(pool_maxsize=10))
+            session.headers.update(
+                {
+                    "Accept": "application/vnd.github+json",
+                    "User-Agent": "AwesomeBioVault",
+                }
+            )
+            if self._token:
+                session.headers["Authorization"] = f"Bearer {self._token}"
+
+            self._session = session
+            self._pid = os.getpid()
+
+        return self._session
+
+    def request(
+        self, method: str, path: str, wait: float = None, **kwargs
+    ) -> requests.Response:
+        """
+        Send a raw API request over the shared session, once the rate limiter allows it.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The API path, e.g. '/users/mramitdas'.
+            wait (float, optional): Seconds to wait for the rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
+            **kwargs: Extra arguments for `requests.Session.request`.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            RateLimitedError: If the rate limiter defers the request, or GitHub answers it with a rate limit.
+            requests.exceptions.RequestException: If the request fails at the transport level.
+        """
+        self.limiter.acquire(timeout=wait)
+
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+        retry_after = self.limiter.observe(response.headers, response.status_code)
+        if retry_after:
+            raise RateLimitedError(
+                f"GitHub rate limit reached, retry in {retry_after:.0f}s",
+                retry_after=retry_after,
+            )
+
+        return response
+
+    def get_user(self, username: str, wait: float = None) -> tuple:
+        """
+        Fetch a GitHub user, using the cache where possible.
+
+        Args:
+            username (str): The GitHub username.
+            wait (float, optional): Seconds to wait for the rate limiter. Defaults to `Config.GITHUB_RATE_WAIT`.
+
+        Returns:
+            tuple: The HTTP status code and the user information (dict), or `(None, {})` if the user does not exist or cannot be fetched.
+
+        Raises:
+            RateLimitedError: If the lookup was deferred by the rate limiter and nothing is cached for the user.
+        """
+        key = self._cache_key(username)
+        entry = self._cache_get(key)
+
+        if entry is not None and self._is_fresh(entry):
+            return self._result(entry)
+
+        try:
+            response = self.request(
+                "GET",
+                f"/users/{username}",
+                wait=wait,
+                headers=self._revalidation_headers(entry),
+            )
+        except RateLimitedError:
+            if entry is None:
+                raise
+            return self._result(entry)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching user information: {e}")
+            return self._result(entry)
+
+        return self._result(self._apply_response(key, entry, response))
+
+    def is_unknown(self, username: str) -> bool:
+        """
+        Tell whether the last lookup of a user was answered with 404 Not Found.
+
+        `get_user` returns `(None, {})` both for unknown users and when GitHub could not be reached. This tells the two apart, so callers can retry the latter.
+
+        Args:
+            username (str): The GitHub username.
+
+        Returns:
+            bool: True if GitHub reported the user as nonexistent and the answer is still cached.
+        """
+        entry = self._cache_get(self._cache_key(username))
+        return entry is not None and entry["status"] == 404
+
+    @staticmethod
+    def _cache_key(username: str) -> str:
+        return f"github:user:{username.lower()}"
+
+    @staticmethod
+    def _revalidation_headers(entry: dict | None) -> dict:
+        if entry is not None and entry.get("etag"):
+            return {"If-None-Match": entry["etag"]}
+        return {}
+
+    def _apply_response(self, key: str, entry: dict | None, response) -> dict | None:
+        """
+        Update the cache from a `/users/{username}` response.
+
+        Args:
+            key (str): The cache key of the user.
+            entry (dict | None): The cached entry the request was revalidating, if any.
+            response: The HTTP response; anything with `status_code`, `headers` and `json()`.
+
+        Returns:
+            dict | None: The entry to answer with. On unexpected statuses this is the old entry, left uncached.
+        """
+        if response.status_code == 304 and entry is not None:
+            entry["fetched_at"] = time.time()
+        elif response.status_code == 200:
+            entry = {
+                "status": 200,
+                "data": response.json(),
+                "etag": response.headers.get("ETag"),
+                "fetched_at": time.time(),
+            }
+        elif response.status_code == 404:
+            entry = {
+                "status": 404,
+                "data": {},
+                "etag": None,
+                "fetched_at": time.time(),
+            }
+        else:
+            print(
+                f"Error fetching user information: HTTP {response.status_code} from GitHub"
+            )
+            return entry
+
+        self._cache_set(key, entry)
+        return entry
+
+    @staticmethod
+    def _is_fresh(entry: dict) -> bool:
+        ttl = (
+            Config.GITHUB_CACHE_TTL
+            if entry["status"] == 200
+            else Config.GITHUB_NEGATIVE_CACHE_TTL
+        )
+        return time.time() - entry["fetched_at"] < ttl
+
+    @staticmethod
+    def _result(entry: dict | None) -> tuple:
+        if entry is None or entry["status"] != 200:
+            return None, {}
+        return entry["status"], entry["data"]
+
+    def _cache_get(self, key: str) -> dict | None:
+        entry = self._local.get(key)
+        if entry is not None:
+            return entry
+
+        client = get_redis()
+        if client is None:
+            return None
+
+        try:
+            raw = client.get(key)
+        except redis.RedisError:
+            return None
+
+        if raw is None:
+            return None
+
+        entry = json.loads(raw)
+        self._local.set(key, entry)
+        return entry
+
+    def _cache_set(self, key: str, entry: dict) -> None:
+        self._local.set(key, entry)
+
+        client = get_redis()
+        if client is None:
+            return
+
+        try:
+            client.set(key, json.dumps(entry), ex=Config.GITHUB_CACHE_STALE_TTL)
+        except redis.RedisError:
+            pass
+
+
+github_client = GitHubClient()
@@ -0,0 +1,263 @@
+import base64
+import os
+import threading
+import uuid
+
+import redis
+from github import Github, GithubException, InputGitTreeElement
+
+from app.cache.redis import get_redis, release_lock
+from app.config.config import Config
+from app.exceptions.custom_exceptions import RateLimitedError
+
+from .ratelimit import limiter_for
+
+PENDING_KEY = "github:publish:pending"
+
+# The files of the flush in progress, or of one that failed or crashed, which the next flush commits
+PROCESSING_KEY = "github:publish:processing"
+
+# Held while a flush runs, so only one worker commits at a time
+LOCK_KEY = "github:publish:lock"
+
+# Seconds a flush may hold the lock before a crashed one is taken over
+LOCK_TIMEOUT = 600
+
+# Moves the staged files into the processing hash and returns all of it. Files
+# staged since a failed flush replace the versions it left behind.
+DETACH_SCRIPT = """
+local staged = redis.call("HGETALL", KEYS[1])
+for i = 1, #staged, 2 do
+    redis.call("HSET", KEYS[2], staged[i], staged[i + 1])
+end
+redis.call("DEL", KEYS[1])
+return redis.call("HGETALL", KEYS[2])
+"""
+
+
+class GitHubPublisher:
+    """
+    Queues files for a GitHub repository and publishes them in batches as a single commit.
+
+    Files are staged in a Redis hash keyed by repository path, so every worker process shares one queue and a file staged twice before a flush is only committed once, with its latest content. One flush runs at a time; it moves the staged files to a processing hash, which is only cleared once they are committed, so the files of a failed or crashed flush are committed by the next one. A flush writes all staged files through the Git data API: one blob per file, one tree on top of the branch head, one commit and one ref update. Existing paths are simply overwritten, so re-captures never fail on "file already exists".
+
+    A commit takes the tokens of all its API calls from the `RateLimiter` of the token before the first call, so it is never cut off halfway by the limit. When the limiter defers it, or GitHub reports a rate limit, the files stay queued for the next flush.
+
+    Attributes:
+        repo_owner (str): Owner of the GitHub repository.
+        repo_name (str): Name of the GitHub repository.
+        branch (str): Branch the commits are added to.
+        limiter (RateLimiter): The rate limiter of the token, shared with `GitHubClient`.
+
+    Methods:
+        - stage(path: str, content: bytes) -> None: Queues a file for the next commit.
+        - flush(message: str) -> str | None: Commits every queued file and returns the commit SHA.
+        - commit_files(files: dict, message: str, wait: float) -> str: Commits the given files immediately.
+
+    Note:
+        - Without Redis the queue falls back to the current process.
+        - The API base URL comes from `Config.GITHUB_API_URL`, so the publisher can be pointed at a stub API.
+    """
+
+    def __init__(
+        self,
+        token: str = None,
+        repo_owner: str = None,
+        repo_name: str = None,
+        branch: str = None,
+    ):
+        self._token = token if token is not None else Config.GITHUB_TOKEN
+        self.repo_owner = repo_owner or Config.REPO_OWNER
+        self.repo_name = repo_name or Config.REPO_NAME
+        self.branch = branch or Config.BRANCH
+        self.limiter = limiter_for(self._token)
+        self._repo = None
+        self._pid = None
+        self._local = {}
+        self._lock = threading.Lock()
+
+    @property
+    def repo(self):
+        """The PyGithub repository handle, created once per process and reused."""
+        if self._repo is None or self._pid != os.getpid():
+            client = Github(self._token, base_url=Config.GITHUB_API_URL)
+            self._repo = client.get_repo(f"{self.repo_owner}/{self.repo_name}")
+            self._pid = os.getpid()
+
+        return self._repo
+
+    def stage(self, path: str, content: bytes) -> None:
+        """
+        Queue a file for the next commit.
+
+        Args:
+            path (str): The path of the file inside the repository.
+            content (bytes): The file content. Replaces any content already queued for `path`.
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                client.hset(PENDING_KEY, path, content)
+                return
+            except redis.RedisError as e:
+                print(f"Error staging {path} in Redis, keeping it in-process: {e}")
+
+        with self._lock:
+            self._local[path] = content
+
+    def flush(self, message: str = None) -> str | None:
+        """
+        Commit every queued file.
+
+        Args:
+            message (str, optional): The commit message. Defaults to one listing the committed files.
+
+        Returns:
+            str | None: The SHA of the new commit, or None if nothing was queued.
+
+        Raises:
+            RateLimitedError: If the commit was deferred by the rate limiter. The files stay queued, unless a newer version is staged meanwhile.
+            GithubException: If the commit could not be created. The files stay queued likewise.
+        """
+        files, release = self._drain()
+        if not files:
+            release(committed=True)
+            return None
+
+        try:
+            sha = self.commit_files(files, message)
+        except Exception:
+            release(committed=False)
+            raise
+
+        release(committed=True)
+        return sha
+
+    def commit_files(self, files: dict, message: str = None, wait: float = None) -> str:
+        """
+        Commit the given files to the branch in a single commit.
+
+        Args:
+            files (dict): The file contents (bytes) keyed by repository path.
+            message (str, optional): The commit message.
+            wait (float, optional): Seconds to wait for the rate limiter. Defaults to `Config.GITHUB_RATE_TASK_WAIT`.
+
+        Returns:
+            str: The SHA of the new commit.
+
+        Raises:
+            RateLimitedError: If the rate limiter defers the commit, or GitHub answers a call with a rate limit.
+            GithubException: If any other API call fails.
+        """
+        # One blob per file, then the ref, head, tree, commit and ref update
+        self.limiter.acquire(
+            cost=len(files) + 5,
+            timeout=Config.GITHUB_RATE_TASK_WAIT if wait is None else wait,
+        )
+
+        try:
+            sha, headers = self._commit(files, message)
+        except GithubException as e:
+            retry_after = self.limiter.observe(e.headers, e.status)
+            if retry_after:
+                raise RateLimitedError(
+                    f"GitHub rate limit reached, retry in {retry_after:.0f}s",
+                    retry_after=retry_after,
+                ) from e
+            raise
+
+        self.limiter.observe(headers)
+        return sha
+
+    def _commit(self, files: dict, message: str = None) -> tuple:
+        """
+        Write the files through the Git data API.
+
+        Returns:
+            tuple[str, dict]: The SHA of the new commit, and the response headers of its creation, carrying GitHub's rate limit.
+        """
+        repo = self.repo
+        message = message or "CHORE: added " + ", ".join(
+            os.path.basename(path) for path in sorted(files)
+        )
+
+        elements = [
+            InputGitTreeElement(
+                path=path,
+                mode="100644",
+                type="blob",
+                sha=repo.create_git_blob(
+                    base64.b64encode(content).decode(), "base64"
+                ).sha,
+            )
+            for path, content in sorted(files.items())
+        ]
+
+        # Retry once if the branch moved between reading the head and updating the ref
+        for attempt in range(2):
+            ref = repo.get_git_ref(f"heads/{self.branch}")
+            head = repo.get_git_commit(ref.object.sha)
+            tree = repo.create_git_tree(elements, head.tree)
+            commit = repo.create_git_commit(message, tree, [head])
+            try:
+                ref.edit(commit.sha)
+            except GithubException as e:
+                if attempt or e.status != 422:
+                    raise
+                continue
+            return commit.sha, commit.raw_headers
+
+    def _drain(self):
+        """
+        Detach the queued files.
+
+        Returns:
+            tuple[dict, callable]: The files keyed by path, and a `release(committed)` callback that discards them after a successful commit or queues them again otherwise.
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                return self._drain_redis(client)
+            except redis.RedisError as e:
+                print(f"Error reading staged files from Redis: {e}")
+
+        with self._lock:
+            files, self._local = self._local, {}
+
+        def release(committed):
+            if committed:
+                return
+            with self._lock:
+                for path, content in files.items():
+                    self._local.setdefault(path, content)
+
+        return files, release
+
+    def _drain_redis(self, client):
+        # The lock keeps concurrent flushes from committing the same batch. The
+        # files are only deleted once the commit landed, so those of a failed or
+        # crashed flush stay in the processing hash and go into the next commit.
+        token = uuid.uuid4().hex
+        if not client.set(LOCK_KEY, token, nx=True, ex=LOCK_TIMEOUT):
+            # Another worker is flushing; the files wait for the next flush
+            return {}, lambda committed: None
+
+        try:
+            staged = client.eval(DETACH_SCRIPT, 2, PENDING_KEY, PROCESSING_KEY)
+        except redis.RedisError:
+            release_lock(client, LOCK_KEY, token)
+            raise
+
+        files = {staged[i].decode(): staged[i + 1] for i in range(0, len(staged), 2)}
+
+        def release(committed):
+            try:
+                if committed:
+                    client.delete(PROCESSING_KEY)
+            finally:
+                release_lock(client, LOCK_KEY, token)
+
+        return files, release
+
+
+publisher = GitHubPublisher()
@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import threading
+import time
+
+import redis
+
+from app.cache.redis import get_redis
+from app.config.config import Config
+from app.exceptions.custom_exceptions import RateLimitedError
+from app.metrics.registry import GITHUB_RATE_LIMIT_REMAINING, GITHUB_RATE_LIMITED
+
+# Seconds the bucket state outlives its last update; GitHub's window is one hour
+STATE_TTL = 7200
+
+# Seconds to back off after a secondary rate limit without Retry-After, as GitHub advises
+SECONDARY_LIMIT_BACKOFF = 60
+
+
+class RateLimiter:
+    """
+    A token bucket pacing the GitHub API calls of every web and Celery worker.
+
+    GitHub limits requests per token, not per process, so the bucket lives in a Redis hash keyed by a hash of the token and is updated atomically with `WATCH`/`MULTI`. Every call takes a token first; the bucket refills at `GITHUB_RATE_LIMIT` requests per hour and holds at most `GITHUB_RATE_BURST`. Responses feed the `X-RateLimit-*` headers back through `observe`, which adapts the bucket to what GitHub reports:
+
+        - the bucket never holds more tokens than `X-RateLimit-Remaining`,
+        - it refills at the pace that spreads the remaining requests until `X-RateLimit-Reset`,
+        - it stays empty until the reset when nothing remains, or for `Retry-After` seconds after a secondary limit.
+
+    Once GitHub's window has rolled over, the bucket starts from a full burst again until the next response says otherwise.
+
+    Attributes:
+        key (str): The Redis key of the bucket state.
+        capacity (float): The maximum number of tokens, i.e. requests sent back to back.
+        default_rate (float): Tokens per second until GitHub reports its own limit.
+
+    Methods:
+        - try_acquire(cost: int) -> float: Takes tokens if available, otherwise returns the seconds to wait.
+        - acquire(cost: int, timeout: float) -> None: Waits up to `timeout` for tokens.
+        - acquire_async(cost: int, timeout: float) -> None: The non-blocking counterpart of `acquire`.
+        - observe(headers, status: int) -> float: Adapts the bucket to a GitHub response.
+
+    Note:
+        - Without Redis, the bucket falls back to the current process, so each worker paces itself alone.
+        - The state is a handful of floats: `{"tokens", "rate", "updated_at", "reset", "blocked_until"}`, all times in epoch seconds so that every host reads GitHub's reset time the same way.
+    """
+
+    def __init__(self, token: str = None, capacity: int = None, rate_limit: int = None):
+        token = token if token is not None else Config.GITHUB_TOKEN
+        digest = hashlib.sha256((token or "").encode()).hexdigest()[:16]
+        self.key = f"github:ratelimit:{digest}"
+        self.capacity = float(capacity or Config.GITHUB_RATE_BURST)
+        self.default_rate = (rate_limit or Config.GITHUB_RATE_LIMIT) / 3600
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, cost: int = 1) -> float:
+        """
+        Take tokens from the bucket if enough are available.
+
+        Args:
+            cost (int, optional): The number of requests about to be sent. Costs above the capacity take the whole bucket.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until they will be available. Nothing is taken in that case.
+        """
+        return self._update(lambda state: self._take(state, time.time(), cost))
+
+    def acquire(self, cost: int = 1, timeout: float = None) -> None:
+        """
+        Wait for tokens, sleeping while the bucket refills.
+
+        Args:
+            cost (int, optional): The number of requests about to be sent.
+            timeout (float, optional): The longest the caller is willing to wait, in seconds. Defaults to `Config.GITHUB_RATE_WAIT`.
+
+        Raises:
+            RateLimitedError: If the tokens will not be available within `timeout`. It is raised without sleeping when the wait is known to be too long.
+        """
+        deadline = time.monotonic() + self._timeout(timeout)
+        while wait := self.try_acquire(cost):
+            if time.monotonic() + wait > deadline:
+                raise self._deferred(wait)
+            time.sleep(wait)
+
+    async def acquire_async(self, cost: int = 1, timeout: float = None) -> None:
+        """
+        Wait for tokens without blocking the event loop, see `acquire`.
+
+        Raises:
+            RateLimitedError: If the tokens will not be available within `timeout`.
+        """
+        deadline = time.monotonic() + self._timeout(timeout)
+        while wait := self.try_acquire(cost):
+            if time.monotonic() + wait > deadline:
+                raise self._deferred(wait)
+            await asyncio.sleep(wait)
+
+    def observe(self, headers, status: int = None) -> float:
+        """
+        Adapt the bucket to the rate limit headers of a GitHub response.
+
+        Args:
+            headers: The response headers, e.g. those of requests or httpx, or the lower-cased dict PyGithub keeps.
+            status (int, optional): The HTTP status code of the response.
+
+        Returns:
+            float: 0 if the response was served, otherwise the seconds to wait before GitHub accepts requests again. A 429, or a 403 with no remaining requests or a `Retry-After`, is a rate limit; any other 403 is a plain permission error.
+        """
+        now = time.time()
+        remaining = self._header(headers, "X-RateLimit-Remaining")
+        reset = self._header(headers, "X-RateLimit-Reset")
+        retry_after = self._header(headers, "Retry-After")
+
+        blocked_for = 0
+        if status == 429 or (
+            status == 403 and (remaining == 0 or retry_after is not None)
+        ):
+            if retry_after is not None:
+                blocked_for = retry_after
+            elif remaining == 0 and reset:
+                blocked_for = max(reset - now, 1)
+            else:
+                blocked_for = SECONDARY_LIMIT_BACKOFF
+            GITHUB_RATE_LIMITED.labels("github").inc()
+
+        if remaining is not None:
+            GITHUB_RATE_LIMIT_REMAINING.set(remaining)
+
+        if remaining is None and not blocked_for:
+            return 0
+
+        self._update(
+            lambda state: self._apply(
+                state, now, remaining, reset, now + blocked_for if blocked_for else 0
+            )
+        )
+        return blocked_for
+
+    @staticmethod
+    def _timeout(timeout: float | None) -> float:
+        return Config.GITHUB_RATE_WAIT if timeout is None else timeout
+
+    @staticmethod
+    def _deferred(wait: float) -> RateLimitedError:
+        GITHUB_RATE_LIMITED.labels("bucket").inc()
+        return RateLimitedError(
+            f"GitHub rate limit reached, retry in {wait:.0f}s", retry_after=wait
+        )
+
+    @staticmethod
+    def _header(headers, name: str) -> float | None:
+        if headers is None:
+            return None
+
+        # PyGithub hands out plain dicts with lower-cased names
+        value = headers.get(name, headers.get(name.lower()))
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+    def _refill(self, state: dict, now: float) -> dict:
+        """
+        Return the state with the tokens earned since its last update.
+        """
+        if not state or (state.get("reset") and now >= state["reset"]):
+            # A new bucket, or GitHub's window rolled over: start from a full burst
+            return {
+                "tokens": self.capacity,
+                "rate": self.default_rate,
+                "updated_at": now,
+                "reset": 0,
+                "blocked_until": state.get("blocked_until", 0),
+            }
+
+        elapsed = max(0, now - state["updated_at"])
+        tokens = min(self.capacity, state["tokens"] + elapsed * state["rate"])
+        return {**state, "tokens": tokens, "updated_at": now}
+
+    def _take(self, state: dict, now: float, cost: int) -> tuple:
+        """
+        Take `cost` tokens. Returns the new state and the seconds to wait, 0 if the tokens were taken.
+        """
+        state = self._refill(state, now)
+        if now < state["blocked_until"]:
+            return state, state["blocked_until"] - now
+
+        cost = min(cost, self.capacity)
+        if state["tokens"] >= cost:
+            state["tokens"] -= cost
+            return state, 0
+
+        return state, (cost - state["tokens"]) / state["rate"]
+
+    def _apply(
+        self,
+        state: dict,
+        now: float,
+        remaining: float | None,
+        reset: float | None,
+        blocked_until: float,
+    ) -> tuple:
+        """
+        Fold GitHub's view of the limit into the state. Returns the new state and None.
+        """
+        state = self._refill(state, now)
+        if remaining is not None and reset and reset > now:
+            state["tokens"] = min(state["tokens"], remaining)
+            # Spread what is left of the window evenly until it resets
+            state["rate"] = max(remaining, 1) / (reset - now)
+            state["reset"] = reset
+            if remaining <= 0:
+                blocked_until = max(blocked_until, reset)
+
+        state["blocked_until"] = max(state["blocked_until"], blocked_until)
+        return state, None
+
+    def _update(self, change):
+        """
+        Apply `change(state) -> (state, result)` atomically and return its result.
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                return self._update_redis(client, change)
+            except redis.RedisError as e:
+                print(f"Error updating the GitHub rate limiter in Redis: {e}")
+
+        with self._lock:
+            self._state, result = change(self._state)
+        return result
+
+    def _update_redis(self, client, change):
+        # WATCH aborts the transaction if another worker updated the bucket
+        # between the read and the write, in which case the change is retried
+        with client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.key)
+                    state = {
+                        field.decode(): float(value)
+                        for field, value in pipe.hgetall(self.key).items()
+                    }
+                    state, result = change(state)
+                    pipe.multi()
+                    pipe.hset(self.key, mapping=state)
+                    pipe.expire(self.key, STATE_TTL)
+                    pipe.execute()
+                    return result
+                except redis.WatchError:
+                    continue
+
+
+_limiters = {}
+
+
+def limiter_for(token: str = None) -> RateLimiter:
+    """
+    Return the rate limiter of a GitHub token, shared by every client of this process.
+
+    Args:
+        token (str, optional): The GitHub token. Defaults to `Config.GITHUB_TOKEN`.
+
+    Returns:
+        RateLimiter: The limiter of the token; clients using the same token share one bucket.
+    """
+    token = token if token is not None else Config.GITHUB_TOKEN
+    if token not in _limiters:
+        _limiters[token] = RateLimiter(token)
+
+    return _limiters[token]
@@ -0,0 +1,45 @@
+import time
+
+from flask import Blueprint, g, request
+
+from .registry import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS
+
+
+def instrument(blueprint: Blueprint) -> Blueprint:
+    """
+    Record the count, latency and concurrency of every request served by a blueprint.
+
+    Args:
+        blueprint (flask.Blueprint): The blueprint to instrument. It must not be registered on an app yet.
+
+    Returns:
+        flask.Blueprint: The same blueprint, for chaining.
+
+    Note:
+        - Requests are labelled by endpoint name rather than URL, so profile usernames never become label values.
+        - `after_request` also runs for error responses, including unhandled exceptions turned into a 500, so failures are counted with their status code. The in-progress gauge is released in `teardown_request`, which runs even if building the response fails.
+    """
+
+    @blueprint.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+
+    @blueprint.after_request
+    def record_request(response):
+        started = g.get("metrics_started")
+        if started is not None:
+            endpoint = request.endpoint or ""
+            HTTP_REQUEST_DURATION.labels(endpoint, request.method).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+
+        return response
+
+    @blueprint.teardown_request
+    def release_request(exception=None):
+        if g.pop("metrics_started", None) is not None:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+
+    return blueprint
@@ -0,0 +1,72 @@
+from pymongo import monitoring
+
+from .registry import MONGO_COMMAND_DOCUMENTS, MONGO_COMMAND_DURATION
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    A PyMongo command listener recording the latency and document count of every command.
+
+    PyMongo calls the listener synchronously around each command sent on a pooled connection, with the round trip already timed by the driver. Registering it on the client through `event_listeners` covers every `DataBase` and `AsyncDataBase` operation without touching the query code.
+
+    Attributes:
+        _collections (dict): The collection of each command in flight, keyed by connection and request id. Succeeded and failed events do not carry the command, so it is remembered from the started event.
+
+    Note:
+        - Heartbeats and server discovery run on separate monitoring connections and are not reported here.
+        - Listeners run on the thread issuing the command, so they only do dictionary lookups and metric updates.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    @staticmethod
+    def _key(event):
+        return event.connection_id, event.request_id
+
+    @staticmethod
+    def _collection(event) -> str:
+        """
+        Return the collection a command targets, or '' for database level commands.
+        """
+        command = event.command
+        if event.command_name == "getMore":
+            return command.get("collection", "")
+
+        target = command.get(event.command_name)
+        return target if isinstance(target, str) else ""
+
+    @staticmethod
+    def _documents(reply) -> int:
+        """
+        Return the number of documents a reply returned or wrote.
+        """
+        cursor = reply.get("cursor")
+        if isinstance(cursor, dict):
+            return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+
+        return reply.get("n", 0)
+
+    def started(self, event):
+        self._collections[self._key(event)] = self._collection(event)
+
+    def succeeded(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        MONGO_COMMAND_DURATION.labels(
+            event.command_name, collection, "success"
+        ).observe(event.duration_micros / 1e6)
+
+        documents = self._documents(event.reply)
+        if documents:
+            MONGO_COMMAND_DOCUMENTS.labels(event.command_name, collection).inc(
+                documents
+            )
+
+    def failed(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        MONGO_COMMAND_DURATION.labels(
+            event.command_name, collection, "failure"
+        ).observe(event.duration_micros / 1e6)
+
+
+command_metrics = CommandMetrics()
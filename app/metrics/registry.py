@@ -0,0 +1,167 @@
+import os
+import shutil
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Exposition content type of `render()`
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Latency buckets in seconds, from a cached lookup up to a slow screenshot
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+
+# Metric values are written to the shared directory as soon as they are created
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by endpoint, method and status code.",
+    ["endpoint", "method", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling an HTTP request, by endpoint and method.",
+    ["endpoint", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    multiprocess_mode="livesum",
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "Time MongoDB took to answer a command, by command, collection and outcome.",
+    ["command", "collection", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_COMMAND_DOCUMENTS = Counter(
+    "mongodb_command_documents_total",
+    "Documents returned or written by MongoDB commands, by command and collection.",
+    ["command", "collection"],
+)
+
+GITHUB_LOOKUP_DURATION = Histogram(
+    "github_user_lookup_duration_seconds",
+    "Time spent resolving a GitHub user, including cache hits, by outcome.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "github_rate_limit_remaining",
+    "Requests left in the current GitHub rate limit window, as last reported by GitHub.",
+    multiprocess_mode="mostrecent",
+)
+GITHUB_RATE_LIMITED = Counter(
+    "github_rate_limited_total",
+    "GitHub API calls deferred by the rate limiter, by whether the shared bucket or GitHub itself refused them.",
+    ["reason"],
+)
+
+RECORD_CACHE_REQUESTS = Counter(
+    "record_cache_requests_total",
+    "Single-record lookups through the Redis record cache, by table and whether they hit, missed or waited for a concurrent fill.",
+    ["table", "outcome"],
+)
+
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Time a Celery task ran on a worker, by task and final state.",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time a Celery task waited between being published and starting, by task.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def multiprocess_dir() -> str | None:
+    """
+    Return the directory shared by the processes of a multi-process server, if any.
+
+    Returns:
+        str | None: The value of `PROMETHEUS_MULTIPROC_DIR`, or None when every process reports on its own.
+    """
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def reset_multiprocess_dir() -> None:
+    """
+    Empty the multi-process directory before the first worker starts.
+
+    Metric files are named after process ids, so files left behind by an earlier run would be summed into the new one. Call this from the parent process only, before it forks its workers.
+    """
+    path = multiprocess_dir()
+    if not path:
+        return
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Drop the live gauge values of an exited worker process.
+
+    Args:
+        pid (int): The id of the exited process.
+    """
+    if multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+def collector_registry() -> CollectorRegistry:
+    """
+    Return the registry to expose.
+
+    Returns:
+        prometheus_client.CollectorRegistry: A registry aggregating the metric files of every worker process when `PROMETHEUS_MULTIPROC_DIR` is set, otherwise the registry of the current process.
+    """
+    if not multiprocess_dir():
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render() -> bytes:
+    """
+    Render every metric in the Prometheus text format.
+
+    Returns:
+        bytes: The exposition, aggregated across worker processes when `PROMETHEUS_MULTIPROC_DIR` is set.
+
+    Note:
+        Under gunicorn, each request is served by one worker only. Without a shared `PROMETHEUS_MULTIPROC_DIR`, a scrape would only see the counters of whichever worker answered it.
+    """
+    return generate_latest(collector_registry())
@@ -0,0 +1,97 @@
+import os
+import time
+
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+    worker_ready,
+)
+from prometheus_client import start_http_server
+
+from app.config.config import Config
+
+from .registry import (
+    TASK_DURATION,
+    TASK_QUEUE_WAIT,
+    collector_registry,
+    mark_process_dead,
+    reset_multiprocess_dir,
+)
+
+# Message header carrying the wall clock time a task was published at
+PUBLISHED_AT_HEADER = "published_at"
+
+# Start times of the tasks running in this process, keyed by task id
+_started = {}
+
+
+def stamp_published_at(headers=None, **kwargs):
+    """
+    Stamp outgoing task messages with their publish time, so the worker can measure queue wait.
+    """
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+def start_task_timer(task_id=None, task=None, **kwargs):
+    """
+    Record how long a task waited in the queue and start timing its run.
+    """
+    _started[task_id] = time.perf_counter()
+
+    # Custom message headers are exposed as attributes of the task request
+    published_at = task.request.get(PUBLISHED_AT_HEADER)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.labels(task.name).observe(max(0, time.time() - published_at))
+
+
+def record_task(task_id=None, task=None, state=None, **kwargs):
+    """
+    Record the run time of a finished task by its final state.
+    """
+    started = _started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+def clear_task_metrics(**kwargs):
+    """
+    Drop metric files of an earlier run before the worker forks its pool processes.
+    """
+    reset_multiprocess_dir()
+
+
+def serve_task_metrics(**kwargs):
+    """
+    Expose the worker's metrics on `Config.CELERY_METRICS_PORT`, if set.
+
+    The endpoint runs in the worker's main process. Task metrics are recorded in the pool processes, so they only show up here when `PROMETHEUS_MULTIPROC_DIR` is set.
+    """
+    if Config.CELERY_METRICS_PORT:
+        start_http_server(Config.CELERY_METRICS_PORT, registry=collector_registry())
+
+
+def release_task_metrics(**kwargs):
+    """
+    Drop the live gauge values of a pool process that is shutting down.
+    """
+    mark_process_dead(os.getpid())
+
+
+def instrument_celery() -> None:
+    """
+    Connect the task and worker metrics to the Celery signals.
+
+    Task runtime and queue wait are recorded for every task, labelled by task name, e.g. `async_capture_screenshot`. Safe to call more than once: Celery ignores a receiver that is already connected.
+    """
+    before_task_publish.connect(stamp_published_at)
+    task_prerun.connect(start_task_timer)
+    task_postrun.connect(record_task)
+    worker_init.connect(clear_task_metrics)
+    worker_ready.connect(serve_task_metrics)
+    worker_process_shutdown.connect(release_task_metrics)
@@ -0,0 +1,296 @@
+from typing import Union
+
+from app.cache.page import page_cache
+from app.cache.records import record_cache
+from app.config.config import Config
+from app.db.aio import AsyncDataBase
+
+from .base import (
+    all_query,
+    filter_query,
+    legacy_timestamp_field,
+    legacy_timestamps,
+    page_query,
+)
+from .leaderboard import rank_profiles
+from .pagination import offset_position, split_page
+from .user import LEADERBOARD_FIELDS, LEADERBOARD_PROJECTION, User, leaderboard_page
+
+
+class AsyncBase:
+    """
+    The non-blocking counterpart of `Base`, used by the ASGI app.
+
+    Exposes the read and write paths of the request handlers as coroutines on top of `AsyncDataBase`. Queries are built by the same `all_query`, `filter_query` and `page_query` helpers as in `Base`, and the record cache and page-cache invalidation are shared with it, so both apps return the same pages and accept each other's cursors.
+
+    Attributes:
+        - derived_fields (dict): Stored fields recomputed on every write, as aggregation expressions keyed by field name.
+        - visible_filter (dict): Criteria a record must match to appear in listings and searches, see `Base.visible_filter`.
+        - __db_name (str): The name of the database obtained from the environment variables.
+        - __table_name (str): The name of the data table.
+        - __db (AsyncDataBase): An instance of the `AsyncDataBase` class for handling database operations.
+        - __records (RecordCache): The Redis cache `get` reads through, the same one `Base` uses for the table.
+
+    Methods:
+        - save(data: dict) -> InsertOneResult: Inserts data into the database table.
+        - get(username: str, projection: dict) -> dict: Retrieves data by github_username, through the record cache.
+        - get_all(limit: int, cursor: str, projection: dict) -> list[dict]: Retrieves all data, or one keyset page of it.
+        - filter(filter: dict | str, limit: int, cursor: str, projection: dict) -> list[dict]: Retrieves data based on filter criteria or a named sort.
+        - paginate(filter_type: str, limit: int, cursor: str, projection: dict) -> tuple[list[dict], str | None]: Retrieves one page of a listing together with the continuation token for the next page.
+        - update(data: dict) -> UpdateResult: Updates data in the database table.
+
+    Note:
+        - Maintenance paths (index creation, counters, exports) stay on the synchronous `Base`; they run outside the request path.
+    """
+
+    derived_fields = {}
+    visible_filter = {}
+
+    def __init__(self, table_name: str):
+        """
+        Initialize an AsyncBase instance with the specified table name.
+
+        Args:
+            table_name (str): The name of the database table.
+        """
+        self.__db_name = Config.DB_NAME
+        self.__table_name = table_name
+        self.__db = AsyncDataBase(db_url=Config.DB_URL)
+        self.__records = record_cache(table_name)
+
+    async def save(self, data: dict):
+        """
+        Inserts data into the database table.
+
+        Args:
+            data (dict): The data to be saved.
+
+        Returns:
+            pymongo.InsertOneResult: The response from the database operation.
+        """
+        response = await self.__db.upload(
+            db_name=self.__db_name, table_name=self.__table_name, data=data
+        )
+        page_cache.bump()
+        self.__records.invalidate(data["github_username"])
+
+        return response
+
+    async def get(self, username: str, projection: dict = None) -> dict:
+        """
+        Retrieves data by github_username, reading through the Redis record cache.
+
+        Args:
+            username (str): The github_username for identifying the user.
+            projection (dict, optional): The fields to return. The whole document is returned when omitted.
+
+        Returns:
+            dict: The data retrieved from the cache or the database, or None if there is no such user.
+        """
+        return await self.__records.aget(
+            username,
+            projection,
+            lambda: self.__db.query(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                filter={"github_username": username},
+                projection=projection,
+            ),
+        )
+
+    async def get_all(
+        self, limit: int = None, cursor: str = None, projection: dict = None
+    ) -> list[dict]:
+        """
+        Retrieves all data from the database table, see `Base.get_all`.
+
+        Args:
+            limit (int, optional): The maximum number of documents to return.
+            cursor (str, optional): A continuation token from `paginate`.
+            projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+
+        Returns:
+            list[dict]: The documents, ordered by `_id`.
+        """
+        return await self.__db.query(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            **all_query(self.visible_filter, limit, cursor, projection),
+        )
+
+    async def filter(
+        self,
+        filter: Union[dict, str],
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> list[dict]:
+        """
+        Retrieves data based on filter criteria from the database table, see `Base.filter`.
+
+        Args:
+            filter (dict | str): The filter criteria, or the name of a listing.
+            limit (int, optional): The maximum number of documents to return.
+            cursor (str, optional): A continuation token from `paginate`; only valid together with a named listing.
+            projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+
+        Returns:
+            list[dict]: A list of data that matches the filter criteria.
+
+        Raises:
+            ValueError: If `filter` names an unknown listing.
+            InvalidCursorError: If `cursor` is malformed or was issued for another listing.
+        """
+        return await self.__db.query(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            **filter_query(self.visible_filter, filter, limit, cursor, projection),
+        )
+
+    async def paginate(
+        self,
+        filter_type: str = None,
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Retrieves one keyset page of a listing, see `Base.paginate`.
+
+        Args:
+            filter_type (str, optional): The named listing, or None for the default gallery order.
+            limit (int, optional): The page size. Defaults to `Config.PAGE_SIZE`.
+            cursor (str, optional): The continuation token returned with the previous page.
+            projection (dict, optional): The fields to return.
+
+        Returns:
+            tuple[list[dict], str | None]: The documents of the page and the token for the next page, or None on the last page.
+        """
+        limit = limit or Config.PAGE_SIZE
+        offset = await self._listing_offset(filter_type, cursor)
+
+        documents = await self.__db.query(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            **page_query(
+                self.visible_filter, filter_type, limit, cursor, projection, offset
+            ),
+        )
+
+        return split_page(filter_type, documents, limit, offset)
+
+    async def _listing_offset(self, filter_type: str | None, cursor: str) -> int | None:
+        """
+        Decide whether a page of a listing is read by offset rather than by keyset, see `Base._listing_offset`.
+
+        Returns:
+            int | None: The offset of the page, or None to read it by keyset.
+        """
+        field = legacy_timestamp_field(filter_type)
+        if field is None:
+            return None
+        if cursor:
+            return offset_position(filter_type, cursor)
+
+        legacy = legacy_timestamps.known(self.__table_name, field)
+        if legacy is None:
+            record = await self.__db.query(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                filter={field: {"$type": "string"}},
+                projection={"_id": 1},
+            )
+            legacy = legacy_timestamps.record(
+                self.__table_name, field, record is not None
+            )
+
+        return 0 if legacy else None
+
+    async def update(self, data: dict):
+        """
+        Updates data in the database table.
+
+        Args:
+            data (dict): The data to be updated.
+
+        Returns:
+            pymongo.UpdateResult: The response from the database operation.
+        """
+        response = await self.__db.update(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            data=data,
+            derived=self.derived_fields,
+        )
+        page_cache.bump()
+        self.__records.invalidate(data["github_username"])
+
+        return response
+
+
+class AsyncUser(AsyncBase):
+    """
+    The non-blocking counterpart of `User`.
+
+    Attributes:
+        derived_fields (dict): The same derived fields as `User`, so writes from either app keep `combined_score` current.
+        visible_filter (dict): The same visibility rule as `User`, so pending registrations stay hidden in both apps.
+
+    Note:
+        Writes keep the Redis leaderboards current and the ranked listings are served from them, as in `User`.
+    """
+
+    derived_fields = User.derived_fields
+    visible_filter = User.visible_filter
+
+    def __init__(self):
+        """
+        Initialize an AsyncUser instance for the profiles table.
+        """
+        super().__init__(table_name=Config.TABLE_NAME)
+
+    async def save(self, data: dict):
+        """Inserts a profile, see `AsyncBase.save`, and lists it on the leaderboards unless it is pending."""
+        response = await super().save(data)
+        User.list_on_leaderboards([data])
+
+        return response
+
+    async def update(self, data: dict):
+        """Updates a profile, see `AsyncBase.update`, and brings its leaderboard entries up to date, see `User.update_leaderboards`."""
+        response = await super().update(data)
+
+        fields = (data.get("user_data") or {}).keys() & LEADERBOARD_FIELDS
+        if fields:
+            profile = await self.get(
+                data["github_username"], projection=LEADERBOARD_PROJECTION
+            )
+            if profile:
+                User.update_leaderboards(profile, fields)
+
+        return response
+
+    async def paginate(
+        self,
+        filter_type: str = None,
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Retrieves one page of a listing, from the Redis leaderboards where possible, see `User.paginate`.
+        """
+        limit = limit or Config.PAGE_SIZE
+        page = leaderboard_page(filter_type, limit, cursor, projection)
+
+        if page is None:
+            return await super().paginate(
+                filter_type=filter_type,
+                limit=limit,
+                cursor=cursor,
+                projection=projection,
+            )
+
+        hydration, usernames, next_cursor = page
+        profiles = await self.filter(**hydration) if usernames else []
+        return rank_profiles(profiles, usernames), next_cursor
@@ -1,6 +1,205 @@
+from app.cache.page import page_cache
+from app.cache.records import record_cache
 from app.config.config import Config
 from app.db.base import DataBase
-from typing import Union
+from app.exceptions.custom_exceptions import DuplicateRecordError
+from app.schemas.utils import TIMESTAMP_FIELDS, parse_legacy_timestamp
+from pymongo import UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+import time
+from typing import Iterator, Union
+
+from .pagination import (
+    SORT_KEYS,
+    combine_filters,
+    decode_cursor,
+    keyset_filter,
+    keyset_projection,
+    listing_pipeline,
+    offset_position,
+    sort_spec,
+    split_page,
+)
+
+# Fields that never leave the model layer unless explicitly projected
+PRIVATE_FIELDS = {"email": 0, "password": 0}
+
+# Seconds a table found to hold legacy string timestamps is assumed to still hold them
+LEGACY_TIMESTAMPS_RECHECK = 60
+
+
+class LegacyTimestamps:
+    """
+    Remembers which tables still hold timestamps stored as legacy strings, see `Base.migrate_timestamps`.
+
+    MongoDB sorts strings before dates, and a range filter only matches values of its own type, so a keyset page of a listing sorted by a timestamp never leads past the native dates to the legacy strings. Such listings are paged by offset until the migration is done.
+
+    Methods:
+        - known(table: str, field: str) -> bool | None: Returns the last result of a check, unless it needs repeating.
+        - record(table: str, field: str, legacy: bool) -> bool: Stores the result of a check.
+        - clear() -> None: Forgets every result.
+
+    Note:
+        - New records are always written with native dates, so once a field is found migrated it is never checked again by this process. A table still holding legacy values is checked again every `LEGACY_TIMESTAMPS_RECHECK` seconds.
+    """
+
+    def __init__(self, recheck: float = LEGACY_TIMESTAMPS_RECHECK):
+        self.recheck = recheck
+        self._checked = {}
+
+    def known(self, table: str, field: str) -> bool | None:
+        checked = self._checked.get((table, field))
+        if checked is None:
+            return None
+
+        legacy, at = checked
+        if legacy and time.monotonic() - at > self.recheck:
+            return None
+        return legacy
+
+    def record(self, table: str, field: str, legacy: bool) -> bool:
+        self._checked[(table, field)] = (legacy, time.monotonic())
+        return legacy
+
+    def clear(self) -> None:
+        self._checked.clear()
+
+
+legacy_timestamps = LegacyTimestamps()
+
+
+def legacy_timestamp_field(filter_type: str | None) -> str | None:
+    """
+    Return the timestamp field a listing is sorted by.
+
+    Args:
+        filter_type (str | None): The named listing, or None for the default gallery order.
+
+    Returns:
+        str | None: The field, or None if the listing is not sorted by a timestamp.
+    """
+    key = SORT_KEYS.get(filter_type) if filter_type else None
+    return key if key in TIMESTAMP_FIELDS else None
+
+
+def all_query(
+    visible_filter: dict,
+    limit: int = None,
+    cursor: str = None,
+    projection: dict = None,
+) -> dict:
+    """
+    Build the `DataBase.query` arguments of `Base.get_all`.
+
+    Args:
+        visible_filter (dict): The criteria a record must match to be listed.
+        limit (int, optional): The maximum number of documents to return.
+        cursor (str, optional): A continuation token from `paginate`; only documents after it are returned.
+        projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+
+    Returns:
+        dict: The keyword arguments of the query.
+
+    Raises:
+        InvalidCursorError: If `cursor` is malformed or was issued for a named listing.
+    """
+    position = keyset_filter(None, decode_cursor(None, cursor)) if cursor else None
+
+    return {
+        "filter": combine_filters(visible_filter, position),
+        "bulk": True,
+        "sort": sort_spec(None) if (limit or cursor) else None,
+        "limit": limit,
+        "projection": projection or PRIVATE_FIELDS,
+    }
+
+
+def filter_query(
+    visible_filter: dict,
+    filter: Union[dict, str],
+    limit: int = None,
+    cursor: str = None,
+    projection: dict = None,
+    offset: int = None,
+) -> dict:
+    """
+    Build the `DataBase.query` arguments of `Base.filter`.
+
+    Args:
+        visible_filter (dict): The criteria a record must match to be listed.
+        filter (dict | str): The filter criteria, or the name of a listing.
+        limit (int, optional): The maximum number of documents to return.
+        cursor (str, optional): A continuation token from `paginate`; only valid together with a named listing.
+        projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+        offset (int, optional): The number of documents of a named listing to skip, instead of a `cursor`.
+
+    Returns:
+        dict: The keyword arguments of the query, an aggregation pipeline for a named listing.
+
+    Raises:
+        ValueError: If `filter` names an unknown listing.
+        InvalidCursorError: If `cursor` is malformed or was issued for another listing.
+    """
+    if type(filter) == str:
+        if filter not in SORT_KEYS:
+            raise ValueError(f"Unknown filter type: {filter}")
+
+        return {
+            "pipeline": listing_pipeline(
+                filter,
+                limit=limit,
+                cursor=cursor,
+                projection=keyset_projection(filter, projection) or PRIVATE_FIELDS,
+                filter=visible_filter,
+                offset=offset,
+            )
+        }
+
+    return {
+        "filter": combine_filters(visible_filter, filter),
+        "bulk": True,
+        "limit": limit,
+        "projection": projection or PRIVATE_FIELDS,
+    }
+
+
+def page_query(
+    visible_filter: dict,
+    filter_type: str = None,
+    limit: int = None,
+    cursor: str = None,
+    projection: dict = None,
+    offset: int = None,
+) -> dict:
+    """
+    Build the `DataBase.query` arguments of one `Base.paginate` page.
+
+    One extra document is requested to find out whether another page exists, so no count query is needed.
+
+    Args:
+        visible_filter (dict): The criteria a record must match to be listed.
+        filter_type (str, optional): The named listing, or None for the default gallery order.
+        limit (int): The page size.
+        cursor (str, optional): The continuation token returned with the previous page.
+        projection (dict, optional): The fields to return, see `filter_query`.
+        offset (int, optional): The position of the page in a named listing paged by offset; `cursor` is ignored then.
+
+    Returns:
+        dict: The keyword arguments of the query.
+    """
+    if filter_type is None:
+        return all_query(
+            visible_filter, limit=limit + 1, cursor=cursor, projection=projection
+        )
+
+    return filter_query(
+        visible_filter,
+        filter_type,
+        limit=limit + 1,
+        cursor=None if offset is not None else cursor,
+        projection=projection,
+        offset=offset,
+    )
 
 
 class Base:
@@ -10,24 +209,44 @@ class Base:
     This class provides methods for interacting with a generic database table. It loads database configuration from environment variables and utilizes the `DataBase` class for performing common database operations such as saving, retrieving, filtering, updating, and deleting data.
 
     Attributes:
+        - indexes (list): The `pymongo.IndexModel` definitions subclasses need on their table.
+        - derived_fields (dict): Stored fields recomputed on every write, as aggregation expressions keyed by field name.
+        - visible_filter (dict): Criteria a record must match to appear in listings, searches and exports. Lookups by username see every record.
         - __db_url (str): The database connection URL obtained from the environment variables.
         - __db_name (str): The name of the database obtained from the environment variables.
         - __table_name (str): The name of the data table obtained from the environment variables.
         - __db (DataBase): An instance of the `DataBase` class for handling database operations.
+        - __records (RecordCache): The Redis cache `get` reads through, shared by every instance for the table.
 
     Methods:
         - save(data: dict) -> str: Inserts data into the database table.
-        - get(data_id: int) -> dict: Retrieves data by data ID from the database table.
-        - get_all() -> list[dict]: Retrieves all data from the database table.
-        - filter(filter: dict) -> list[dict]: Retrieves data based on filter criteria from the database table.
+        - save_many(data: list[dict]) -> list[int]: Inserts many records in one unordered batch and reports the duplicates.
+        - get(username: str, projection: dict) -> dict: Retrieves data by github_username, through the record cache.
+        - get_all(limit: int, cursor: str, projection: dict) -> list[dict]: Retrieves all data, or one keyset page of it, from the database table.
+        - filter(filter: dict | str, limit: int, cursor: str, projection: dict) -> list[dict]: Retrieves data based on filter criteria or a named sort from the database table.
+        - paginate(filter_type: str, limit: int, cursor: str, projection: dict) -> tuple[list[dict], str | None]: Retrieves one page of a listing together with the continuation token for the next page.
+        - iterate(filter: dict, projection: dict, batch_size: int) -> Iterator[dict]: Streams matching data from the database table without materializing it.
         - update(data: dict) -> str: Updates data in the database table.
+        - increment(counters: dict) -> list[str]: Atomically adds to numeric fields of many records in bulk writes and reports which were updated.
+        - ensure_indexes() -> list[str]: Creates the table's indexes and backfills missing derived fields.
+        - ensure_unique_indexes() -> list[str]: Creates only the table's unique indexes.
+        - ensure_startup_indexes() -> list[str]: Creates the indexes needed before serving requests.
+        - migrate_timestamps(batch_size: int) -> Iterator[dict]: Converts legacy string timestamps to native dates in batches.
         - delete(data_id: int) -> str: Deletes data based on data ID from the database table.
+        - discard(username: str, filter: dict) -> str: Deletes a record by github_username, optionally only while it matches `filter`.
 
     Note:
         - The class initializes database-related attributes from environment variables loaded via `load_dotenv()`.
         - It relies on the `DataBase` class for executing database operations.
+        - `save`, `update` and `delete` bump the page cache version, so rendered gallery pages never outlive a write.
+        - Every write also invalidates the cached records of the users it touched, so `get` never returns a record older than the last write through this class.
+        - Every read accepts a MongoDB `projection`, which is pushed into the query so unused fields are never transferred. Listings exclude `PRIVATE_FIELDS` when no projection is given.
     """
 
+    indexes = []
+    derived_fields = {}
+    visible_filter = {}
+
     def __init__(self, table_name: str):
         """
         Initialize a Base instance with the specified table name.
@@ -40,6 +259,7 @@ class Base:
         self.__db_name = Config.DB_NAME
         self.__table_name = table_name
         self.__db = DataBase(db_url=self.__db_url)
+        self.__records = record_cache(table_name)
 
     def save(self, data: dict) -> str:
         """
@@ -51,95 +271,201 @@ class Base:
         Returns:
             str: The response code from the database operation.
         """
-        return self.__db.upload(
+        response = self.__db.upload(
             db_name=self.__db_name, table_name=self.__table_name, data=data
         )
+        page_cache.bump()
+        self.__records.invalidate(data["github_username"])
+
+        return response
+
+    def save_many(self, data: list[dict]) -> list[int]:
+        """
+        Inserts many records into the database table in a single unordered batch.
+
+        A record that violates a unique index is skipped without stopping the others.
+
+        Args:
+            data (list[dict]): The records to be saved.
+
+        Returns:
+            list[int]: The positions in `data` of the records rejected as duplicates; empty when every record was inserted.
+        """
+        try:
+            self.__db.upload(
+                db_name=self.__db_name, table_name=self.__table_name, data=data
+            )
+            duplicates = []
+        except DuplicateRecordError as e:
+            duplicates = e.duplicates
+        page_cache.bump()
+        self.__records.invalidate(*(record["github_username"] for record in data))
+
+        return duplicates
 
-    def get(self, username: int) -> dict:
+    def get(self, username: str, projection: dict = None) -> dict:
         """
-        Retrieves data by data ID from the database table.
+        Retrieves data by github_username, reading through the Redis record cache.
 
         Args:
-            github_username (str): The github_username for identifying the user.
+            username (str): The github_username for identifying the user.
+            projection (dict, optional): The fields to return. The whole document is returned when omitted.
 
         Returns:
-            dict: The data retrieved from the database.
+            dict: The data retrieved from the cache or the database, or None if there is no such user.
+
+        Note:
+            Concurrent lookups of an uncached user are answered by a single database query, see `RecordCache`.
         """
-        return self.__db.query(
-            db_name=self.__db_name,
-            table_name=self.__table_name,
-            filter={"github_username": username},
+        return self.__records.get(
+            username,
+            projection,
+            lambda: self.__db.query(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                filter={"github_username": username},
+                projection=projection,
+            ),
         )
 
-    def get_all(self) -> list[dict]:
+    def get_all(
+        self, limit: int = None, cursor: str = None, projection: dict = None
+    ) -> list[dict]:
         """
         Retrieves all data from the database table.
 
+        Args:
+            limit (int, optional): The maximum number of documents to return. All documents are returned when omitted.
+            cursor (str, optional): A continuation token from `paginate`; only documents after it are returned.
+            projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+
         Returns:
-            list[dict]: A list of all data retrieved from the database.
+            list[dict]: A list of all data retrieved from the database, ordered by `_id`.
         """
         return list(
             self.__db.query(
-                db_name=self.__db_name, table_name=self.__table_name, bulk=True
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                **all_query(self.visible_filter, limit, cursor, projection),
             )
         )
 
-    def filter(self, filter: Union[dict, str]) -> list[dict]:
+    def filter(
+        self,
+        filter: Union[dict, str],
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> list[dict]:
         """
         Retrieves data based on filter criteria from the database table.
 
         Args:
-            filter (dict): The filter criteria for querying data.
+            filter (dict | str): The filter criteria for querying data, or the name of a listing ('latest', 'trending', 'popular', 'hot' or 'creative').
+            limit (int, optional): The maximum number of documents to return.
+            cursor (str, optional): A continuation token from `paginate`; only valid together with a named listing.
+            projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`. For a named listing the sort key is always included, since continuation tokens are built from it.
 
         Returns:
             list[dict]: A list of data that matches the filter criteria.
+
+        Raises:
+            ValueError: If `filter` names an unknown listing.
+            InvalidCursorError: If `cursor` is malformed or was issued for another listing.
         """
-        if type(filter) == str:           
-            if filter == "latest":
-                aggregate_pipeline = [{"$sort": {"created_at": -1}}]
-            elif filter == "trending":
-                aggregate_pipeline = [{"$sort": {"profile_views": -1}}]
-            elif filter == "popular":
-                aggregate_pipeline = [{"$sort": {"profile_likes": -1}}]
-            elif filter == "hot":
-                aggregate_pipeline = [
-                    {
-                        "$addFields": {
-                            "combined_score": {
-                                "$sqrt": {
-                                    "$multiply": ["$profile_likes", "$profile_views"]
-                                }
-                            }
-                        }
-                    },
-                    {
-                        "$sort": {
-                            "combined_score": -1  # Sort in descending order (greater to smaller scores)
-                        }
-                    },
-                ]
-            elif filter == "creative":
-                aggregate_pipeline = [{"$sort": {"profile_likes": -1}}]
-            
-            aggregate_pipeline.append(
-                {"$project": {"_id": 0, "email": 0, "password": 0}},
+        return list(
+            self.__db.query(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                **filter_query(self.visible_filter, filter, limit, cursor, projection),
             )
+        )
 
-            return list(
-                self.__db.query(
-                    db_name=self.__db_name,
-                    table_name=self.__table_name,
-                    pipeline=aggregate_pipeline,
-                )
-            )
+    def paginate(
+        self,
+        filter_type: str = None,
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Retrieves one keyset page of a listing.
 
-        return list(
-            self.__db.query(
+        One extra document is fetched to find out whether another page exists, so no count query is needed, see `page_query`. Listings sorted by a timestamp are paged by offset while the table still holds legacy string timestamps, see `LegacyTimestamps`.
+
+        Args:
+            filter_type (str, optional): The named listing, or None for the default gallery order.
+            limit (int, optional): The page size. Defaults to `Config.PAGE_SIZE`.
+            cursor (str, optional): The continuation token returned with the previous page.
+            projection (dict, optional): The fields to return, see `filter`.
+
+        Returns:
+            tuple[list[dict], str | None]: The documents of the page and the token for the next page, or None on the last page.
+        """
+        limit = limit or Config.PAGE_SIZE
+        offset = self._listing_offset(filter_type, cursor)
+
+        documents = self.__db.query(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            **page_query(
+                self.visible_filter, filter_type, limit, cursor, projection, offset
+            ),
+        )
+
+        return split_page(filter_type, list(documents), limit, offset)
+
+    def _listing_offset(self, filter_type: str | None, cursor: str) -> int | None:
+        """
+        Decide whether a page of a listing is read by offset rather than by keyset, see `LegacyTimestamps`.
+
+        Returns:
+            int | None: The offset of the page, or None to read it by keyset.
+        """
+        field = legacy_timestamp_field(filter_type)
+        if field is None:
+            return None
+        if cursor:
+            return offset_position(filter_type, cursor)
+
+        legacy = legacy_timestamps.known(self.__table_name, field)
+        if legacy is None:
+            record = self.__db.query(
                 db_name=self.__db_name,
                 table_name=self.__table_name,
-                filter=filter,
-                bulk=True,
+                filter={field: {"$type": "string"}},
+                projection={"_id": 1},
+            )
+            legacy = legacy_timestamps.record(
+                self.__table_name, field, record is not None
             )
+
+        return 0 if legacy else None
+
+    def iterate(
+        self, filter: dict = None, projection: dict = None, batch_size: int = None
+    ) -> Iterator[dict]:
+        """
+        Streams data from the database table in `_id` order.
+
+        Documents are pulled from the server cursor `batch_size` at a time as the caller consumes them, so memory use does not grow with the size of the table.
+
+        Args:
+            filter (dict, optional): The filter criteria. Every document is returned when omitted.
+            projection (dict, optional): The fields to return. Defaults to every field except `PRIVATE_FIELDS`.
+            batch_size (int, optional): The number of documents per round trip. Defaults to `Config.EXPORT_BATCH_SIZE`.
+
+        Returns:
+            Iterator[dict]: The live database cursor.
+        """
+        return self.__db.query(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            filter=combine_filters(self.visible_filter, filter),
+            bulk=True,
+            sort=sort_spec(None),
+            projection=projection or PRIVATE_FIELDS,
+            batch_size=batch_size or Config.EXPORT_BATCH_SIZE,
         )
 
     def update(self, data: dict) -> str:
@@ -152,9 +478,224 @@ class Base:
         Returns:
             str: The response code from the database operation.
         """
-        return self.__db.update(
-            db_name=self.__db_name, table_name=self.__table_name, data=data
+        response = self.__db.update(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            data=data,
+            derived=self.derived_fields,
         )
+        page_cache.bump()
+        self.__records.invalidate(data["github_username"])
+
+        return response
+
+    def increment(self, counters: dict) -> list[str]:
+        """
+        Atomically adds to numeric fields of many records.
+
+        Every record gets a single atomic update, so concurrent writers never overwrite each other; derived fields are recomputed in the same write. The updates are sent as unordered bulk writes of at most `Config.COUNTER_FLUSH_BATCH_SIZE` operations. A failing write does not undo the others: the records it reports as rejected are left out of the result, and the batches after a failed round trip are not sent.
+
+        Args:
+            counters (dict): The increments keyed by github_username, e.g. `{"mramitdas": {"profile_views": 3}}`.
+
+        Returns:
+            list[str]: The github_usernames whose increments were applied. The increments of every other username can be retried without counting twice.
+        """
+        usernames = [username for username, fields in counters.items() if fields]
+        operations = [
+            UpdateOne(
+                {"github_username": username},
+                self._increment_update(counters[username]),
+            )
+            for username in usernames
+        ]
+
+        batch_size = Config.COUNTER_FLUSH_BATCH_SIZE
+        applied = []
+        for i in range(0, len(operations), batch_size):
+            batch = usernames[i : i + batch_size]
+            try:
+                self.__db.bulk_write(
+                    db_name=self.__db_name,
+                    table_name=self.__table_name,
+                    operations=operations[i : i + batch_size],
+                )
+            except BulkWriteError as e:
+                # The batch is unordered, so only the reported operations failed
+                rejected = {
+                    error["index"] for error in e.details.get("writeErrors", [])
+                }
+                print(
+                    f"Error incrementing {len(rejected)} {self.__table_name} records: {e}"
+                )
+                batch = [
+                    username for j, username in enumerate(batch) if j not in rejected
+                ]
+            except PyMongoError as e:
+                # The round trip failed: retry this batch and the rest on the next flush
+                print(f"Error incrementing {self.__table_name} records: {e}")
+                break
+
+            applied.extend(batch)
+            self.__records.invalidate(*batch)
+
+        return applied
+
+    def _increment_update(self, fields: dict):
+        """
+        Build the update document that adds `fields` to a record.
+
+        Args:
+            fields (dict): The increments keyed by field name.
+
+        Returns:
+            dict | list: A plain `$inc` update, or an update pipeline when the table has derived fields.
+        """
+        if not self.derived_fields:
+            return {"$inc": fields}
+
+        return [
+            {
+                "$set": {
+                    field: {"$add": [{"$ifNull": [f"${field}", 0]}, amount]}
+                    for field, amount in fields.items()
+                }
+            },
+            {"$set": self.derived_fields},
+        ]
+
+    def ensure_indexes(self) -> list[str]:
+        """
+        Creates the table's indexes and backfills missing derived fields.
+
+        Both steps are idempotent, so this can run on every startup or through the `flask db init` command.
+
+        Returns:
+            list[str]: The names of the indexes.
+        """
+        if self.derived_fields:
+            self.__db.bulk_write(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                operations=[
+                    UpdateMany({field: {"$exists": False}}, [{"$set": {field: expr}}])
+                    for field, expr in self.derived_fields.items()
+                ],
+            )
+
+        if not self.indexes:
+            return []
+
+        return self.__db.create_indexes(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            indexes=self.indexes,
+        )
+
+    def ensure_unique_indexes(self) -> list[str]:
+        """
+        Creates the table's unique indexes.
+
+        Writes rely on them to reject duplicates. Creating an existing index is a no-op.
+
+        Returns:
+            list[str]: The names of the indexes.
+
+        Raises:
+            pymongo.errors.PyMongoError: If they could not be created, e.g. because the table already holds duplicates or the server is unreachable.
+        """
+        indexes = [index for index in self.indexes if index.document.get("unique")]
+        if not indexes:
+            return []
+
+        return self.__db.create_indexes(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            indexes=indexes,
+        )
+
+    def ensure_startup_indexes(self) -> list[str]:
+        """
+        Creates the indexes the table needs before the app serves requests.
+
+        With `Config.CREATE_INDEXES_ON_STARTUP` every index is created, see `ensure_indexes`; otherwise only the unique ones, which are the only guard against duplicate writes. The servers call this once from their startup hooks, gunicorn's `on_starting` and Quart's `before_serving`, and refuse to start if it fails.
+
+        Returns:
+            list[str]: The names of the indexes.
+
+        Raises:
+            pymongo.errors.PyMongoError: If the indexes could not be created.
+        """
+        if Config.CREATE_INDEXES_ON_STARTUP:
+            return self.ensure_indexes()
+
+        return self.ensure_unique_indexes()
+
+    def migrate_timestamps(self, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Converts timestamps stored as legacy strings to native BSON dates, one batch at a time.
+
+        Records are read in `_id` order, `batch_size` at a time, and every batch is written back with one unordered bulk write.
+
+        Args:
+            batch_size (int, optional): The number of records read and updated per round trip.
+
+        Returns:
+            Iterator[dict]: The progress after each batch: `{"converted": int, "skipped": int, "last_id": int}`, where `skipped` counts values that are not in the legacy format.
+
+        Note:
+            - Resumable: only records still holding a string timestamp are read, so an interrupted run picks up where it stopped.
+            - A value is only replaced while it still holds the string that was read, so a concurrent write is never overwritten.
+        """
+        legacy = {"$or": [{field: {"$type": "string"}} for field in TIMESTAMP_FIELDS]}
+        last_id = None
+
+        while True:
+            position = {"_id": {"$gt": last_id}} if last_id is not None else None
+            records = list(
+                self.__db.query(
+                    db_name=self.__db_name,
+                    table_name=self.__table_name,
+                    filter=combine_filters(legacy, position),
+                    bulk=True,
+                    sort=sort_spec(None),
+                    limit=batch_size,
+                    projection={field: 1 for field in TIMESTAMP_FIELDS},
+                )
+            )
+            if not records:
+                return
+
+            operations, skipped = [], 0
+            for record in records:
+                for field in TIMESTAMP_FIELDS:
+                    value = record.get(field)
+                    if not isinstance(value, str):
+                        continue
+                    try:
+                        converted = parse_legacy_timestamp(value)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    operations.append(
+                        UpdateOne(
+                            {"_id": record["_id"], field: value},
+                            {"$set": {field: converted}},
+                        )
+                    )
+
+            converted = 0
+            if operations:
+                result = self.__db.bulk_write(
+                    db_name=self.__db_name,
+                    table_name=self.__table_name,
+                    operations=operations,
+                )
+                converted = result.modified_count
+                page_cache.bump()
+
+            last_id = records[-1]["_id"]
+            yield {"converted": converted, "skipped": skipped, "last_id": last_id}
 
     def delete(self, uuid: int) -> str:
         """
@@ -166,8 +707,44 @@ class Base:
         Returns:
             str: The response code from the database operation.
         """
-        return self.__db.delete(
+        usernames = [
+            record["github_username"]
+            for record in self.__db.query(
+                db_name=self.__db_name,
+                table_name=self.__table_name,
+                filter={"user_uuid": uuid},
+                bulk=True,
+                projection={"_id": 0, "github_username": 1},
+            )
+            if "github_username" in record
+        ]
+        response = self.__db.delete(
             db_name=self.__db_name,
             table_name=self.__table_name,
             filter={"user_uuid": uuid},
         )
+        page_cache.bump()
+        self.__records.invalidate(*usernames)
+
+        return response
+
+    def discard(self, username: str, filter: dict = None) -> str:
+        """
+        Deletes a record by github_username from the database table.
+
+        Args:
+            username (str): The github_username of the record.
+            filter (dict, optional): Further criteria the record must match, so a record that changed in the meantime is kept.
+
+        Returns:
+            str: The response code from the database operation.
+        """
+        response = self.__db.delete(
+            db_name=self.__db_name,
+            table_name=self.__table_name,
+            filter={"github_username": username, **(filter or {})},
+        )
+        page_cache.bump()
+        self.__records.invalidate(username)
+
+        return response
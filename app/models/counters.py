@@ -0,0 +1,126 @@
+import atexit
+import os
+import threading
+from collections import defaultdict
+
+from app.config.config import Config
+
+from .user import User
+
+
+class CounterBuffer:
+    """
+    An in-process write-behind buffer for profile view and like counters.
+
+    Clicks on a popular profile arrive in bursts. Instead of issuing one database write per click, increments are coalesced per github_username in memory and flushed periodically as `$inc` bulk writes. Because `$inc` is commutative, every gunicorn worker can keep its own buffer without coordination.
+
+    Attributes:
+        _pending (defaultdict): The buffered increments, keyed by github_username and then by field.
+        _flush (callable): Receives the drained increments, persists them and returns the github_usernames whose increments were applied.
+        _interval (float): Seconds between background flushes. 0 disables buffering.
+        _max_pending (int): The number of buffered profiles that triggers an early flush.
+
+    Methods:
+        - add(username: str, field: str, amount: int) -> None: Buffers an increment.
+        - flush() -> None: Persists and clears all buffered increments.
+
+    Note:
+        - The flush thread is started lazily on the first increment, so it is always owned by the process that buffers, never by the gunicorn master.
+        - Pending increments are flushed at interpreter exit; a hard kill loses at most one interval of clicks.
+    """
+
+    def __init__(self, flush, interval: float, max_pending: int):
+        self._flush = flush
+        self._interval = interval
+        self._max_pending = max_pending
+        self._pending = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = os.getpid()
+
+    def add(self, username: str, field: str, amount: int = 1) -> None:
+        """
+        Buffer an increment for a profile field.
+
+        Args:
+            username (str): The github_username of the profile.
+            field (str): The numeric field to increment, e.g. 'profile_views'.
+            amount (int): The value to add.
+        """
+        self._check_pid()
+
+        with self._lock:
+            self._pending[username][field] += amount
+            pending = len(self._pending)
+
+        if self._interval <= 0:
+            self.flush()
+            return
+
+        self._ensure_thread()
+        if pending >= self._max_pending:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """
+        Persist and clear all buffered increments.
+
+        Increments that were not applied are merged back into the buffer so they are retried on the next flush. Those that were are never retried, so a partially failed flush does not count them twice.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, defaultdict(
+                lambda: defaultdict(int)
+            )
+
+        counters = {username: dict(fields) for username, fields in pending.items()}
+        try:
+            applied = set(self._flush(counters))
+        except Exception as e:
+            print(f"Error flushing profile counters: {e}")
+            applied = set()
+
+        with self._lock:
+            for username, fields in counters.items():
+                if username in applied:
+                    continue
+                for field, amount in fields.items():
+                    self._pending[username][field] += amount
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="counter-flush", daemon=True
+                    )
+                    self._thread.start()
+
+    def _check_pid(self):
+        # Increments buffered by a parent process are the parent's to flush
+        if self._pid != os.getpid():
+            self._pending = defaultdict(lambda: defaultdict(int))
+            self._lock = threading.Lock()
+            self._wakeup = threading.Event()
+            self._thread = None
+            self._pid = os.getpid()
+
+
+def _flush_counters(counters: dict) -> list[str]:
+    return User().increment(counters)
+
+
+counter_buffer = CounterBuffer(
+    flush=_flush_counters,
+    interval=Config.COUNTER_FLUSH_INTERVAL,
+    max_pending=Config.COUNTER_FLUSH_MAX_PENDING,
+)
+atexit.register(counter_buffer.flush)
@@ -0,0 +1,181 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+from typing import IO, Iterable, Iterator
+
+from .user import User
+
+# Columns of an export, in output order. Private fields are never exported.
+EXPORT_FIELDS = [
+    "github_username",
+    "full_name",
+    "github_avatar",
+    "tags",
+    "profile_views",
+    "profile_likes",
+    "created_at",
+]
+
+# Content type and file extension of every supported format
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+}
+
+# Serialized rows are buffered up to this many bytes before a chunk is emitted,
+# so neither the HTTP response nor the compressor sees one tiny write per row.
+CHUNK_SIZE = 64 * 1024
+
+
+def _value(value):
+    # Stored datetimes are naive UTC; export them as ISO 8601 with an explicit offset
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    return value
+
+
+def _ndjson_lines(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        record = {field: _value(row.get(field)) for field in EXPORT_FIELDS}
+        yield json.dumps(record, default=str, separators=(",", ":")) + "\n"
+
+
+def _csv_lines(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(EXPORT_FIELDS)
+    for row in rows:
+        tags = row.get("tags")
+        yield line(
+            [
+                " ".join(tags or []) if field == "tags" else _value(row.get(field))
+                for field in EXPORT_FIELDS
+            ]
+        )
+
+
+def serialize_profiles(
+    rows: Iterable[dict], format: str = "ndjson", compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Serialize profiles row by row into an export file.
+
+    Args:
+        rows (Iterable[dict]): The profiles, e.g. a live database cursor.
+        format (str, optional): 'ndjson' (one JSON object per line) or 'csv' (with a header row).
+        compress (bool, optional): Whether to gzip the output.
+
+    Returns:
+        Iterator[bytes]: The file content in chunks of roughly `CHUNK_SIZE` bytes.
+
+    Raises:
+        ValueError: If `format` is not supported.
+
+    Note:
+        Only the current chunk is held in memory, so the output size does not affect memory use. With `compress`, the chunks form a single gzip stream.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    lines = _ndjson_lines(rows) if format == "ndjson" else _csv_lines(rows)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    pending, size = [], 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        size += len(data)
+
+        if size >= CHUNK_SIZE:
+            chunk = emit(b"".join(pending))
+            pending, size = [], 0
+            if chunk:
+                yield chunk
+
+    tail = emit(b"".join(pending))
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
+
+
+def export_profiles(
+    format: str = "ndjson", compress: bool = False, batch_size: int = None
+) -> Iterator[bytes]:
+    """
+    Stream every profile as an export file.
+
+    Args:
+        format (str, optional): 'ndjson' or 'csv'.
+        compress (bool, optional): Whether to gzip the output.
+        batch_size (int, optional): The number of documents per database round trip. Defaults to `Config.EXPORT_BATCH_SIZE`.
+
+    Returns:
+        Iterator[bytes]: The file content in chunks. The database is only queried once iteration starts.
+
+    Raises:
+        ValueError: If `format` is not supported.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    def generate():
+        projection = {"_id": 0, **{field: 1 for field in EXPORT_FIELDS}}
+        rows = User().iterate(projection=projection, batch_size=batch_size)
+        try:
+            yield from serialize_profiles(rows, format=format, compress=compress)
+        finally:
+            rows.close()
+
+    return generate()
+
+
+def read_profiles(file: IO[str], format: str = "ndjson") -> Iterator[dict]:
+    """
+    Read registration data from an NDJSON or CSV file, such as one written by `export_profiles`.
+
+    Only the fields a registration accepts are kept: 'github_username', 'email' and 'tags'. CSV tags are split on whitespace, the way they are joined on export.
+
+    Args:
+        file (IO[str]): The open text file.
+        format (str, optional): 'ndjson' or 'csv' (with a header row).
+
+    Returns:
+        Iterator[dict]: One dict per non-empty row.
+
+    Raises:
+        ValueError: If `format` is not supported or a line is not valid JSON.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {format}")
+
+    if format == "ndjson":
+        rows = (json.loads(line) for line in file if line.strip())
+    else:
+        rows = csv.DictReader(file)
+
+    for row in rows:
+        profile = {
+            field: row[field]
+            for field in ("github_username", "email", "tags")
+            if row.get(field)
+        }
+        if isinstance(profile.get("tags"), str):
+            profile["tags"] = profile["tags"].split()
+        if profile:
+            yield profile
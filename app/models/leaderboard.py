@@ -0,0 +1,338 @@
+import math
+import time
+import uuid
+from typing import Iterable
+
+import redis
+
+from app.cache.redis import get_redis
+from app.config.config import Config
+from app.exceptions.custom_exceptions import InvalidCursorError, MissingAttributeError
+
+from .pagination import decode_offset_cursor, encode_offset_cursor
+
+# The listings served from a leaderboard
+LEADERBOARDS = ("trending", "popular", "hot")
+
+# The counter each incrementally updated leaderboard ranks by. `hot` ranks by
+# the geometric mean of both, like the stored `combined_score`.
+COUNTER_BOARDS = {"profile_views": "trending", "profile_likes": "popular"}
+
+# Set once every leaderboard has been built from the database
+BUILT_KEY = "leaderboard:built"
+
+# Seconds the half-built leaderboards of a crashed rebuild are kept
+REBUILD_TTL = 3600
+
+
+def leaderboard_key(board: str) -> str:
+    return f"leaderboard:{board}"
+
+
+def leaderboard_scores(profile: dict) -> dict:
+    """
+    Return the score of a profile on every leaderboard.
+
+    Args:
+        profile (dict): The profile, with its `profile_views` and `profile_likes`.
+
+    Returns:
+        dict: The scores keyed by leaderboard name.
+    """
+    views = profile.get("profile_views") or 0
+    likes = profile.get("profile_likes") or 0
+    return {"trending": views, "popular": likes, "hot": math.sqrt(views * likes)}
+
+
+def hydration_projection(projection: dict | None) -> dict | None:
+    """
+    Extend a projection with the github_username a page is ranked by.
+
+    Args:
+        projection (dict | None): The requested projection.
+
+    Returns:
+        dict | None: The projection, including `github_username` when it selects fields by inclusion.
+    """
+    if not projection:
+        return projection
+
+    # Exclusion projections keep every other field, including the username
+    if not any(value for key, value in projection.items() if key != "_id"):
+        return projection
+
+    return {**projection, "github_username": 1}
+
+
+def rank_profiles(profiles: list[dict], usernames: list[str]) -> list[dict]:
+    """
+    Put hydrated profiles back into leaderboard order.
+
+    Args:
+        profiles (list[dict]): The profiles read with a `$in` query, which does not preserve order.
+        usernames (list[str]): The github_usernames of the page, best first.
+
+    Returns:
+        list[dict]: The profiles in the order of `usernames`. Profiles missing from the table are left out.
+    """
+    rank = {username: i for i, username in enumerate(usernames)}
+    return sorted(profiles, key=lambda profile: rank[profile["github_username"]])
+
+
+class Leaderboards:
+    """
+    Materialized `trending`, `popular` and `hot` rankings, kept in Redis sorted sets.
+
+    Every listed profile is a member of each set, scored by its view count, like count and their geometric mean. Counter flushes adjust the scores in place, so a page of a ranking is one O(log N + M) range read plus a single `$in` lookup of the profiles, instead of a sort over the table.
+
+    Attributes:
+        batch_size (int): The number of profiles written per Redis round trip during a rebuild.
+
+    Methods:
+        - page(board: str, limit: int, cursor: str) -> tuple[list[str], str | None] | None: Returns one page of a ranking.
+        - add(profiles: list[dict]) -> None: Lists new profiles with their current counts.
+        - remove(*usernames: str) -> None: Unlists profiles.
+        - increment(counters: dict) -> None: Applies flushed counter increments.
+        - rescore(profiles: list[dict]) -> None: Sets the scores of listed profiles to their current counts.
+        - rebuild(profiles: Iterable[dict]) -> int: Replaces every ranking with one built from the given profiles.
+
+    Note:
+        - Pages are read only once `rebuild` has run, e.g. through `flask db leaderboards` or the `rebuild_leaderboards` beat task; until then, and whenever Redis is unavailable, listings are sorted by MongoDB.
+        - Ties are ordered by github_username, descending. Pages are addressed by offset, so a profile moving across a page boundary between two requests may be shown twice or skipped, as in search results.
+        - Increments flushed while a rebuild reads the table may be missing from the new rankings; the next rebuild restores them.
+    """
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+
+    def page(
+        self, board: str, limit: int, cursor: str = None
+    ) -> tuple[list[str], str | None] | None:
+        """
+        Return one page of a ranking.
+
+        Args:
+            board (str): The leaderboard, one of `LEADERBOARDS`.
+            limit (int): The page size.
+            cursor (str, optional): The continuation token returned with the previous page.
+
+        Returns:
+            tuple[list[str], str | None] | None: The github_usernames of the page, best first, and the token for the next page, or None on the last page. None instead of a page when the ranking is unavailable or `cursor` was issued by the database listing, which then serves the request.
+
+        Raises:
+            InvalidCursorError: If `cursor` was issued for this leaderboard while it is no longer available.
+        """
+        scope = leaderboard_key(board)
+        offset = 0
+        if cursor:
+            try:
+                offset = decode_offset_cursor(scope, cursor)
+            except InvalidCursorError:
+                return None
+
+        members = None
+        client = get_redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.exists(BUILT_KEY)
+                pipe.zrevrange(scope, offset, offset + limit)
+                built, members = pipe.execute()
+                if not built:
+                    members = None
+            except redis.RedisError:
+                members = None
+
+        if members is None:
+            if cursor:
+                raise InvalidCursorError("The leaderboard is unavailable")
+            return None
+
+        usernames = [member.decode() for member in members]
+        if len(usernames) <= limit:
+            return usernames, None
+
+        return usernames[:limit], encode_offset_cursor(scope, offset + limit)
+
+    def add(self, profiles: list[dict]) -> None:
+        """
+        List new profiles with their current counts.
+
+        Profiles already listed keep their scores, so a late add never undoes a concurrent increment.
+
+        Args:
+            profiles (list[dict]): The profiles, with their `github_username` and counters.
+        """
+        client = get_redis()
+        if client is None or not profiles:
+            return
+
+        scores = {board: {} for board in LEADERBOARDS}
+        for profile in profiles:
+            for board, score in leaderboard_scores(profile).items():
+                scores[board][profile["github_username"]] = score
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for board, members in scores.items():
+                pipe.zadd(leaderboard_key(board), members, nx=True)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Error adding profiles to the leaderboards: {e}")
+
+    def remove(self, *usernames: str) -> None:
+        """
+        Unlist profiles from every ranking.
+
+        Args:
+            *usernames (str): The github_usernames of the profiles.
+        """
+        client = get_redis()
+        if client is None or not usernames:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for board in LEADERBOARDS:
+                pipe.zrem(leaderboard_key(board), *usernames)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Error removing profiles from the leaderboards: {e}")
+
+    def increment(self, counters: dict) -> None:
+        """
+        Apply flushed counter increments to the rankings.
+
+        Views and likes are added to the listed profiles only, so pending registrations stay unlisted. Both new counts are read in the same transaction, and the `hot` score is only ever raised, so concurrent flushes of one profile cannot leave an older score behind.
+
+        Args:
+            counters (dict): The increments keyed by github_username, as passed to `Base.increment`.
+        """
+        client = get_redis()
+        if client is None:
+            return
+
+        usernames = [
+            username
+            for username, fields in counters.items()
+            if any(fields.get(field) for field in COUNTER_BOARDS)
+        ]
+        if not usernames:
+            return
+
+        try:
+            pipe = client.pipeline()
+            for username in usernames:
+                for field, board in COUNTER_BOARDS.items():
+                    amount = counters[username].get(field)
+                    if amount:
+                        pipe.zadd(
+                            leaderboard_key(board),
+                            {username: amount},
+                            xx=True,
+                            incr=True,
+                        )
+                pipe.zscore(leaderboard_key("trending"), username)
+                pipe.zscore(leaderboard_key("popular"), username)
+            results = pipe.execute()
+
+            # Each profile's results end with its new view and like counts
+            hot, position = {}, 0
+            for username in usernames:
+                position += sum(
+                    1 for field in COUNTER_BOARDS if counters[username].get(field)
+                )
+                views, likes = results[position], results[position + 1]
+                position += 2
+                if views is not None and likes is not None:
+                    hot[username] = math.sqrt(views * likes)
+
+            if hot:
+                client.zadd(leaderboard_key("hot"), hot, xx=True, gt=True)
+        except redis.RedisError as e:
+            print(f"Error updating the leaderboards: {e}")
+
+    def rescore(self, profiles: list[dict]) -> None:
+        """
+        Set the scores of listed profiles to their current counts.
+
+        Unlike `increment`, every score may go down as well as up, so counters overwritten with absolute values are ranked by them. Pending registrations stay unlisted.
+
+        Args:
+            profiles (list[dict]): The profiles as just read from the database, with their `github_username` and counters.
+
+        Note:
+            An increment flushed between reading a profile and rescoring it may be lost from the rankings until the next rebuild.
+        """
+        client = get_redis()
+        if client is None or not profiles:
+            return
+
+        try:
+            pipe = client.pipeline()
+            for profile in profiles:
+                for board, score in leaderboard_scores(profile).items():
+                    pipe.zadd(
+                        leaderboard_key(board),
+                        {profile["github_username"]: score},
+                        xx=True,
+                    )
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Error rescoring profiles on the leaderboards: {e}")
+
+    def rebuild(self, profiles: Iterable[dict]) -> int:
+        """
+        Replace every ranking with one built from the given profiles.
+
+        The new rankings are written to temporary keys and renamed over the live ones in one transaction, so readers never see a partial ranking.
+
+        Args:
+            profiles (Iterable[dict]): Every listed profile, with its `github_username` and counters, e.g. a streaming database cursor.
+
+        Returns:
+            int: The number of profiles ranked.
+
+        Raises:
+            MissingAttributeError: If no Redis server is configured.
+            redis.RedisError: If Redis is unavailable.
+        """
+        client = get_redis()
+        if client is None:
+            raise MissingAttributeError("REDIS_SERVER required")
+
+        suffix = uuid.uuid4().hex
+        staging = {
+            board: f"{leaderboard_key(board)}:rebuild:{suffix}"
+            for board in LEADERBOARDS
+        }
+
+        count = 0
+        try:
+            pipe = client.pipeline(transaction=False)
+            for profile in profiles:
+                for board, score in leaderboard_scores(profile).items():
+                    pipe.zadd(staging[board], {profile["github_username"]: score})
+                count += 1
+                if count % self.batch_size == 0:
+                    for key in staging.values():
+                        pipe.expire(key, REBUILD_TTL)
+                    pipe.execute()
+            pipe.execute()
+
+            pipe = client.pipeline()
+            for board, key in staging.items():
+                if count:
+                    pipe.rename(key, leaderboard_key(board))
+                    pipe.persist(leaderboard_key(board))
+                else:
+                    pipe.delete(leaderboard_key(board))
+            pipe.set(BUILT_KEY, int(time.time()))
+            pipe.execute()
+        finally:
+            client.delete(*staging.values())
+
+        return count
+
+
+leaderboards = Leaderboards()
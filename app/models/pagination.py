@@ -0,0 +1,296 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from bson import json_util
+
+from app.exceptions.custom_exceptions import InvalidCursorError
+
+# Sort key for each named listing. Every listing is ordered by its key in
+# descending order with `_id` ascending as a tie-breaker, which makes the
+# (key, _id) pair unique and therefore usable as a keyset position.
+SORT_KEYS = {
+    "latest": "created_at",
+    "trending": "profile_views",
+    "popular": "profile_likes",
+    "hot": "combined_score",
+    "creative": "profile_likes",
+}
+
+
+def sort_spec(filter_type: str | None) -> dict:
+    """
+    Build the `$sort` specification for a listing.
+
+    Args:
+        filter_type (str | None): The named listing, or None for the default gallery order.
+
+    Returns:
+        dict: The sort specification, always ending with `_id` as a tie-breaker.
+    """
+    if filter_type is None:
+        return {"_id": 1}
+
+    return {SORT_KEYS[filter_type]: -1, "_id": 1}
+
+
+def listing_scope(filter_type: str) -> str:
+    """
+    Return the scope of the offset tokens issued for a listing, see `encode_offset_cursor`.
+
+    Args:
+        filter_type (str): The named listing.
+
+    Returns:
+        str: The scope, distinct from every search query and leaderboard.
+    """
+    return f"listing:{filter_type}"
+
+
+def offset_position(filter_type: str, cursor: str) -> int | None:
+    """
+    Decode a continuation token of a listing paged by offset.
+
+    Listings sorted by a timestamp are paged by offset while legacy string values remain, see `Base.paginate`. Pages already served keep being paged the way they started.
+
+    Args:
+        filter_type (str): The named listing.
+        cursor (str): The continuation token.
+
+    Returns:
+        int | None: The offset to resume at, or None if `cursor` is a keyset token.
+    """
+    try:
+        return decode_offset_cursor(listing_scope(filter_type), cursor)
+    except InvalidCursorError:
+        return None
+
+
+def keyset_projection(filter_type: str | None, projection: dict | None) -> dict | None:
+    """
+    Extend a projection with the fields a continuation token is built from.
+
+    Args:
+        filter_type (str | None): The named listing.
+        projection (dict | None): The requested projection.
+
+    Returns:
+        dict | None: The projection, including the listing's sort key when `projection` selects fields by inclusion.
+    """
+    if not projection or filter_type is None:
+        return projection
+
+    # Exclusion projections keep every other field, including the sort key
+    if not any(value for key, value in projection.items() if key != "_id"):
+        return projection
+
+    return {**projection, SORT_KEYS[filter_type]: 1}
+
+
+def encode_cursor(filter_type: str | None, document: dict) -> str:
+    """
+    Encode the keyset position of a document into an opaque continuation token.
+
+    Args:
+        filter_type (str | None): The named listing the token is issued for.
+        document (dict): The last document of the current page.
+
+    Returns:
+        str: A URL-safe token that resumes the listing right after `document`.
+    """
+    position = {"t": filter_type, "i": document["_id"]}
+    if filter_type is not None:
+        position["k"] = document.get(SORT_KEYS[filter_type])
+
+    payload = json_util.dumps(position, separators=(",", ":")).encode()
+    return urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(filter_type: str | None, token: str) -> dict:
+    """
+    Decode a continuation token produced by `encode_cursor`.
+
+    Args:
+        filter_type (str | None): The named listing the token is replayed against.
+        token (str): The continuation token.
+
+    Returns:
+        dict: The keyset position, with `i` holding the `_id` and `k` the sort key value.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or belongs to a different listing.
+    """
+    try:
+        payload = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json_util.loads(payload)
+    except Exception as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+
+    if not isinstance(position, dict) or "i" not in position:
+        raise InvalidCursorError("Malformed cursor")
+
+    if position.get("t") != filter_type:
+        raise InvalidCursorError("Cursor was issued for a different listing")
+
+    return position
+
+
+def combine_filters(*filters: dict | None) -> dict | None:
+    """
+    Combine MongoDB filters so a document has to match all of them.
+
+    Args:
+        *filters (dict | None): The filters; empty ones are skipped.
+
+    Returns:
+        dict | None: The single non-empty filter, an `$and` of several, or None if all are empty.
+    """
+    filters = [filter for filter in filters if filter]
+    if not filters:
+        return None
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
+
+
+def keyset_filter(filter_type: str | None, position: dict) -> dict:
+    """
+    Build the match stage that skips every document up to and including a keyset position.
+
+    Args:
+        filter_type (str | None): The named listing.
+        position (dict): A position returned by `decode_cursor`.
+
+    Returns:
+        dict: A MongoDB filter selecting the documents that sort after `position`.
+    """
+    if filter_type is None:
+        return {"_id": {"$gt": position["i"]}}
+
+    key = SORT_KEYS[filter_type]
+    return {
+        "$or": [
+            {key: {"$lt": position.get("k")}},
+            {key: position.get("k"), "_id": {"$gt": position["i"]}},
+        ]
+    }
+
+
+def listing_pipeline(
+    filter_type: str,
+    limit: int = None,
+    cursor: str = None,
+    projection: dict = None,
+    filter: dict = None,
+    offset: int = None,
+) -> list[dict]:
+    """
+    Build the aggregation pipeline that reads one page of a named listing.
+
+    Args:
+        filter_type (str): The named listing.
+        limit (int, optional): The maximum number of documents to return.
+        cursor (str, optional): A continuation token; only documents after it are returned.
+        projection (dict, optional): The `$project` stage applied to the page.
+        filter (dict, optional): Criteria every listed document must match, in addition to the cursor position.
+        offset (int, optional): The number of documents to skip, for listings paged by offset instead of `cursor`.
+
+    Returns:
+        list[dict]: The pipeline.
+
+    Raises:
+        InvalidCursorError: If `cursor` is malformed or was issued for another listing.
+    """
+    pipeline = []
+    position = (
+        keyset_filter(filter_type, decode_cursor(filter_type, cursor))
+        if cursor
+        else None
+    )
+    match = combine_filters(filter, position)
+    if match:
+        pipeline.append({"$match": match})
+
+    # Sort in descending order of the listing key, ties broken by _id.
+    # Every listing key is a stored, indexed field, so together with
+    # the $limit below this is an index walk rather than a collection scan.
+    pipeline.append({"$sort": sort_spec(filter_type)})
+
+    if offset:
+        pipeline.append({"$skip": offset})
+
+    if limit:
+        pipeline.append({"$limit": limit})
+
+    if projection:
+        pipeline.append({"$project": projection})
+
+    return pipeline
+
+
+def split_page(
+    filter_type: str | None, documents: list[dict], limit: int, offset: int = None
+) -> tuple[list[dict], str | None]:
+    """
+    Cut a page out of `limit + 1` fetched documents.
+
+    Args:
+        filter_type (str | None): The named listing the documents were read from.
+        documents (list[dict]): Up to `limit + 1` documents in listing order.
+        limit (int): The page size.
+        offset (int, optional): The offset the documents were read at, for listings paged by offset.
+
+    Returns:
+        tuple[list[dict], str | None]: The page and the continuation token for the next one, or None on the last page.
+    """
+    if len(documents) <= limit:
+        return documents, None
+
+    documents = documents[:limit]
+    if offset is not None:
+        return documents, encode_offset_cursor(
+            listing_scope(filter_type), offset + limit
+        )
+    return documents, encode_cursor(filter_type, documents[-1])
+
+
+def encode_offset_cursor(scope: str, offset: int) -> str:
+    """
+    Encode a position in a ranked result list into an opaque continuation token.
+
+    Used for rankings that are not backed by a sortable database key, such as search results.
+
+    Args:
+        scope (str): Identifies the result list, e.g. the normalized search query.
+        offset (int): The number of results already returned.
+
+    Returns:
+        str: A URL-safe token that resumes the list at `offset`.
+    """
+    payload = json_util.dumps({"s": scope, "o": offset}, separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+
+def decode_offset_cursor(scope: str, token: str) -> int:
+    """
+    Decode a continuation token produced by `encode_offset_cursor`.
+
+    Args:
+        scope (str): The result list the token is replayed against.
+        token (str): The continuation token.
+
+    Returns:
+        int: The offset to resume at.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or belongs to a different result list.
+    """
+    try:
+        payload = urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json_util.loads(payload)
+        offset = int(position["o"])
+    except Exception as e:
+        raise InvalidCursorError(f"Malformed cursor: {e}")
+
+    if position.get("s") != scope or offset < 0:
+        raise InvalidCursorError("Cursor was issued for a different listing")
+
+    return offset
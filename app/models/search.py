@@ -0,0 +1,158 @@
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from app.cache.page import page_cache
+from app.config.config import Config
+
+from .user import User
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Relative weight of a match in each indexed field
+FIELD_WEIGHTS = {"github_username": 3.0, "full_name": 2.0, "tags": 1.0}
+
+# Share of the field weight credited when a query term only matches a prefix
+PREFIX_FACTOR = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase alphanumeric terms.
+
+    Args:
+        text (str): The text to tokenize, e.g. a full name or a '#hashtag'.
+
+    Returns:
+        list[str]: The terms.
+    """
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """
+    An in-process inverted index over profile names, usernames and tags.
+
+    Each worker keeps its own index, built from a single pass over the profiles table. It is rebuilt when the page cache data version moves (that is, after a profile write), but at most once every `SEARCH_INDEX_MIN_AGE` seconds, and at least every `SEARCH_INDEX_MAX_AGE` seconds. Only the first build blocks a search; later rebuilds run in a background thread while searches keep reading the previous index, so results may lag a write by the length of one table scan.
+
+    Attributes:
+        _index (tuple[dict, list[str]]): The postings, mapping each term to the best field weight per github_username, and the sorted vocabulary used for prefix lookups. Both are replaced together by one assignment, so a search always reads a matching pair.
+        _rebuild (threading.Thread | None): The background rebuild, at most one per index.
+
+    Methods:
+        - search(query: str) -> list[str]: Returns the matching github_usernames, best match first.
+
+    Note:
+        - Every query term must match (AND semantics). A term matches a vocabulary term exactly or as a prefix; prefix matches score `PREFIX_FACTOR` of the field weight.
+        - Ties are broken by github_username so the ranking, and therefore offset pagination, is stable.
+    """
+
+    def __init__(self):
+        self._index = ({}, [])
+        self._version = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._rebuild = None
+
+    def search(self, query: str) -> list[str]:
+        """
+        Return the github_usernames matching a query, best match first.
+
+        Args:
+            query (str): The free-text query.
+
+        Returns:
+            list[str]: The ranked github_usernames.
+        """
+        self._ensure_current()
+        postings, terms = self._index
+
+        scores = None
+        for token in dict.fromkeys(tokenize(query)):
+            matches = defaultdict(float)
+
+            for index in range(bisect_left(terms, token), len(terms)):
+                term = terms[index]
+                if not term.startswith(token):
+                    break
+
+                factor = 1.0 if term == token else PREFIX_FACTOR
+                for username, weight in postings[term].items():
+                    matches[username] = max(matches[username], weight * factor)
+
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {u: s + matches[u] for u, s in scores.items() if u in matches}
+
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+
+        return sorted(scores, key=lambda username: (-scores[username], username))
+
+    def _ensure_current(self):
+        age = time.monotonic() - self._built_at
+        if self._version is not None and age < Config.SEARCH_INDEX_MIN_AGE:
+            return
+
+        version = page_cache.version()
+        if version == self._version and age < Config.SEARCH_INDEX_MAX_AGE:
+            return
+
+        with self._lock:
+            # Another thread may have rebuilt while this one waited for the lock
+            age = time.monotonic() - self._built_at
+            if self._version == version and age < Config.SEARCH_INDEX_MIN_AGE:
+                return
+
+            if self._version is None:
+                # Nothing to serve yet: the first search waits for the first build
+                self._build(version)
+                return
+
+            if self._rebuild is None or not self._rebuild.is_alive():
+                self._rebuild = threading.Thread(
+                    target=self._build_in_background, args=(version,), daemon=True
+                )
+                self._rebuild.start()
+
+    def _build_in_background(self, version):
+        try:
+            self._build(version)
+        except Exception as e:
+            print(f"Error rebuilding the search index: {e}")
+            # Keep serving the previous index, and retry after SEARCH_INDEX_MIN_AGE
+            self._built_at = time.monotonic()
+
+    def _build(self, version):
+        postings = defaultdict(dict)
+
+        projection = {"_id": 0, **{field: 1 for field in FIELD_WEIGHTS}}
+        for profile in User().get_all(projection=projection):
+            username = profile.get("github_username")
+            if not username:
+                continue
+
+            fields = {
+                "github_username": profile.get("github_username"),
+                "full_name": profile.get("full_name"),
+                "tags": " ".join(profile.get("tags") or []),
+            }
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    if postings[term].get(username, 0) < weight:
+                        postings[term][username] = weight
+
+        # A single assignment, so concurrent searches never pair new terms with old postings
+        self._index = (dict(postings), sorted(postings))
+        self._version = version
+        self._built_at = time.monotonic()
+
+
+search_index = SearchIndex()
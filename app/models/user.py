@@ -1,6 +1,75 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
 from app.config.config import Config
 
 from .base import Base
+from .leaderboard import (
+    COUNTER_BOARDS,
+    LEADERBOARDS,
+    hydration_projection,
+    leaderboards,
+    rank_profiles,
+)
+
+# The `hot` ranking: geometric mean of likes and views
+COMBINED_SCORE = {
+    "$sqrt": {
+        "$multiply": [
+            {"$ifNull": ["$profile_likes", 0]},
+            {"$ifNull": ["$profile_views", 0]},
+        ]
+    }
+}
+
+# Lifecycle of a profile registered asynchronously: it is stored as pending, then
+# activated once the GitHub enrichment succeeds. Profiles without a status are active.
+PROFILE_PENDING = "pending"
+PROFILE_ACTIVE = "active"
+
+# The fields a profile is ranked by on the leaderboards
+LEADERBOARD_PROJECTION = {
+    "_id": 0,
+    "github_username": 1,
+    "profile_views": 1,
+    "profile_likes": 1,
+    "profile_status": 1,
+}
+
+# The fields whose update changes a profile's leaderboard entries
+LEADERBOARD_FIELDS = {"profile_status", *COUNTER_BOARDS}
+
+
+def leaderboard_page(
+    filter_type: str, limit: int, cursor: str = None, projection: dict = None
+) -> tuple[dict, list[str], str | None] | None:
+    """
+    Read one page of a listing from its Redis leaderboard.
+
+    Args:
+        filter_type (str): The named listing.
+        limit (int): The page size.
+        cursor (str, optional): The continuation token returned with the previous page.
+        projection (dict, optional): The fields to return.
+
+    Returns:
+        tuple[dict, list[str], str | None] | None: The `filter` arguments that hydrate the page with a single `$in` query, the github_usernames of the page, best first, and the token for the next page. None when the listing is served by the database instead.
+
+    Raises:
+        InvalidCursorError: If `cursor` was issued by a leaderboard that is no longer available.
+    """
+    if filter_type not in LEADERBOARDS:
+        return None
+
+    page = leaderboards.page(filter_type, limit, cursor)
+    if page is None:
+        return None
+
+    usernames, next_cursor = page
+    hydration = {
+        "filter": {"github_username": {"$in": usernames}},
+        "projection": hydration_projection(projection),
+    }
+    return hydration, usernames, next_cursor
 
 
 class User(Base):
@@ -10,16 +79,37 @@ class User(Base):
     This class inherits from the `Base` class, which provides generic methods for interacting with a database table. The `User` class is specialized for managing user-related data and is configured to interact with a specific database table specified by the "USER_TABLE_NAME" environment variable.
 
     Attributes:
-        None
+        indexes (list): One compound index per gallery listing, matching its (key desc, _id asc) sort, plus a unique index on github_username that rejects duplicate registrations.
+        derived_fields (dict): Keeps `combined_score` stored and current so the `hot` listing can be served from an index.
+        visible_filter (dict): Hides pending registrations from listings, searches and exports until their GitHub data is filled in.
 
     Methods:
         - __init__(): Initializes a `User` instance, inheriting the database connection and methods from the `Base` class.
+        - paginate(filter_type: str, limit: int, cursor: str, projection: dict) -> tuple[list[dict], str | None]: Serves the `trending`, `popular` and `hot` listings from the Redis leaderboards when they are built.
+        - rebuild_leaderboards() -> int: Rebuilds the leaderboards from the profiles table.
+        - update_leaderboards(profile: dict, fields: set) -> None: Lists an activated profile and rescores overwritten counters.
+        - list_on_leaderboards(profiles: list[dict]) -> None: Adds profiles to the leaderboards, skipping pending registrations.
 
     Note:
         - This class is designed for managing user data specifically and relies on the generic database operations provided by the `Base` class.
         - The database table name is configured through the "USER_TABLE_NAME" environment variable.
+        - Writes keep the leaderboards current: listed profiles are added and removed with their records, counter flushes adjust their scores, and updates that overwrite a counter set them anew.
     """
 
+    indexes = [
+        IndexModel(
+            [("github_username", ASCENDING)], name="github_username", unique=True
+        ),
+        IndexModel([("created_at", DESCENDING), ("_id", ASCENDING)], name="latest"),
+        IndexModel(
+            [("profile_views", DESCENDING), ("_id", ASCENDING)], name="trending"
+        ),
+        IndexModel([("profile_likes", DESCENDING), ("_id", ASCENDING)], name="popular"),
+        IndexModel([("combined_score", DESCENDING), ("_id", ASCENDING)], name="hot"),
+    ]
+    derived_fields = {"combined_score": COMBINED_SCORE}
+    visible_filter = {"profile_status": {"$ne": PROFILE_PENDING}}
+
     def __init__(self):
         """
         Initialize a User instance for managing user-related data.
@@ -30,3 +120,143 @@ class User(Base):
             None
         """
         super().__init__(table_name=Config.TABLE_NAME)
+
+    def save(self, data: dict) -> str:
+        """Inserts a profile, see `Base.save`, and lists it on the leaderboards unless it is pending."""
+        response = super().save(data)
+        self.list_on_leaderboards([data])
+
+        return response
+
+    def save_many(self, data: list[dict]) -> list[int]:
+        """Inserts many profiles, see `Base.save_many`, and lists the inserted ones that are not pending."""
+        duplicates = super().save_many(data)
+        rejected = set(duplicates)
+        self.list_on_leaderboards(
+            [record for i, record in enumerate(data) if i not in rejected]
+        )
+
+        return duplicates
+
+    def update(self, data: dict) -> str:
+        """Updates a profile, see `Base.update`, and brings its leaderboard entries up to date, see `update_leaderboards`."""
+        response = super().update(data)
+
+        fields = (data.get("user_data") or {}).keys() & LEADERBOARD_FIELDS
+        if fields:
+            profile = self.get(
+                data["github_username"], projection=LEADERBOARD_PROJECTION
+            )
+            if profile:
+                self.update_leaderboards(profile, fields)
+
+        return response
+
+    def increment(self, counters: dict) -> list[str]:
+        """Adds to profile counters, see `Base.increment`, and moves the profiles whose increments were applied up the leaderboards."""
+        applied = super().increment(counters)
+        leaderboards.increment({username: counters[username] for username in applied})
+
+        return applied
+
+    def delete(self, uuid: int) -> str:
+        """Deletes a profile, see `Base.delete`, and unlists it."""
+        usernames = [
+            profile["github_username"]
+            for profile in self.filter(
+                filter={"user_uuid": uuid}, projection={"_id": 0, "github_username": 1}
+            )
+        ]
+        response = super().delete(uuid)
+        if response.deleted_count:
+            leaderboards.remove(*usernames)
+
+        return response
+
+    def discard(self, username: str, filter: dict = None) -> str:
+        """Deletes a profile by github_username, see `Base.discard`, and unlists it if it was deleted."""
+        response = super().discard(username, filter=filter)
+        if response.deleted_count:
+            leaderboards.remove(username)
+
+        return response
+
+    def paginate(
+        self,
+        filter_type: str = None,
+        limit: int = None,
+        cursor: str = None,
+        projection: dict = None,
+    ) -> tuple[list[dict], str | None]:
+        """
+        Retrieves one page of a listing, from the Redis leaderboards where possible.
+
+        A page of the `trending`, `popular` or `hot` listing is read from its leaderboard and hydrated with a single `$in` query. Other listings, and these ones while their leaderboard is unavailable, are served by `Base.paginate`.
+
+        Args:
+            filter_type (str, optional): The named listing, or None for the default gallery order.
+            limit (int, optional): The page size. Defaults to `Config.PAGE_SIZE`.
+            cursor (str, optional): The continuation token returned with the previous page, by either source.
+            projection (dict, optional): The fields to return, see `filter`.
+
+        Returns:
+            tuple[list[dict], str | None]: The documents of the page and the token for the next page, or None on the last page.
+
+        Raises:
+            InvalidCursorError: If `cursor` is malformed, was issued for another listing, or by a leaderboard that is no longer available.
+        """
+        limit = limit or Config.PAGE_SIZE
+        page = leaderboard_page(filter_type, limit, cursor, projection)
+
+        if page is None:
+            return super().paginate(
+                filter_type=filter_type,
+                limit=limit,
+                cursor=cursor,
+                projection=projection,
+            )
+
+        hydration, usernames, next_cursor = page
+        profiles = self.filter(**hydration) if usernames else []
+        return rank_profiles(profiles, usernames), next_cursor
+
+    def rebuild_leaderboards(self) -> int:
+        """
+        Rebuilds the Redis leaderboards from the listed profiles.
+
+        Returns:
+            int: The number of profiles ranked.
+        """
+        return leaderboards.rebuild(self.iterate(projection=LEADERBOARD_PROJECTION))
+
+    @staticmethod
+    def update_leaderboards(profile: dict, fields: set) -> None:
+        """
+        Brings the leaderboard entries of an updated profile up to date.
+
+        An activated registration enters the listings, and counters overwritten with absolute values are ranked by them, whether they went up or down.
+
+        Args:
+            profile (dict): The profile as read after the update, with the fields of `LEADERBOARD_PROJECTION`.
+            fields (set): The updated fields among `LEADERBOARD_FIELDS`.
+        """
+        if "profile_status" in fields:
+            User.list_on_leaderboards([profile])
+        if fields & COUNTER_BOARDS.keys():
+            leaderboards.rescore([profile])
+
+    @staticmethod
+    def list_on_leaderboards(profiles: list[dict]) -> None:
+        """
+        Adds profiles to the leaderboards, skipping pending registrations.
+
+        Args:
+            profiles (list[dict]): The profiles, with at least the fields of `LEADERBOARD_PROJECTION`.
+        """
+        leaderboards.add(
+            [
+                profile
+                for profile in profiles
+                if profile.get("profile_status") != PROFILE_PENDING
+            ]
+        )
@@ -1,6 +1,16 @@
-from pydantic import BaseModel, EmailStr, constr
+import math
+from datetime import datetime
 
-from .utils import TimestampMixin, generate_password
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    TypeAdapter,
+    computed_field,
+    constr,
+    field_validator,
+)
+
+from .utils import TimestampMixin, generate_password, parse_legacy_timestamp
 
 
 class BaseUser(BaseModel):
@@ -48,8 +58,9 @@ class UserIn(TimestampMixin, BaseUser):
         github_username (Optional[str]): The GitHub username of the user.
         tags (Optional[list]): A list of tags associated with the user.
         profile_views (Optional[int]): The number of profile views for the user.
-        created_at (str): The timestamp indicating when the user was created (in the Asia/Kolkata timezone).
-        updated_at (str): The timestamp indicating when the user was last updated (in the Asia/Kolkata timezone).
+        created_at (datetime): The UTC timestamp indicating when the user was created.
+        updated_at (datetime): The UTC timestamp indicating when the user was last updated.
+        combined_score (float): The stored `hot` ranking score, derived from profile_likes and profile_views.
 
     Config:
         from_attributes (bool): Indicates whether attribute values should be populated from the corresponding class attributes when creating an instance. Defaults to True.
@@ -63,6 +74,12 @@ class UserIn(TimestampMixin, BaseUser):
     email: EmailStr | None = None
     password: str = generate_password()
 
+    @computed_field
+    @property
+    def combined_score(self) -> float:
+        """The `hot` ranking score stored alongside the counters it is derived from."""
+        return math.sqrt((self.profile_likes or 0) * (self.profile_views or 0))
+
     class Config:
         """
         Configuration options for Pydantic models.
@@ -87,6 +104,8 @@ class UserOut(BaseUser):
         github_username (Optional[str]): The GitHub username of the user.
         profile_views (Optional[int]): The number of profile views for the user.
         tags (Optional[List[str]]): A list of tags associated with the user.
+        screenshot (Optional[dict]): The manifest of the thumbnail variants of the user's profile screenshot.
+        created_at (Optional[datetime]): When the user registered, in UTC.
 
     Inherits from:
         BaseUser: The base user model with common attributes.
@@ -95,6 +114,20 @@ class UserOut(BaseUser):
         This class serves as a specialized version of `BaseUser` specifically designed for representing user data in response objects. It introduces additional attributes: `full_name`, `github_avatar`, `github_username`, `profile_views`, and `tags`.
     """
 
+    screenshot: dict | None = None
+    created_at: datetime | None = None
+
+    @field_validator("created_at", mode="before")
+    @classmethod
+    def parse_legacy_created_at(cls, value):
+        """Accept timestamps still stored in the legacy string format; unreadable ones are dropped."""
+        if isinstance(value, str):
+            try:
+                return parse_legacy_timestamp(value)
+            except ValueError:
+                return None
+        return value
+
     class Config:
         """
         Configuration options for Pydantic models.
@@ -106,6 +139,17 @@ class UserOut(BaseUser):
         from_attributes = True
 
 
+# The fields `UserOut` reads, as a projection pushed down into profile listings
+USER_OUT_PROJECTION = {field: 1 for field in UserOut.model_fields}
+
+# Validates a whole result set in a single call, instead of one `UserOut(**row)` per row.
+# Building an adapter compiles a validator, so it is built once at import time.
+user_out_list = TypeAdapter(list[UserOut])
+
+# Validates a whole batch of registrations in a single call
+user_in_list = TypeAdapter(list[UserIn])
+
+
 class UserUpdate(BaseModel):
     """
     Represents a user update model for modifying user data.
@@ -1,31 +1,89 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
 import secrets
 import pytz
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.config.config import Config
+
+# Timestamps used to be stored as strings in this format, in this timezone
+LEGACY_TIMESTAMP_FORMAT = "%Y-%m-%d || %H:%M:%S:%f"
+LEGACY_TIMEZONE = "Asia/Kolkata"
+
+# The timestamp fields of every record
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def utcnow() -> datetime:
+    """
+    Return the current time as a timezone-aware UTC datetime.
+
+    Returns:
+        datetime: The current time, stored by MongoDB as a native BSON date.
+    """
+    return datetime.now(timezone.utc)
+
+
+def parse_legacy_timestamp(value: str) -> datetime:
+    """
+    Convert a timestamp string in the legacy format to a UTC datetime.
+
+    Args:
+        value (str): A timestamp formatted as `LEGACY_TIMESTAMP_FORMAT` in `LEGACY_TIMEZONE`.
+
+    Returns:
+        datetime: The same instant as a timezone-aware UTC datetime.
+
+    Raises:
+        ValueError: If `value` is not in the legacy format.
+    """
+    local = datetime.strptime(value, LEGACY_TIMESTAMP_FORMAT)
+    return pytz.timezone(LEGACY_TIMEZONE).localize(local).astimezone(timezone.utc)
+
+
+def localtime(value, format: str = "%d %b %Y") -> str:
+    """
+    Format a stored timestamp in `Config.DISPLAY_TIMEZONE`, for use as a template filter.
+
+    Args:
+        value (datetime | str | None): A stored timestamp. Naive datetimes are UTC, as returned by PyMongo; legacy strings are converted first.
+        format (str, optional): The `strftime` format.
+
+    Returns:
+        str: The formatted local time, or '' if there is no timestamp.
+    """
+    if not value:
+        return ""
+
+    if isinstance(value, str):
+        try:
+            value = parse_legacy_timestamp(value)
+        except ValueError:
+            return value
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(pytz.timezone(Config.DISPLAY_TIMEZONE)).strftime(format)
 
 
 class TimestampMixin(BaseModel):
     """
     A Pydantic mixin class to provide timestamp fields for created and updated times.
 
-    This mixin class extends Pydantic's `BaseModel` to include timestamp fields for both 'created_at' and 'updated_at' times. The timestamps are automatically generated in the 'Asia/Kolkata' timezone when an instance of a model that inherits from this mixin is created.
+    This mixin class extends Pydantic's `BaseModel` to include timestamp fields for both 'created_at' and 'updated_at' times. The timestamps are generated when an instance of a model that inherits from this mixin is created.
 
     Attributes:
         created_at (datetime): The timestamp indicating the creation time of the object.
         updated_at (datetime): The timestamp indicating the last update time of the object.
 
     Note:
-        - The timestamps are generated in the 'Asia/Kolkata' timezone.
-        - The format for the timestamps is '%Y-%m-%d || %H:%M:%S:%f'.
+        - The timestamps are timezone-aware UTC datetimes, stored by MongoDB as native BSON dates. Convert them to local time for display only, see `localtime`.
+        - Records written before this change hold strings in `LEGACY_TIMESTAMP_FORMAT`; `flask db migrate-timestamps` converts them.
     """
 
-    created_at: str = datetime.now(pytz.timezone("Asia/Kolkata")).strftime(
-        "%Y-%m-%d || %H:%M:%S:%f"
-    )
-    updated_at: str = datetime.now(pytz.timezone("Asia/Kolkata")).strftime(
-        "%Y-%m-%d || %H:%M:%S:%f"
-    )
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 
 def generate_password() -> str:
@@ -1,6 +1,7 @@
 /**
- * Increments a counter on the client side and updates the user profile views on the server.
+ * Increments a counter on the client side and records the view or like on the server.
  *
+ * @param {string} element - The counter to increment, either 'counter' (views) or 'likes'.
  * @param {string} id - The identifier associated with the counter and user profile.
  *
  * @returns {Promise<void>} - A Promise that resolves when the operation is complete.
@@ -8,8 +9,8 @@
  * @throws {Error} - If there is an issue with the fetch operation or server response.
  *
  * @example
- * // Increment the counter for user with id 'mramitdas'
- * incrementCounter('mramitdas');
+ * // Increment the view counter for user with id 'mramitdas'
+ * incrementCounter('counter', 'mramitdas');
  */
 async function incrementCounter(element, id) {
   try {
@@ -18,28 +19,22 @@ async function incrementCounter(element, id) {
     let count = parseInt(counterElement.innerText) + 1;
     counterElement.innerText = count;
 
-    // Prepare data for server update
-    let requestData = {
-      github_username: id,
-      user_data: {},
-    };
-
+    // The server applies the increment atomically, so only the event is sent
+    let counter;
     if (element === 'counter') {
-      requestData.user_data.profile_views = count; 
+      counter = 'view';
     } else if (element === 'likes') {
-      requestData.user_data.profile_likes = count; 
+      counter = 'like';
     } else {
-      console.log("code broke while appending json with counter")
+      console.log("code broke while resolving the counter type")
+      return;
     }
 
-    // Make a PATCH request to update the user profile on the server
-    const response = await fetch("/profile/update", {
-      method: "PATCH",
-      headers: {
-        "Content-Type": "application/json",
-      },
-      body: JSON.stringify(requestData),
-    });
+    // Make a POST request to record the view or like on the server
+    const response = await fetch(
+      "/profile/" + encodeURIComponent(id) + "/" + counter,
+      { method: "POST" }
+    );
 
     // Parse the server response as JSON
     const data = await response.json();
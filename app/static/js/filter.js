@@ -1,69 +1,61 @@
 /**
  *
- * This script is designed to enhance a web page containing a list of cards.
- * It includes functionality to filter and display cards based on a search input.
+ * This script wires the header search input to the server-side profile search.
  *
  * Variables:
  * - searchBar: Represents the HTML element for the search input.
- * - cardTitles: Represents a NodeList of HTML elements with the class "card__title,"
- *               typically containing the titles of cards.
- * - cardContainers: Represents a NodeList of HTML elements with the class "card_container,"
- *                   representing the containers for individual cards.
- * - cardTitlesText: An array to store the lowercase text content of card titles.
+ * - galleryHTML: The cards rendered with the page, restored when the search is cleared.
+ * - searchTimer: The pending debounce timer, if any.
+ * - searchRequest: Counts issued searches so responses arriving out of order are ignored.
  *
  * Functions:
- * - collectCardTitle: A function that populates the cardTitlesText array with the
- *                     lowercase text content of card titles. This function is called
- *                     during initialization to set up the initial state.
- *
- * - filter: A function that is triggered on each keyup event in the search input.
- *           It filters and displays only the cards whose titles contain the entered text.
- *           It updates the display style of card containers accordingly.
+ * - search: Queries `appData.userProfileSearch` for the entered text and replaces the
+ *           cards with the first page of ranked matches. Further matches are loaded
+ *           lazily by pagination.js through the sentinel included in the response.
  *
  * Execution:
- * The script initializes by calling collectCardTitle() to populate the cardTitlesText array.
- * The filter() function is also called initially to set up the initial state.
- * Event listener is added to the search input, so that the filter() function is triggered
- * every time the user types into the search bar.
+ * An event listener is added to the search input. Keystrokes are debounced so a query
+ * is only sent once the user pauses typing.
  *
- * Note: This script assumes a specific HTML structure with elements having specific classes.
- * Adjustments may be needed based on the actual structure of the web page.
+ * Note: This script relies on pagination.js (`cardList`, `observeSentinel`) being loaded first.
  */
 const searchBar = document.querySelector(".searchInput");
-const cardTitles = document.querySelectorAll(".card__title");
-const cardContainers = document.querySelectorAll(".card_container");
-const cardTitlesText = [];
+const galleryHTML = cardList.innerHTML;
+let searchTimer = null;
+let searchRequest = 0;
 
 /**
- * Collects the lowercase text content of card titles and logs the result to the console.
+ * Replaces the cards with the server-side matches for the entered search text.
+ * Restores the original gallery when the search input is cleared.
  */
-const collectCardTitle = () => {
-  cardTitles.forEach((title) => {
-    cardTitlesText.push(title.innerHTML.toLowerCase());
-  });
-  console.log(cardTitlesText);
-};
+const search = async () => {
+  const text = searchBar.value.trim();
+  const request = ++searchRequest;
 
-/**
- * Filters and displays cards based on the entered search text.
- * Updates the display style of card containers accordingly.
- */
-const filter = () => {
-  const text = searchBar.value.toLowerCase();
-  const matchingTitles = cardTitlesText.filter((title) => title.includes(text));
+  if (!text) {
+    cardList.innerHTML = galleryHTML;
+    observeSentinel();
+    return;
+  }
 
-  cardContainers.forEach((container, index) => {
-    if (matchingTitles.includes(cardTitlesText[index])) {
-      container.style.display = "block";
-    } else {
-      container.style.display = "none";
+  const params = new URLSearchParams({ q: text, format: "html" });
+  try {
+    const response = await fetch(appData.userProfileSearch + "?" + params);
+    if (!response.ok) {
+      throw new Error("Search failed: " + response.status);
+    }
+    const fragment = await response.text();
+    if (request === searchRequest) {
+      cardList.innerHTML = fragment;
+      observeSentinel();
     }
-  });
+  } catch (error) {
+    console.error("There was a problem:", error);
+  }
 };
 
-// Initial setup
-collectCardTitle();
-filter();
-
 // Event listener for search input
-searchBar.addEventListener("keyup", filter);
+searchBar.addEventListener("keyup", () => {
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(search, 250);
+});
@@ -1,5 +1,6 @@
 $(function () {
-  $(".heart").on("click", async function () {
+  // Delegated so cards appended by pagination.js are handled as well
+  $(document).on("click", ".heart", async function () {
     // Toggle the "is-active" class
     $(this).toggleClass("is-active");
   });
@@ -0,0 +1,56 @@
+/**
+ * Lazily appends the next page of profile cards to the gallery.
+ *
+ * The server renders the first page of cards and, when more profiles exist, a
+ * `.load-more` sentinel carrying the URL of the next page (including its opaque
+ * continuation cursor). When the sentinel scrolls into view the next page is
+ * fetched as an HTML fragment and the sentinel is replaced by the new cards
+ * (which carry their own sentinel if there is yet another page). The same
+ * mechanism pages through gallery listings and search results.
+ */
+const cardList = document.querySelector(".cards");
+
+/**
+ * Fetches the page following the given sentinel and swaps it in.
+ *
+ * @param {HTMLElement} sentinel - The `.load-more` element that became visible.
+ * @returns {Promise<void>}
+ */
+const loadMoreCards = async (sentinel) => {
+  try {
+    const response = await fetch(sentinel.dataset.url);
+    if (!response.ok) {
+      throw new Error("Failed to load more profiles: " + response.status);
+    }
+    const fragment = await response.text();
+    sentinel.insertAdjacentHTML("beforebegin", fragment);
+    sentinel.remove();
+    observeSentinel();
+  } catch (error) {
+    console.error("There was a problem:", error);
+  }
+};
+
+const sentinelObserver = new IntersectionObserver(
+  (entries) => {
+    entries.forEach((entry) => {
+      if (entry.isIntersecting) {
+        sentinelObserver.unobserve(entry.target);
+        loadMoreCards(entry.target);
+      }
+    });
+  },
+  { rootMargin: "600px" }
+);
+
+/**
+ * Starts watching the current `.load-more` sentinel, if the page has one.
+ */
+const observeSentinel = () => {
+  const sentinel = cardList.querySelector(".load-more");
+  if (sentinel) {
+    sentinelObserver.observe(sentinel);
+  }
+};
+
+observeSentinel();
@@ -0,0 +1,263 @@
+import abc
+import os
+import re
+import tempfile
+
+from app.config.config import Config
+from app.exceptions.custom_exceptions import MissingAttributeError
+from app.github.publisher import publisher
+from app.worker.images import content_hash
+
+# Path of the route serving stored files, see `app.api.V1.endpoints.media`
+MEDIA_ROUTE = "/media"
+
+# The backends whose files the media route serves. GitHub files are loaded from
+# raw.githubusercontent.com instead.
+SERVED_STORAGES = ("local", "s3")
+
+# Keys are the content hash of a file plus its extension, e.g. '3f2a9c0d1e4b5a67.webp'
+MEDIA_KEY = re.compile(r"^[0-9a-f]{16}\.(png|webp|avif)$")
+
+CONTENT_TYPES = {"png": "image/png", "webp": "image/webp", "avif": "image/avif"}
+
+# A stored file never changes, since a new content gets a new key
+IMMUTABLE_MAX_AGE = 31536000
+IMMUTABLE_CACHE_CONTROL = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+
+
+def media_key(content: bytes, extension: str) -> str:
+    """
+    Return the content-addressed key of a file.
+
+    Args:
+        content (bytes): The file content.
+        extension (str): The file extension, e.g. 'webp'.
+
+    Returns:
+        str: The content hash of the file followed by its extension.
+    """
+    return f"{content_hash(content)}.{extension}"
+
+
+class MediaStorage(abc.ABC):
+    """
+    The base of the screenshot storage backends.
+
+    Files are addressed by their content: the key of a file is the hash of its bytes, so a key always refers to the same bytes. Storing identical content twice is a no-op, and browsers and CDNs may cache a file forever.
+
+    Attributes:
+        name (str): The backend name recorded in the screenshot manifest, so a profile keeps resolving its files after the configured backend changes.
+
+    Methods:
+        - put(content: bytes, extension: str) -> str: Stores a file and returns its key.
+        - exists(key: str) -> bool: Tells whether a file is stored.
+        - get(key: str) -> bytes | None: Returns the content of a file.
+        - path(key: str) -> str | None: Returns the local path of a file, if it has one.
+        - url(key: str) -> str: Returns the URL a browser loads the file from.
+    """
+
+    name = None
+
+    def put(self, content: bytes, extension: str) -> str:
+        """
+        Store a file under its content-addressed key.
+
+        Args:
+            content (bytes): The file content.
+            extension (str): The file extension, one of `CONTENT_TYPES`.
+
+        Returns:
+            str: The key of the file.
+        """
+        key = media_key(content, extension)
+        if not self.exists(key):
+            self._write(key, content)
+        return key
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        """Tell whether a file is stored under `key`."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the content of a file, or None if it is not stored."""
+
+    def path(self, key: str) -> str | None:
+        """Return the local path of a file, or None if the backend has no local files."""
+        return None
+
+    def url(self, key: str) -> str:
+        """
+        Return the URL a browser loads a file from.
+
+        Args:
+            key (str): The key of the file.
+
+        Returns:
+            str: A URL under `Config.MEDIA_PUBLIC_URL` when the files of the configured backend are served directly, e.g. by a CDN or a public bucket, otherwise the path of the media route, which names the backend.
+        """
+        if Config.MEDIA_PUBLIC_URL and self.name == Config.MEDIA_STORAGE:
+            return f"{Config.MEDIA_PUBLIC_URL.rstrip('/')}/{key}"
+        return f"{MEDIA_ROUTE}/{self.name}/{key}"
+
+    @abc.abstractmethod
+    def _write(self, key: str, content: bytes) -> None:
+        """Store a file under `key`; only called by `put` when it is not stored yet."""
+
+
+class LocalStorage(MediaStorage):
+    """
+    Stores files on the local filesystem, under `Config.MEDIA_ROOT`.
+
+    Files are spread over subdirectories named after the first two characters of their key, so no directory grows to hold every file. Every process serving or capturing screenshots needs to see the same directory, e.g. through a shared volume.
+
+    Attributes:
+        root (str): The absolute path of the storage directory.
+
+    Note:
+        Files are written to a temporary file and renamed into place, so a concurrent reader never sees a partial file.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str = None):
+        self.root = os.path.abspath(root or Config.MEDIA_ROOT)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self.path(key))
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            with open(self.path(key), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: str, content: bytes) -> None:
+        directory = os.path.dirname(self.path(key))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temporary = tempfile.mkstemp(dir=directory, prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(temporary, self.path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class GitHubStorage(MediaStorage):
+    """
+    Stores files in the GitHub repository, through the batching `GitHubPublisher`.
+
+    Files are staged under `app/static/profiles/` and committed by the `publish_screenshots` beat task, so they become visible only after the next commit. Browsers load them from raw.githubusercontent.com, which the app cannot give long-lived cache headers.
+
+    Note:
+        Keys of this backend are repository paths. Manifests written before storage backends existed have no backend name and are resolved here, so their paths are served as before.
+    """
+
+    name = "github"
+
+    # Directory of the repository the files are committed to
+    directory = "app/static/profiles"
+
+    def put(self, content: bytes, extension: str) -> str:
+        # Staged files are not visible before the next commit, so every put stages its file
+        path = f"{self.directory}/{media_key(content, extension)}"
+        self._write(path, content)
+        return path
+
+    def exists(self, key: str) -> bool:
+        return False
+
+    def get(self, key: str) -> bytes | None:
+        return None
+
+    def _write(self, key: str, content: bytes) -> None:
+        publisher.stage(key, content)
+
+    def url(self, key: str) -> str:
+        return (
+            f"https://raw.githubusercontent.com/{Config.REPO_OWNER}/"
+            f"{Config.REPO_NAME}/{Config.BRANCH}/{key}"
+        )
+
+
+_storages = {}
+
+
+def get_storage(name: str = None) -> MediaStorage:
+    """
+    Return a storage backend, created once per process.
+
+    Args:
+        name (str, optional): 'local', 's3' or 'github'. Defaults to `Config.MEDIA_STORAGE`.
+
+    Returns:
+        MediaStorage: The backend.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    Note:
+        The S3 backend is imported on first use, so boto3 is only needed where it is configured.
+    """
+    name = name or Config.MEDIA_STORAGE
+    if name not in _storages:
+        if name == LocalStorage.name:
+            _storages[name] = LocalStorage()
+        elif name == GitHubStorage.name:
+            _storages[name] = GitHubStorage()
+        elif name == "s3":
+            from .s3 import S3Storage
+
+            _storages[name] = S3Storage()
+        else:
+            raise ValueError(f"Unknown media storage '{name}'")
+
+    return _storages[name]
+
+
+def served_storages(name: str = None) -> list[MediaStorage]:
+    """
+    Return the backends the media route looks a file up in.
+
+    Args:
+        name (str, optional): The backend named in the file URL, as recorded in the screenshot manifest. URLs issued before they named one are looked up in the configured backend first, then in the other served ones.
+
+    Returns:
+        list[MediaStorage]: The backends to try, in order. Backends that are not served or not configured, e.g. S3 without a bucket, are left out.
+    """
+    if name is not None:
+        names = [name]
+    else:
+        names = dict.fromkeys([Config.MEDIA_STORAGE, *SERVED_STORAGES])
+
+    storages = []
+    for candidate in names:
+        if candidate not in SERVED_STORAGES:
+            continue
+        try:
+            storages.append(get_storage(candidate))
+        except (MissingAttributeError, ImportError):
+            continue
+
+    return storages
+
+
+def media_url(key: str, storage: str = None) -> str:
+    """
+    Return the URL of a stored screenshot file, for templates.
+
+    Args:
+        key (str): The key recorded in the screenshot manifest.
+        storage (str, optional): The backend name recorded in the manifest. Manifests without one predate storage backends and are resolved by the GitHub backend.
+
+    Returns:
+        str: The URL a browser loads the file from.
+    """
+    return get_storage(storage or GitHubStorage.name).url(key)
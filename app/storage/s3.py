@@ -0,0 +1,83 @@
+import os
+
+import boto3
+from botocore.exceptions import ClientError
+
+from app.config.config import Config
+from app.exceptions.custom_exceptions import MissingAttributeError
+
+from .backends import CONTENT_TYPES, IMMUTABLE_CACHE_CONTROL, MediaStorage
+
+
+class S3Storage(MediaStorage):
+    """
+    Stores files in an S3-compatible bucket, e.g. AWS S3 or MinIO.
+
+    Objects are written with their content type and an immutable `Cache-Control`, so they can be served straight from the bucket or a CDN in front of it through `Config.MEDIA_PUBLIC_URL`. Without it, the media route streams them from the bucket.
+
+    Attributes:
+        bucket (str): The bucket name.
+        prefix (str): The prefix of every object key, e.g. 'profiles/'.
+        endpoint_url (str | None): The S3 API endpoint; None for AWS.
+
+    Note:
+        - Credentials are read by boto3 itself, e.g. from `AWS_ACCESS_KEY_ID` and `AWS_SECRET_ACCESS_KEY`.
+        - The boto3 client is created per process, so pooled connections are never shared across a fork.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str = None,
+        prefix: str = None,
+        endpoint_url: str = None,
+        region: str = None,
+    ):
+        self.bucket = bucket or Config.MEDIA_S3_BUCKET
+        if not self.bucket:
+            raise MissingAttributeError("MEDIA_S3_BUCKET required")
+
+        self.prefix = Config.MEDIA_S3_PREFIX if prefix is None else prefix
+        self.endpoint_url = endpoint_url or Config.MEDIA_S3_ENDPOINT_URL
+        self.region = region or Config.MEDIA_S3_REGION
+        self._client = None
+        self._pid = None
+
+    @property
+    def client(self):
+        """The boto3 S3 client owned by the current process."""
+        if self._client is None or self._pid != os.getpid():
+            self._client = boto3.session.Session().client(
+                "s3", endpoint_url=self.endpoint_url, region_name=self.region
+            )
+            self._pid = os.getpid()
+
+        return self._client
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+        return True
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+        return response["Body"].read()
+
+    def _write(self, key: str, content: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.prefix + key,
+            Body=content,
+            ContentType=CONTENT_TYPES[key.rsplit(".", 1)[-1]],
+            CacheControl=IMMUTABLE_CACHE_CONTROL,
+        )
@@ -0,0 +1,200 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from pyppeteer import launch
+
+from app.config.config import Config
+
+# Desktop environment emulated by every pooled page
+PAGE_EMULATION = {
+    "viewport": {"width": 1920, "height": 1080},
+    "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+
+
+class _PooledPage:
+    def __init__(self, browser, page):
+        self.browser = browser
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    A warm pool of headless Chromium instances and pages for screenshot capture.
+
+    Launching Chromium costs a second or more. The pool keeps `size` browsers running for the lifetime of the worker process and hands out pages to concurrent captures, so throughput scales with the pool size instead of browser start-up time.
+
+    Attributes:
+        size (int): The number of Chromium instances.
+        pages_per_browser (int): The number of pages each instance may render concurrently.
+        max_page_uses (int): How many captures a page serves before it is closed and replaced.
+        health_timeout (float): Seconds a browser has to answer a health check.
+
+    Methods:
+        - loop -> asyncio.AbstractEventLoop | None: The event loop the pool is bound to.
+        - page() -> AsyncContextManager[pyppeteer.page.Page]: Borrows an emulated page from the pool.
+        - close() -> None: Closes every browser.
+
+    Note:
+        - At most `size * pages_per_browser` pages are in use at once; further callers wait on a semaphore.
+        - A browser that crashed or stopped answering is relaunched the next time a page is needed from it.
+        - A page that raised while borrowed is closed rather than returned to the pool.
+        - The pool is bound to the event loop it was first used on and resets itself if used from another loop.
+    """
+
+    def __init__(
+        self,
+        size: int = None,
+        pages_per_browser: int = None,
+        max_page_uses: int = None,
+        health_timeout: float = None,
+    ):
+        self.size = size or Config.BROWSER_POOL_SIZE
+        self.pages_per_browser = pages_per_browser or Config.BROWSER_PAGES_PER_BROWSER
+        self.max_page_uses = max_page_uses or Config.BROWSER_PAGE_MAX_USES
+        self.health_timeout = health_timeout or Config.BROWSER_HEALTH_TIMEOUT
+        self._reset_state()
+
+    def _reset_state(self):
+        self._loop = None
+        self._browsers = [None] * self.size
+        self._open_pages = [0] * self.size
+        self._idle = []
+        self._semaphore = None
+        self._lock = None
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pyppeteer objects cannot be driven from a different loop
+            self._reset_state()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.size * self.pages_per_browser)
+            self._lock = asyncio.Lock()
+
+    @property
+    def loop(self):
+        """The event loop the pool's browsers are bound to, or None before first use."""
+        return self._loop
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Borrow an emulated page from the pool.
+
+        Yields:
+            pyppeteer.page.Page: A page with the desktop viewport and user agent applied.
+        """
+        self._bind_loop()
+
+        async with self._semaphore:
+            pooled = await self._checkout()
+            try:
+                yield pooled.page
+            except BaseException:
+                await self._discard(pooled)
+                raise
+            else:
+                await self._checkin(pooled)
+
+    async def close(self) -> None:
+        """
+        Close every browser in the pool.
+        """
+        browsers = [browser for browser in self._browsers if browser is not None]
+        self._browsers = [None] * self.size
+        self._open_pages = [0] * self.size
+        self._idle = []
+
+        for browser in browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Error closing browser: {e}")
+
+    async def _checkout(self) -> _PooledPage:
+        async with self._lock:
+            while self._idle:
+                pooled = self._idle.pop()
+                if not pooled.page.isClosed() and self._is_running(pooled.browser):
+                    return pooled
+                self._forget(pooled)
+
+            index = min(range(self.size), key=lambda i: self._open_pages[i])
+            browser = await self._healthy_browser(index)
+            page = await browser.newPage()
+            await page.emulate(PAGE_EMULATION)
+            self._open_pages[index] += 1
+
+            return _PooledPage(browser, page)
+
+    async def _checkin(self, pooled: _PooledPage) -> None:
+        pooled.uses += 1
+        if pooled.uses >= self.max_page_uses:
+            await self._discard(pooled)
+            return
+
+        try:
+            # Release the previous document's memory before the page idles
+            await pooled.page.goto("about:blank")
+        except Exception:
+            await self._discard(pooled)
+            return
+
+        self._idle.append(pooled)
+
+    async def _discard(self, pooled: _PooledPage) -> None:
+        self._forget(pooled)
+        try:
+            await pooled.page.close()
+        except Exception:
+            pass
+
+    def _forget(self, pooled: _PooledPage) -> None:
+        if pooled.browser in self._browsers:
+            index = self._browsers.index(pooled.browser)
+            self._open_pages[index] = max(self._open_pages[index] - 1, 0)
+
+    async def _healthy_browser(self, index: int):
+        browser = self._browsers[index]
+
+        if browser is not None and not await self._is_healthy(browser):
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            browser = None
+
+        if browser is None:
+            browser = await launch(
+                executablePath=Config.PUPPETEER_EXECUTABLE_PATH,
+                args=["--no-sandbox"],
+                handleSIGINT=False,
+                handleSIGTERM=False,
+                handleSIGHUP=False,
+            )
+            self._browsers[index] = browser
+            self._open_pages[index] = 0
+            self._idle = [p for p in self._idle if p.browser in self._browsers]
+
+        return browser
+
+    async def _is_healthy(self, browser) -> bool:
+        if not self._is_running(browser):
+            return False
+
+        try:
+            await asyncio.wait_for(browser.version(), self.health_timeout)
+        except Exception:
+            return False
+
+        return True
+
+    @staticmethod
+    def _is_running(browser) -> bool:
+        process = getattr(browser, "process", None)
+        return process is None or process.poll() is None
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,92 @@
+import hashlib
+from io import BytesIO
+
+from PIL import Image, features
+
+from app.config.config import Config
+
+# Formats emitted for every width, best compression first. Pillow wheels ship an
+# AVIF encoder since 11.2; AVIF is skipped when Pillow was built without one.
+VARIANT_FORMATS = [("avif", "AVIF"), ("webp", "WEBP")]
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Return the short content hash used to address screenshot files.
+
+    Args:
+        data (bytes): The file content.
+
+    Returns:
+        str: The first 16 hex digits of the SHA-256 digest.
+    """
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def build_variants(screenshot: bytes) -> list[dict]:
+    """
+    Build the compressed, resized thumbnail variants of a full-page screenshot.
+
+    The top `Config.SCREENSHOT_CROP_HEIGHT` pixels of the page are kept, which is what a gallery card shows, including its hover scroll. That region is resized to every width in `Config.SCREENSHOT_WIDTHS` and encoded as AVIF (when available) and WebP.
+
+    Args:
+        screenshot (bytes): The PNG screenshot.
+
+    Returns:
+        list[dict]: The encoded variants, `{"format": str, "width": int, "content": bytes}`, smallest width first.
+    """
+    with Image.open(BytesIO(screenshot)) as source:
+        image = source.convert("RGB")
+
+    crop_height = min(image.height, Config.SCREENSHOT_CROP_HEIGHT)
+    image = image.crop((0, 0, image.width, crop_height))
+
+    variants = []
+    for width in sorted(set(Config.SCREENSHOT_WIDTHS)):
+        width = min(width, image.width)
+        height = round(crop_height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+
+        for extension, image_format in VARIANT_FORMATS:
+            if not features.check(extension):
+                continue
+
+            buffer = BytesIO()
+            resized.save(buffer, image_format, quality=Config.SCREENSHOT_QUALITY)
+            variants.append(
+                {"format": extension, "width": width, "content": buffer.getvalue()}
+            )
+
+    return variants
+
+
+def store_screenshot(screenshot: bytes, storage) -> dict:
+    """
+    Build the variants of a screenshot and store them with the screenshot itself.
+
+    Args:
+        screenshot (bytes): The PNG screenshot.
+        storage (MediaStorage): The storage backend, see `app.storage.backends.get_storage`.
+
+    Returns:
+        dict: The manifest stored on the profile:
+            `{"hash": str, "storage": str, "original": str, "variants": [{"format": str, "width": int, "path": str}, ...]}`,
+            where 'original' and every 'path' are keys of `storage`.
+
+    Note:
+        Every file is stored under the hash of its own content, so a new capture never overwrites a file a browser may have cached, and an identical file is stored only once.
+    """
+    variants = build_variants(screenshot)
+    return {
+        "hash": content_hash(screenshot),
+        "storage": storage.name,
+        "original": storage.put(screenshot, "png"),
+        "variants": [
+            {
+                "format": variant["format"],
+                "width": variant["width"],
+                "path": storage.put(variant["content"], variant["format"]),
+            }
+            for variant in variants
+        ],
+    }
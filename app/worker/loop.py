@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+_loop = None
+_pid = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the persistent event loop of the current worker process.
+
+    Objects bound to a loop, such as the browsers in `BrowserPool`, can only be reused if every task runs on the same loop. The loop is created on first use and kept for the lifetime of the process; a forked child gets its own.
+
+    Returns:
+        asyncio.AbstractEventLoop: The loop owned by the current process.
+    """
+    global _loop, _pid
+
+    if _loop is None or _loop.is_closed() or _pid != os.getpid():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+        _pid = os.getpid()
+
+    return _loop
+
+
+def run(coroutine):
+    """
+    Run a coroutine to completion on the worker's persistent event loop.
+
+    Args:
+        coroutine: The coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    return get_worker_loop().run_until_complete(coroutine)
@@ -0,0 +1,68 @@
+"""
+Helpers shared by the benchmark scripts: synthetic profiles, latency summaries and memory readings.
+"""
+
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Registration time of the first synthetic profile; later ones follow a second apart
+EPOCH = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+
+
+def synthetic_profile(i: int, widths=(320, 640, 960)) -> dict:
+    """Return a profile document shaped like a real registration, with `_id` `i`."""
+    return {
+        "_id": i,
+        "full_name": f"Benchmark User {i}",
+        "email": f"user{i}@example.com",
+        "password": "x" * 16,
+        "github_username": f"benchmark-user-{i}",
+        "github_avatar": f"https://avatars.githubusercontent.com/u/{i}?v=4",
+        "tags": ["#python", "#flask", "#mongodb", f"#tag{i % 50}"],
+        "profile_views": i * 7 % 1000,
+        "profile_likes": i * 3 % 500,
+        "combined_score": ((i * 7 % 1000) * (i * 3 % 500)) ** 0.5,
+        "screenshot": {
+            "hash": f"{i:016x}",
+            "variants": [
+                {"format": "webp", "width": width, "path": f"p/{i}-{width}.webp"}
+                for width in widths
+            ],
+        },
+        "created_at": EPOCH + timedelta(seconds=i),
+        "updated_at": EPOCH + timedelta(seconds=i),
+    }
+
+
+def summarize(samples: list[float]) -> dict:
+    """Return the p50 and p99 of latency samples given in milliseconds."""
+    if not samples:
+        return {"p50_ms": None, "p99_ms": None}
+
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+    }
+
+
+def timed(function, repeat: int) -> dict:
+    """Run `function` `repeat` times and return the p50 and p99 wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return summarize(samples)
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
@@ -0,0 +1,99 @@
+"""
+Benchmark the profile listing path: bytes read from MongoDB and serialization CPU per row.
+
+The benchmark seeds a scratch table in the configured database (`DB_URL`, `DB_NAME`) with synthetic profiles, then compares:
+
+- wire bytes: full documents against documents projected to the `UserOut` fields,
+- serialization: one `UserOut(**row).model_dump()` per row against a single batched `TypeAdapter` call.
+
+Usage:
+    python -m benchmarks.listing --rows 5000 --page-size 24
+
+The scratch table is dropped afterwards. Results are printed as JSON.
+"""
+
+import argparse
+import json
+
+import bson
+
+from app.config.config import Config
+from app.db.client import registry
+from app.models.base import Base
+from app.schemas.user import USER_OUT_PROJECTION, UserOut, user_out_list
+
+from .common import synthetic_profile, timed
+
+TABLE_NAME = "benchmark_profiles"
+
+
+def seed(collection, rows: int) -> None:
+    """Fill the scratch table with profiles shaped like the real ones."""
+    collection.delete_many({})
+    collection.insert_many(
+        [
+            synthetic_profile(i, widths=Config.SCREENSHOT_WIDTHS)
+            for i in range(1, rows + 1)
+        ]
+    )
+
+
+def wire_bytes(model: Base, page_size: int, projection: dict) -> int:
+    """Return the BSON size of every page of the gallery, walked with keyset cursors."""
+    total, cursor = 0, None
+    while True:
+        documents, cursor = model.paginate(
+            limit=page_size, cursor=cursor, projection=projection
+        )
+        total += sum(len(bson.encode(document)) for document in documents)
+        if cursor is None:
+            return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=Config.PAGE_SIZE)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    collection = registry.get_client(Config.DB_URL)[Config.DB_NAME][TABLE_NAME]
+    seed(collection, args.rows)
+
+    try:
+        model = Base(TABLE_NAME)
+        # What the listing read before projections: every field of every row
+        full_bytes = sum(len(bson.encode(document)) for document in collection.find())
+        projected_bytes = wire_bytes(model, args.page_size, USER_OUT_PROJECTION)
+
+        page = model.get_all(limit=args.page_size, projection=USER_OUT_PROJECTION)
+
+        def per_row():
+            return [UserOut(**row).model_dump() for row in page]
+
+        def batched():
+            return user_out_list.dump_python(user_out_list.validate_python(page))
+
+        assert per_row() == batched()
+
+        results = {
+            "rows": args.rows,
+            "page_size": args.page_size,
+            "wire_bytes": {
+                "full": full_bytes,
+                "projected": projected_bytes,
+                "saved_pct": round(100 * (1 - projected_bytes / full_bytes), 1),
+            },
+            "serialize_page": {
+                "per_row": timed(per_row, args.repeat),
+                "type_adapter": timed(batched, args.repeat),
+            },
+        }
+    finally:
+        collection.drop()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Drive a signup burst against a stub GitHub API that enforces a rate limit, with and without the shared rate limiter.
+
+The stub answers `GET /users/{username}` like GitHub does for one token: every response carries `X-RateLimit-Limit`, `X-RateLimit-Remaining`, `X-RateLimit-Used`, `X-RateLimit-Reset` and `X-RateLimit-Resource`, and once the window's budget is spent it answers 403 with `X-RateLimit-Remaining: 0` until the window resets. Several worker processes then look up unique usernames concurrently:
+
+- unlimited: requests go straight through the client session, as they did before the limiter,
+- limited: requests go through `fetch_user_info`, paced by the `RateLimiter` the processes share.
+
+Usage:
+    python -m benchmarks.ratelimit --processes 4 --threads 8 --requests 400 --limit 100 --window 10
+    REDIS_SERVER=redis://localhost:6379/0 python -m benchmarks.ratelimit
+
+Note:
+    The limiter is only shared across processes through Redis. Without `REDIS_SERVER`, every process paces itself alone and the processes together still overrun the limit; run with `--processes 1` to see a single bucket at work.
+
+Results are printed as JSON: per mode, the lookups answered, deferred and rejected by the stub, and the elapsed time.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class RateLimitedGitHubStub(BaseHTTPRequestHandler):
+    """
+    A stand-in for `GET /users/{username}` enforcing GitHub's primary rate limit for a single token.
+
+    Attributes:
+        limit (int): Requests allowed per window.
+        window (float): Length of a window in seconds.
+        stats (dict): Requests `served` and `rejected` so far.
+    """
+
+    limit = 100
+    window = 10.0
+    stats = {"served": 0, "rejected": 0}
+    _used = 0
+    _reset = 0.0
+    _lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls._lock:
+            now = time.time()
+            if now >= cls._reset:
+                cls._used, cls._reset = 0, now + cls.window
+
+            allowed = cls._used < cls.limit
+            if allowed:
+                cls._used += 1
+            cls.stats["served" if allowed else "rejected"] += 1
+            remaining, reset = cls.limit - cls._used, int(cls._reset) + 1
+
+        username = self.path.rstrip("/").rsplit("/", 1)[-1]
+        if allowed:
+            status = 200
+            body = {
+                "login": username,
+                "name": username.replace("-", " ").title(),
+                "avatar_url": f"https://avatars.githubusercontent.com/{username}",
+            }
+        else:
+            status = 403
+            body = {
+                "message": "API rate limit exceeded for user ID 1.",
+                "documentation_url": "https://docs.github.com/rest/overview/rate-limits-for-the-rest-api",
+            }
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-RateLimit-Limit", str(cls.limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Used", str(cls.limit - remaining))
+        self.send_header("X-RateLimit-Reset", str(reset))
+        self.send_header("X-RateLimit-Resource", "core")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def lookups(job: tuple) -> dict:
+    """Look up a slice of usernames from one worker process and count the outcomes."""
+    mode, usernames, threads, wait = job
+
+    from app.api.V1.endpoints.utils import fetch_user_info
+    from app.exceptions.custom_exceptions import RateLimitedError
+    from app.github.client import github_client
+
+    counts = {"answered": 0, "deferred": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def lookup(username):
+        if mode == "unlimited":
+            response = github_client.session.get(
+                f"{github_client.base_url}/users/{username}"
+            )
+            outcome = "answered" if response.status_code == 200 else "failed"
+        else:
+            try:
+                response_code, _ = fetch_user_info(username, wait=wait)
+                outcome = "answered" if response_code is not None else "failed"
+            except RateLimitedError:
+                outcome = "deferred"
+
+        with lock:
+            counts[outcome] += 1
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lookup, usernames))
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--window", type=float, default=10.0)
+    parser.add_argument(
+        "--wait",
+        type=float,
+        default=2.0,
+        help="Seconds a lookup waits for the limiter before it is deferred.",
+    )
+    args = parser.parse_args()
+
+    RateLimitedGitHubStub.limit = args.limit
+    RateLimitedGitHubStub.window = args.window
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), RateLimitedGitHubStub)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    # Config reads the environment at import time, in the parent and the forked workers alike
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{stub.server_port}"
+    os.environ.setdefault(
+        "GITHUB_RATE_LIMIT", str(int(args.limit * 3600 / args.window))
+    )
+    os.environ.setdefault("GITHUB_RATE_BURST", str(max(1, args.limit // 10)))
+
+    results = {}
+    context = multiprocessing.get_context("fork")
+    for mode in ("unlimited", "limited"):
+        # Start every mode on a fresh window, with an empty lookup cache
+        time.sleep(max(0, RateLimitedGitHubStub._reset - time.time()))
+        RateLimitedGitHubStub.stats = {"served": 0, "rejected": 0}
+        jobs = [
+            (
+                mode,
+                [f"{mode}-{i}" for i in range(worker, args.requests, args.processes)],
+                args.threads,
+                args.wait,
+            )
+            for worker in range(args.processes)
+        ]
+
+        start = time.perf_counter()
+        with context.Pool(args.processes) as pool:
+            counts = pool.map(lookups, jobs)
+        elapsed = time.perf_counter() - start
+
+        results[mode] = {
+            **{key: sum(c[key] for c in counts) for key in counts[0]},
+            "rejected_by_github": RateLimitedGitHubStub.stats["rejected"],
+            "elapsed_s": round(elapsed, 2),
+        }
+
+    stub.shutdown()
+    print(
+        json.dumps(
+            {
+                "processes": args.processes,
+                "threads": args.threads,
+                "requests": args.requests,
+                "limit": args.limit,
+                "window_s": args.window,
+                "redis": bool(os.environ.get("REDIS_SERVER")),
+                **results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Compare request throughput of the WSGI (gunicorn) and ASGI (uvicorn) apps side by side.
+
+Both servers are started as subprocesses with the same number of workers against the configured database (`DB_URL`, `DB_NAME`, `PROFILE_TABLE_NAME`), then driven with the same number of concurrent clients. Every request carries a unique `n` query parameter, so it misses the page cache and reaches MongoDB.
+
+Usage:
+    python -m benchmarks.serving --workers 4 --concurrency 64 --requests 2000
+
+Results are printed as JSON: requests per second and p50/p99 latency per app.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+SERVERS = {
+    "wsgi": ["gunicorn", "-w", "{workers}", "-b", "127.0.0.1:{port}", "app.app:app"],
+    "asgi": [
+        "uvicorn",
+        "app.asgi:app",
+        "--workers",
+        "{workers}",
+        "--port",
+        "{port}",
+        "--log-level",
+        "warning",
+    ],
+}
+
+
+def start_server(name: str, workers: int, port: int) -> subprocess.Popen:
+    """Launch one app and wait until it answers."""
+    command = [part.format(workers=workers, port=port) for part in SERVERS[name]]
+    process = subprocess.Popen(
+        command, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=sys.stderr
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/profile/cards?limit=1", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError(f"{name} server did not start on port {port}")
+
+
+async def drive(base_url: str, path: str, total: int, concurrency: int) -> dict:
+    """Send `total` requests with `concurrency` in flight and summarize the latencies."""
+    latencies, errors = [], 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=30,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+
+        async def worker():
+            nonlocal errors
+            for n in counter:
+                start = time.perf_counter()
+                response = await client.get(path.format(n=n))
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(
+            latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2
+        ),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--path",
+        default="/profile/cards?limit=24&n={n}",
+        help="Request path; '{n}' is replaced by the request number.",
+    )
+    parser.add_argument("--port", type=int, default=5100)
+    args = parser.parse_args()
+
+    results = {}
+    for offset, name in enumerate(SERVERS):
+        port = args.port + offset
+        process = start_server(name, args.workers, port)
+        try:
+            results[name] = asyncio.run(
+                drive(
+                    f"http://127.0.0.1:{port}",
+                    args.path,
+                    args.requests,
+                    args.concurrency,
+                )
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(
+        json.dumps(
+            {"workers": args.workers, "concurrency": args.concurrency, **results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+Load-test and micro-benchmark suite for the web tier.
+
+For every dataset size, the suite seeds a profiles table with synthetic profiles, starts a stub GitHub API, and then:
+
+- drives every route of `app/api/V1/endpoints/user.py` through the Flask test client (in-process, no network),
+- drives the same routes through a real threaded WSGI server with concurrent HTTP clients,
+- times the hot internals in isolation: `DataBase.validate`, `Base.filter` and the `index.html` render.
+
+Every measurement reports p50/p99 latency, throughput and the peak RSS of the process. Results are written as JSON together with the git commit and environment, so two runs can be diffed with the `compare` command.
+
+Backends:
+    fake    An in-process mongomock database. Needs no services; best for sizes up to ~100k.
+            mongomock is not thread-safe, so the WSGI server is driven by a single client.
+    mongod  The MongoDB server at `DB_URL`. The suite works on its own table (`--table`), which is dropped afterwards.
+
+Usage:
+    python -m benchmarks.suite run --backend fake --sizes 1000,100000 --output before.json
+    python -m benchmarks.suite run --backend mongod --sizes 1000,100000,1000000 --output after.json
+    python -m benchmarks.suite compare before.json after.json
+
+Note:
+    Leave `REDIS_SERVER` unset to benchmark the in-process cache fallbacks, or point it at a local Redis to include it. Celery tasks are published to an in-memory broker, so no screenshots are taken.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .common import peak_rss_mb, summarize, synthetic_profile, timed
+
+# Rows inserted per round trip while seeding
+SEED_BATCH_SIZE = 10_000
+
+
+class GitHubStub(BaseHTTPRequestHandler):
+    """
+    A minimal stand-in for `GET /users/{username}` of the GitHub REST API.
+
+    Usernames starting with 'ghost' are unknown (404); every other user exists.
+    """
+
+    def do_GET(self):
+        username = self.path.rstrip("/").rsplit("/", 1)[-1]
+        if username.startswith("ghost"):
+            body, status = b"{}", 404
+        else:
+            body = json.dumps(
+                {
+                    "login": username,
+                    "name": username.replace("-", " ").title(),
+                    "avatar_url": f"https://avatars.githubusercontent.com/{username}",
+                }
+            ).encode()
+            status = 200
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_in_thread(server):
+    """Run a `serve_forever` server on a daemon thread and return it."""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def configure(args) -> None:
+    """
+    Point the application at the benchmark environment.
+
+    Must run before anything under `app` is imported, since `Config` reads the environment at import time.
+    """
+    github = serve_in_thread(ThreadingHTTPServer(("127.0.0.1", 0), GitHubStub))
+    os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{github.server_port}"
+    os.environ["PROFILE_TABLE_NAME"] = args.table
+    os.environ.setdefault("DB_NAME", "benchmark")
+    os.environ.setdefault("BRANCH", "main")
+    os.environ["CREATE_INDEXES_ON_STARTUP"] = "false"
+    # The stub enforces no rate limit, so keep the GitHub rate limiter from pacing registrations
+    os.environ.setdefault("GITHUB_RATE_LIMIT", "100000000")
+    os.environ.setdefault("GITHUB_RATE_BURST", "100000")
+
+    if args.backend == "fake":
+        os.environ["DB_URL"] = "mongodb://benchmark.invalid"
+    elif not os.environ.get("DB_URL"):
+        raise SystemExit("The mongod backend needs DB_URL")
+
+    if args.backend == "fake":
+        import mongomock
+
+        from app.db.client import registry
+
+        registry.register(os.environ["DB_URL"], mongomock.MongoClient())
+
+    from app.api.V1.endpoints.utils import app as celery_app
+
+    celery_app.conf.broker_url = "memory://"
+
+
+def seed(rows: int) -> None:
+    """Replace the profiles table with `rows` synthetic profiles, create its indexes and, with Redis, its leaderboards."""
+    from app.config.config import Config
+    from app.db.client import registry
+    from app.db.sequence import reset_allocators
+    from app.models.user import User
+
+    database = registry.get_client(Config.DB_URL)[Config.DB_NAME]
+    collection = database[Config.TABLE_NAME]
+    collection.drop()
+
+    # Restart the ID sequence, it is re-seeded from the new rows on first use
+    database[Config.COUNTERS_TABLE_NAME].delete_many(
+        {"_id": f"{Config.TABLE_NAME}._id"}
+    )
+    reset_allocators()
+
+    for start in range(1, rows + 1, SEED_BATCH_SIZE):
+        stop = min(start + SEED_BATCH_SIZE, rows + 1)
+        collection.insert_many(
+            [
+                synthetic_profile(i, widths=Config.SCREENSHOT_WIDTHS)
+                for i in range(start, stop)
+            ]
+        )
+
+    User().ensure_indexes()
+    if Config.REDIS_SERVER:
+        User().rebuild_leaderboards()
+
+
+def scenarios(rows: int, run_id: str) -> dict:
+    """
+    Return the request factories, one per route variant.
+
+    Each factory maps a request number to `(method, path, json_body)`. Paths of the "cold" variants carry a parameter unique to the run and request, so they always miss the page cache; registrations use usernames unique to the run.
+    """
+
+    def existing(n):
+        return f"benchmark-user-{n * 7919 % rows + 1}"
+
+    return {
+        "gallery_warm": lambda n: ("GET", "/", None),
+        "gallery_cold": lambda n: ("GET", f"/?n={run_id}-{n}", None),
+        "cards_cold": lambda n: (
+            "GET",
+            f"/profile/cards?type=trending&n={run_id}-{n}",
+            None,
+        ),
+        "filter_listing_cold": lambda n: (
+            "GET",
+            f"/profile/filter?type=hot&n={run_id}-{n}",
+            None,
+        ),
+        "filter_criteria": lambda n: (
+            "POST",
+            "/profile/filter",
+            {"github_username": existing(n)},
+        ),
+        "search": lambda n: ("GET", f"/profile/search?q=user+{n % rows + 1}", None),
+        "counter": lambda n: ("POST", f"/profile/{existing(n)}/view", None),
+        "status_hot": lambda n: ("GET", f"/profile/{existing(n % 10)}/status", None),
+        "update": lambda n: (
+            "PATCH",
+            "/profile/update",
+            {"github_username": existing(n), "user_data": {"tags": [f"#bench{n}"]}},
+        ),
+        "register": lambda n: (
+            "POST",
+            "/profile",
+            {"github_username": f"new-{run_id}-{n}", "email": "new@example.com"},
+        ),
+        "register_bulk": lambda n: (
+            "POST",
+            "/profile/bulk",
+            {
+                "profiles": [
+                    {"github_username": f"bulk-{run_id}-{n}-{i}"} for i in range(20)
+                ]
+            },
+        ),
+        "export": lambda n: ("GET", "/profile/export?format=ndjson&gzip=1", None),
+    }
+
+
+def request_count(name: str, requests: int, rows: int) -> int:
+    """Full exports read the whole table, so they get far fewer repetitions."""
+    if name == "export":
+        return max(1, min(requests // 50, 1_000_000 // max(rows, 1)))
+    return requests
+
+
+def run_client(app, factory, total: int) -> dict:
+    """Drive one scenario through the Flask test client, one request at a time."""
+    client = app.test_client()
+    latencies, errors = [], 0
+
+    start = time.perf_counter()
+    for n in range(total):
+        method, path, body = factory(n)
+        sent = time.perf_counter()
+        response = client.open(path, method=method, json=body)
+        response.get_data()
+        latencies.append((time.perf_counter() - sent) * 1000)
+        errors += response.status_code >= 400
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "latencies": latencies,
+    }
+
+
+def run_server(base_url: str, factory, total: int, concurrency: int) -> dict:
+    """Drive one scenario through the WSGI server with `concurrency` clients."""
+    import requests
+
+    local = threading.local()
+    lock = threading.Lock()
+    latencies, errors = [], 0
+
+    def send(n):
+        nonlocal errors
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+
+        method, path, body = factory(n)
+        sent = time.perf_counter()
+        response = session.request(method, base_url + path, json=body)
+        elapsed = (time.perf_counter() - sent) * 1000
+        with lock:
+            latencies.append(elapsed)
+            errors += response.status_code >= 400
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(total)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "latencies": latencies,
+    }
+
+
+def micro(rows: int, repeat: int) -> list[dict]:
+    """Time the hot internals of the listing path in isolation."""
+    from flask import render_template
+
+    from app.api.V1.endpoints.user import _serialize_profiles
+    from app.app import app
+    from app.config.config import Config
+    from app.db.base import DataBase
+    from app.models.user import User
+    from app.schemas.user import USER_OUT_PROJECTION
+
+    database = DataBase(db_url=Config.DB_URL)
+    model = User()
+    page = _serialize_profiles(
+        model.filter("hot", limit=Config.PAGE_SIZE, projection=USER_OUT_PROJECTION)
+    )
+
+    def render():
+        with app.test_request_context("/"):
+            render_template("index.html", data=page, branch=Config.BRANCH)
+
+    cases = {
+        "DataBase.validate": lambda: database.validate(
+            "db", "table", filter_opt=True, filter={"github_username": "x"}, bulk=True
+        ),
+        "Base.filter[hot]": lambda: model.filter(
+            "hot", limit=Config.PAGE_SIZE, projection=USER_OUT_PROJECTION
+        ),
+        "Base.filter[criteria]": lambda: model.filter(
+            {"github_username": f"benchmark-user-{rows // 2 + 1}"}
+        ),
+        "render[index.html]": render,
+    }
+
+    return [
+        {
+            "size": rows,
+            "name": name,
+            **timed(function, repeat),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+        for name, function in cases.items()
+    ]
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    configure(args)
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    from app.app import app
+    from app.config.config import Config
+    from app.db.client import registry
+
+    server = serve_in_thread(
+        make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    )
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    selected = set(args.scenarios.split(",")) if args.scenarios else None
+    concurrency = 1 if args.backend == "fake" else args.concurrency
+
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "backend": args.backend,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": concurrency,
+            "redis": bool(Config.REDIS_SERVER),
+        },
+        "routes": [],
+        "micro": [],
+    }
+
+    try:
+        for rows in args.sizes:
+            start = time.perf_counter()
+            seed(rows)
+            print(
+                f"seeded {rows} profiles in {time.perf_counter() - start:.1f}s",
+                file=sys.stderr,
+            )
+
+            for name in scenarios(rows, "").keys():
+                if selected and name not in selected:
+                    continue
+
+                total = request_count(name, args.requests, rows)
+                for mode in ("client", "wsgi"):
+                    factory = scenarios(rows, uuid.uuid4().hex[:8])[name]
+                    if mode == "client":
+                        outcome = run_client(app, factory, total)
+                    else:
+                        outcome = run_server(base_url, factory, total, concurrency)
+
+                    latencies = outcome.pop("latencies")
+                    elapsed = outcome.pop("elapsed_s")
+                    report["routes"].append(
+                        {
+                            "size": rows,
+                            "scenario": name,
+                            "mode": mode,
+                            **outcome,
+                            "throughput_rps": round(outcome["requests"] / elapsed, 1),
+                            **summarize(latencies),
+                            "peak_rss_mb": peak_rss_mb(),
+                        }
+                    )
+                    print(f"{rows} {name} {mode}: done", file=sys.stderr)
+
+            report["micro"].extend(micro(rows, args.repeat))
+    finally:
+        server.shutdown()
+        if args.backend == "mongod":
+            registry.get_client(Config.DB_URL)[Config.DB_NAME][Config.TABLE_NAME].drop()
+
+    return report
+
+
+def compare(before: dict, after: dict) -> list[dict]:
+    """Pair up the measurements of two reports and compute the change of each metric."""
+
+    def index(report):
+        entries = {}
+        for entry in report["routes"]:
+            entries[("route", entry["size"], entry["scenario"], entry["mode"])] = entry
+        for entry in report["micro"]:
+            entries[("micro", entry["size"], entry["name"], None)] = entry
+        return entries
+
+    old, new = index(before), index(after)
+    rows = []
+    for key in sorted(old.keys() & new.keys(), key=str):
+        row = {"kind": key[0], "size": key[1], "name": key[2], "mode": key[3]}
+        for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+            if old[key].get(metric) and new[key].get(metric) is not None:
+                change = 100 * (new[key][metric] / old[key][metric] - 1)
+                row[metric] = {
+                    "before": old[key][metric],
+                    "after": new[key][metric],
+                    "change_pct": round(change, 1),
+                }
+        rows.append(row)
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser(
+        "run", help="Run the suite and write a JSON report."
+    )
+    run_parser.add_argument("--backend", choices=["fake", "mongod"], default="fake")
+    run_parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1000],
+        help="Comma-separated dataset sizes, e.g. 1000,100000,1000000.",
+    )
+    run_parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per scenario and mode."
+    )
+    run_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Concurrent clients against the WSGI server.",
+    )
+    run_parser.add_argument(
+        "--repeat", type=int, default=200, help="Repetitions per micro-benchmark."
+    )
+    run_parser.add_argument(
+        "--scenarios", help="Comma-separated subset of scenarios to run."
+    )
+    run_parser.add_argument("--table", default="benchmark_profiles")
+    run_parser.add_argument("--output", type=argparse.FileType("w"), default="-")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports.")
+    compare_parser.add_argument("before", type=argparse.FileType("r"))
+    compare_parser.add_argument("after", type=argparse.FileType("r"))
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        json.dump(run(args), args.output, indent=2)
+    else:
+        json.dump(
+            compare(json.load(args.before), json.load(args.after)), sys.stdout, indent=2
+        )
+
+
+if __name__ == "__main__":
+    main()
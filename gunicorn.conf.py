@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for the WSGI app.
+
+Gunicorn reads this file from the working directory on start. The hooks create the MongoDB indexes the app relies on before any worker serves, and keep the Prometheus metrics on `/metrics` consistent across worker processes when `PROMETHEUS_MULTIPROC_DIR` is set.
+"""
+
+from app.metrics.registry import mark_process_dead, reset_multiprocess_dir
+from app.models.user import User as UserModel
+
+
+def on_starting(server):
+    # Runs in the master before any worker is forked
+    reset_multiprocess_dir()
+
+    # Registrations rely on the unique github_username index to reject duplicates;
+    # an error here stops gunicorn instead of serving without it
+    UserModel().ensure_startup_indexes()
+
+
+def child_exit(server, worker):
+    mark_process_dead(worker.pid)
@@ -0,0 +1,146 @@
+import os
+
+# Config reads the environment once, when the app is first imported
+os.environ.update(
+    DB_URL="mongodb://awesomebiovault.test",
+    DB_NAME="AwesomeBioVault",
+    PROFILE_TABLE_NAME="github_profile",
+    REPO_OWNER="mramitdas",
+    REPO_NAME="AwesomeBioVault",
+    BRANCH="dev",
+)
+os.environ.pop("REDIS_SERVER", None)
+
+import fakeredis
+import mongomock
+import pytest
+
+import app.api.V1.endpoints.aio_user
+import app.api.V1.endpoints.user
+import app.api.V1.endpoints.utils as tasks
+import app.cache.redis
+import app.github.ratelimit
+from app.cache.lru import TTLCache
+from app.config.config import Config
+from app.db.aio import AsyncDataBase
+from app.db.base import DataBase
+from app.db.client import registry
+from app.db.sequence import reset_allocators
+from app.github.aio import async_github_client
+from app.github.client import github_client
+from app.github.ratelimit import RateLimiter
+from app.models.base import legacy_timestamps
+
+from .stubs import GitHubStub
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """A fresh in-memory MongoDB database for every test."""
+    client = mongomock.MongoClient()
+    registry.register(Config.DB_URL, client)
+    reset_allocators()
+    legacy_timestamps.clear()
+
+    yield client[Config.DB_NAME]
+
+    reset_allocators()
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    """Run every test without Redis unless it asks for `redis_client`."""
+    monkeypatch.setattr(app.cache.redis, "_client", None)
+    monkeypatch.setattr(app.github.ratelimit, "_limiters", {})
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    """An in-memory Redis server, returned by `get_redis`."""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(app.cache.redis, "_client", client)
+
+    yield client
+
+    client.flushall()
+
+
+@pytest.fixture
+def github():
+    """A local stand-in for the GitHub REST API."""
+    stub = GitHubStub()
+    stub.start()
+
+    yield stub
+
+    stub.stop()
+
+
+@pytest.fixture
+def github_api(github, monkeypatch):
+    """Point the shared GitHub clients at the stub, with an empty cache and a fresh rate limiter."""
+    limiter = RateLimiter("")
+    for client in (github_client, async_github_client):
+        monkeypatch.setattr(client, "base_url", github.url)
+        monkeypatch.setattr(client, "limiter", limiter)
+        monkeypatch.setattr(
+            client,
+            "_local",
+            TTLCache(maxsize=100, ttl=Config.GITHUB_CACHE_STALE_TTL),
+        )
+
+    return github
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Record the Celery tasks queued instead of sending them to a broker."""
+    queued = []
+
+    def enrichment(username, countdown=None):
+        queued.append(("enrich_profile", username, countdown))
+
+    for module in (tasks, app.api.V1.endpoints.user, app.api.V1.endpoints.aio_user):
+        monkeypatch.setattr(module, "queue_profile_enrichment", enrichment)
+    for task in (tasks.async_capture_screenshot, tasks.async_capture_screenshots):
+        monkeypatch.setattr(
+            task, "delay", lambda *args, name=task.name: queued.append((name, args))
+        )
+
+    return queued
+
+
+@pytest.fixture
+def motor(monkeypatch):
+    """Run `AsyncDataBase` on the in-memory database, whose round trips simply block."""
+    monkeypatch.setattr(AsyncDataBase, "connect", DataBase.connect)
+
+    for name in ("upload", "update"):
+
+        async def call(self, *args, method=getattr(DataBase, name), **kwargs):
+            return method(self, *args, **kwargs)
+
+        monkeypatch.setattr(AsyncDataBase, name, call)
+
+    async def query(self, *args, **kwargs):
+        # Like Motor, bulk queries are read into a list
+        result = DataBase.query(self, *args, **kwargs)
+        return result if result is None or isinstance(result, dict) else list(result)
+
+    monkeypatch.setattr(AsyncDataBase, "query", query)
+
+
+@pytest.fixture
+def web():
+    """A test client of the WSGI app."""
+    from app.app import app
+
+    return app.test_client()
+
+
+@pytest.fixture
+def asgi(motor):
+    """A test client of the ASGI app, on the in-memory database."""
+    from app.asgi import app
+
+    return app.test_client()
@@ -0,0 +1,234 @@
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class GitHubStub:
+    """
+    A local stand-in for the GitHub REST API, served over HTTP on a free port.
+
+    Attributes:
+        url (str): The base URL to point a client at.
+        users (dict): The GitHub users keyed by login. Changing one changes its ETag.
+        requests (list[dict]): Every request received, as `{"method", "path", "headers"}`.
+        remaining (int | None): The requests left in the rate limit window, sent as `X-RateLimit-Remaining`. Once 0, requests are answered with 403. None sends no rate limit headers.
+        reset (float): The epoch time the rate limit window resets, sent as `X-RateLimit-Reset`.
+        blobs (dict): The Git blobs of the repository, as bytes keyed by SHA.
+        trees (dict): The Git trees, as blob SHAs keyed by path, keyed by SHA.
+        commits (dict): The Git commits, as `{"message", "tree", "parents"}` keyed by SHA.
+        refs (dict): The commit SHA of every branch, keyed by e.g. 'heads/dev'.
+
+    Methods:
+        - start() -> None: Starts serving in a background thread.
+        - stop() -> None: Stops serving.
+        - calls(method: str, path: str) -> list[dict]: Returns the requests received for a path.
+        - files(branch: str) -> dict: Returns the files on the head of a branch, as bytes keyed by path.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.requests = []
+        self.remaining = None
+        self.reset = time.time() + 3600
+        self.blobs = {}
+        self.trees = {self._sha("tree"): {}}
+        self.commits = {
+            self._sha("root"): {
+                "message": "Initial commit",
+                "tree": next(iter(self.trees)),
+                "parents": [],
+            }
+        }
+        self.refs = {}
+
+        repo = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+        self._routes = [
+            ("GET", r"/users/(?P<login>[^/]+)", self._get_user),
+            ("GET", repo, self._get_repo),
+            ("POST", repo + r"/git/blobs", self._create_blob),
+            ("GET", repo + r"/git/refs/(?P<ref>.+)", self._get_ref),
+            ("PATCH", repo + r"/git/refs/(?P<ref>.+)", self._update_ref),
+            ("GET", repo + r"/git/commits/(?P<sha>\w+)", self._get_commit),
+            ("POST", repo + r"/git/commits", self._create_commit),
+            ("POST", repo + r"/git/trees", self._create_tree),
+        ]
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> None:
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def calls(self, method: str, path: str) -> list[dict]:
+        return [
+            request
+            for request in self.requests
+            if request["method"] == method and request["path"] == path
+        ]
+
+    def files(self, branch: str) -> dict:
+        commit = self.commits[self.refs.get(f"heads/{branch}", self._sha("root"))]
+        return {
+            path: self.blobs[sha] for path, sha in self.trees[commit["tree"]].items()
+        }
+
+    @staticmethod
+    def _sha(value) -> str:
+        return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def etag(data: dict) -> str:
+        digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        return f'"{digest}"'
+
+    def _get_user(self, request, login):
+        if login not in self.users:
+            return 404, {"message": "Not Found"}, {}
+
+        data = self.users[login]
+        etag = self.etag(data)
+        if request["headers"].get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, data, {"ETag": etag}
+
+    def _repo_url(self, owner: str, repo: str) -> str:
+        return f"{self.url}/repos/{owner}/{repo}"
+
+    def _get_repo(self, request, owner, repo):
+        url = self._repo_url(owner, repo)
+        return 200, {"name": repo, "full_name": f"{owner}/{repo}", "url": url}, {}
+
+    def _create_blob(self, request, owner, repo):
+        content = base64.b64decode(request["json"]["content"])
+        sha = self._sha(content.decode("latin-1"))
+        self.blobs[sha] = content
+        return (
+            201,
+            {"sha": sha, "url": f"{self._repo_url(owner, repo)}/git/blobs/{sha}"},
+            {},
+        )
+
+    def _ref(self, owner, repo, ref):
+        sha = self.refs.setdefault(ref, self._sha("root"))
+        url = self._repo_url(owner, repo)
+        return {
+            "ref": f"refs/{ref}",
+            "url": f"{url}/git/refs/{ref}",
+            "object": {"sha": sha, "type": "commit", "url": f"{url}/git/commits/{sha}"},
+        }
+
+    def _get_ref(self, request, owner, repo, ref):
+        return 200, self._ref(owner, repo, ref), {}
+
+    def _update_ref(self, request, owner, repo, ref):
+        self.refs[ref] = request["json"]["sha"]
+        return 200, self._ref(owner, repo, ref), {}
+
+    def _commit(self, owner, repo, sha):
+        url = self._repo_url(owner, repo)
+        commit = self.commits[sha]
+        return {
+            "sha": sha,
+            "url": f"{url}/git/commits/{sha}",
+            "message": commit["message"],
+            "tree": {"sha": commit["tree"], "url": f"{url}/git/trees/{commit['tree']}"},
+            "parents": [
+                {"sha": parent, "url": f"{url}/git/commits/{parent}"}
+                for parent in commit["parents"]
+            ],
+        }
+
+    def _get_commit(self, request, owner, repo, sha):
+        if sha not in self.commits:
+            return 404, {"message": "Not Found"}, {}
+        return 200, self._commit(owner, repo, sha), {}
+
+    def _create_commit(self, request, owner, repo):
+        commit = {
+            "message": request["json"]["message"],
+            "tree": request["json"]["tree"],
+            "parents": request["json"]["parents"],
+        }
+        sha = self._sha(commit)
+        self.commits[sha] = commit
+        return 201, self._commit(owner, repo, sha), {}
+
+    def _create_tree(self, request, owner, repo):
+        tree = dict(self.trees.get(request["json"].get("base_tree"), {}))
+        for element in request["json"]["tree"]:
+            tree[element["path"]] = element["sha"]
+
+        sha = self._sha(tree)
+        self.trees[sha] = tree
+        url = self._repo_url(owner, repo)
+        return 201, {"sha": sha, "url": f"{url}/git/trees/{sha}", "tree": []}, {}
+
+    def _dispatch(self, method: str, path: str, headers: dict, body: bytes) -> tuple:
+        request = {"method": method, "path": path, "headers": headers}
+        if body:
+            request["json"] = json.loads(body)
+
+        with self._lock:
+            self.requests.append(request)
+
+            rate_headers = {}
+            if self.remaining is not None:
+                rate_headers = {
+                    "X-RateLimit-Limit": "5000",
+                    "X-RateLimit-Remaining": str(max(self.remaining - 1, 0)),
+                    "X-RateLimit-Reset": str(int(self.reset)),
+                }
+                if self.remaining <= 0:
+                    return (
+                        403,
+                        {"message": "API rate limit exceeded"},
+                        rate_headers,
+                    )
+                self.remaining -= 1
+
+            for route_method, pattern, handle in self._routes:
+                match = re.fullmatch(f"(?:/api/v3)?{pattern}", path)
+                if route_method == method and match:
+                    status, data, extra = handle(request, **match.groupdict())
+                    return status, data, {**rate_headers, **extra}
+
+        return 404, {"message": "Not Found"}, rate_headers
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, data, headers = stub._dispatch(
+                    self.command, self.path.split("?")[0], dict(self.headers), body
+                )
+
+                payload = b"" if data is None else json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = _respond
+
+        return Handler
@@ -0,0 +1,136 @@
+import asyncio
+import gzip
+import json
+
+from prometheus_client import REGISTRY
+
+from app.api.V1.endpoints.utils import async_capture_screenshot
+from app.config.config import Config
+from app.models.user import PROFILE_ACTIVE, PROFILE_PENDING
+from app.models.user import User
+
+
+def test_registration_is_accepted_as_pending_with_async_registration(
+    asgi, queued, monkeypatch
+):
+    monkeypatch.setattr(Config, "ASYNC_REGISTRATION", True)
+
+    async def register():
+        response = await asgi.post("/profile", json={"github_username": "mramitdas"})
+        status = await asgi.get(response.headers["Location"])
+        return response, await status.get_json()
+
+    response, status = asyncio.run(register())
+
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/profile/mramitdas/status"
+    assert status == {
+        "github_username": "mramitdas",
+        "status": PROFILE_PENDING,
+        "screenshot_ready": False,
+    }
+    assert queued == [("enrich_profile", "mramitdas", None)]
+
+
+def test_registration_is_accepted_as_pending_when_deferred(asgi, github_api, queued):
+    github_api.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+    github_api.remaining = 0
+
+    response = asyncio.run(asgi.post("/profile", json={"github_username": "mramitdas"}))
+
+    assert response.status_code == 202
+    assert User().get("mramitdas")["profile_status"] == PROFILE_PENDING
+    assert queued == [("enrich_profile", "mramitdas", None)]
+
+
+def test_registration_is_active_once_github_confirms_it(asgi, github_api, queued):
+    github_api.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+
+    async def register():
+        await asgi.post("/profile", json={"github_username": "mramitdas"})
+        status = await asgi.get("/profile/mramitdas/status")
+        return await status.get_json()
+
+    assert asyncio.run(register())["status"] == PROFILE_ACTIVE
+    assert queued == [(async_capture_screenshot.name, ("mramitdas",))]
+
+
+def test_status_of_an_unknown_profile_is_not_found(asgi):
+    response = asyncio.run(asgi.get("/profile/nobody/status"))
+
+    assert response.status_code == 404
+
+
+def test_bulk_registration(asgi, github_api, queued):
+    github_api.users = {name: {"login": name} for name in ("alice", "bob")}
+
+    async def register():
+        response = await asgi.post(
+            "/profile/bulk",
+            json={
+                "profiles": [
+                    {"github_username": "alice"},
+                    {"github_username": "bob"},
+                    {"github_username": "carol"},
+                ]
+            },
+        )
+        return await response.get_json()
+
+    result = asyncio.run(register())
+
+    assert sorted(result["created"]) == ["alice", "bob"]
+    assert result["not_found"] == ["carol"]
+
+
+def test_bulk_registration_rejects_an_empty_list(asgi):
+    response = asyncio.run(asgi.post("/profile/bulk", json={"profiles": []}))
+
+    assert response.status_code == 400
+
+
+def test_export_streams_every_profile(asgi, database):
+    database[Config.TABLE_NAME].insert_many(
+        [{"_id": i, "github_username": f"user{i}", "email": "x"} for i in range(3)]
+    )
+
+    async def export():
+        response = await asgi.get("/profile/export?gzip=1")
+        return response, await response.get_data()
+
+    response, body = asyncio.run(export())
+
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=profiles.ndjson.gz"
+    )
+    rows = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+    assert [row["github_username"] for row in rows] == ["user0", "user1", "user2"]
+    assert "email" not in rows[0]
+
+
+def test_export_rejects_an_unknown_format(asgi):
+    response = asyncio.run(asgi.get("/profile/export?format=xml"))
+
+    assert response.status_code == 400
+
+
+def test_metrics_cover_requests_and_github_lookups(asgi, github_api, queued):
+    github_api.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+
+    def sample(name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    lookups = ("github_user_lookup_duration_seconds_count", {"outcome": "found"})
+    before = sample(*lookups)
+
+    async def register():
+        await asgi.post("/profile", json={"github_username": "mramitdas"})
+        response = await asgi.get("/metrics")
+        return response, (await response.get_data()).decode()
+
+    response, exposition = asyncio.run(register())
+
+    assert response.status_code == 200
+    assert sample(*lookups) == before + 1
+    assert 'endpoint="user.save_user_profile"' in exposition
+    assert "github_user_lookup_duration_seconds_count" in exposition
@@ -0,0 +1,120 @@
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from app.config.config import Config
+from app.db.base import DataBase
+from app.models.counters import CounterBuffer
+from app.models.user import User
+
+
+@pytest.fixture
+def profiles(database):
+    table = database[Config.TABLE_NAME]
+    table.insert_many(
+        [
+            {"_id": i, "github_username": f"user{i}", "profile_views": 0}
+            for i in range(1, 5)
+        ]
+    )
+    return table
+
+
+def views(profiles):
+    return {
+        profile["github_username"]: profile["profile_views"]
+        for profile in profiles.find()
+    }
+
+
+def failing_batch(monkeypatch, batch: int, error):
+    """
+    Make the `batch`-th bulk write raise `error(operations, write)`, where `write` sends operations for real.
+
+    Returns:
+        list: The operations of every bulk write sent.
+    """
+    bulk_write = DataBase.bulk_write
+    sent = []
+
+    def fail(self, db_name=None, table_name=None, operations=None, ordered=False):
+        sent.append(operations)
+        if len(sent) != batch:
+            return bulk_write(self, db_name, table_name, operations, ordered)
+        raise error(
+            operations, lambda applied: bulk_write(self, db_name, table_name, applied)
+        )
+
+    monkeypatch.setattr(DataBase, "bulk_write", fail)
+    monkeypatch.setattr(Config, "COUNTER_FLUSH_BATCH_SIZE", 2)
+    return sent
+
+
+def test_increment_reports_every_applied_username(profiles):
+    applied = User().increment(
+        {"user1": {"profile_views": 2}, "user2": {"profile_views": 1}, "user3": {}}
+    )
+
+    assert applied == ["user1", "user2"]
+    assert views(profiles) == {"user1": 2, "user2": 1, "user3": 0, "user4": 0}
+
+
+def test_increment_leaves_out_rejected_operations(profiles, monkeypatch):
+    def reject_first(operations, write):
+        # The batch is unordered: user3 is rejected, user4 still written
+        write(operations[1:])
+        return BulkWriteError(
+            {"writeErrors": [{"index": 0, "code": 121, "errmsg": "invalid"}]}
+        )
+
+    failing_batch(monkeypatch, 2, reject_first)
+    counters = {f"user{i}": {"profile_views": 1} for i in range(1, 5)}
+
+    assert User().increment(counters) == ["user1", "user2", "user4"]
+    assert views(profiles) == {"user1": 1, "user2": 1, "user3": 0, "user4": 1}
+
+
+def test_increment_stops_after_a_failed_round_trip(profiles, monkeypatch):
+    sent = failing_batch(
+        monkeypatch, 1, lambda operations, write: AutoReconnect("connection lost")
+    )
+    counters = {f"user{i}": {"profile_views": 1} for i in range(1, 5)}
+
+    assert User().increment(counters) == []
+    assert len(sent) == 1
+    assert views(profiles) == {"user1": 0, "user2": 0, "user3": 0, "user4": 0}
+
+
+def test_flush_requeues_only_unapplied_increments():
+    flushed = []
+
+    def flush(counters):
+        flushed.append(counters)
+        return [username for username in counters if username != "user2"]
+
+    buffer = CounterBuffer(flush=flush, interval=60, max_pending=100)
+    buffer.add("user1", "profile_views", 3)
+    buffer.add("user2", "profile_views", 2)
+    buffer.add("user2", "profile_likes")
+
+    buffer.flush()
+    buffer.add("user2", "profile_views")
+    buffer.flush()
+
+    assert flushed[1] == {"user2": {"profile_views": 3, "profile_likes": 1}}
+
+
+def test_flush_requeues_everything_when_the_write_raises():
+    calls = []
+
+    def flush(counters):
+        calls.append(counters)
+        if len(calls) == 1:
+            raise RuntimeError("database unavailable")
+        return list(counters)
+
+    buffer = CounterBuffer(flush=flush, interval=60, max_pending=100)
+    buffer.add("user1", "profile_views")
+    buffer.flush()
+    buffer.flush()
+
+    assert calls == [{"user1": {"profile_views": 1}}] * 2
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.config.config import Config
+from app.db.aio import AsyncDataBase
+from app.db.base import DataBase
+from app.exceptions.custom_exceptions import DuplicateRecordError
+
+
+class AsyncCollection:
+    """Exposes the methods of a pymongo collection as coroutines, the way Motor does."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getattr__(self, name):
+        method = getattr(self.collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
+@pytest.fixture(params=["sync", "async"])
+def upload(request, database, monkeypatch):
+    """The `upload` of either database variant, as a plain function."""
+    if request.param == "sync":
+        return DataBase(db_url=Config.DB_URL).upload
+
+    monkeypatch.setattr(
+        AsyncDataBase,
+        "connect",
+        lambda self: {
+            Config.DB_NAME: {
+                Config.TABLE_NAME: AsyncCollection(database[Config.TABLE_NAME])
+            }
+        },
+    )
+    db = AsyncDataBase(db_url=Config.DB_URL)
+    return lambda **kwargs: asyncio.run(db.upload(**kwargs))
+
+
+def test_bulk_upload_inserts_around_duplicates(upload, database):
+    table = database[Config.TABLE_NAME]
+    table.create_index("github_username", unique=True)
+    table.insert_one({"_id": 0, "github_username": "bob"})
+
+    with pytest.raises(DuplicateRecordError) as error:
+        upload(
+            db_name=Config.DB_NAME,
+            table_name=Config.TABLE_NAME,
+            data=[
+                {"github_username": "bob"},
+                {"github_username": "alice"},
+                {"github_username": "alice"},
+            ],
+        )
+
+    assert error.value.duplicates == [0, 2]
+    assert sorted(table.distinct("github_username")) == ["alice", "bob"]
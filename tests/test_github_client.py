@@ -0,0 +1,135 @@
+import json
+
+import pytest
+
+import app.github.client
+from app.config.config import Config
+from app.github.client import GitHubClient
+
+
+class Clock:
+    """Stands in for the `time` module of the client, so cache entries age on demand."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(app.github.client, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def client(github):
+    return GitHubClient(base_url=github.url, token="")
+
+
+def lookups(github, username):
+    return github.calls("GET", f"/users/{username}")
+
+
+def test_fresh_entries_are_served_from_the_cache(client, github, clock):
+    github.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+
+    assert client.get_user("mramitdas") == (200, github.users["mramitdas"])
+    clock.advance(Config.GITHUB_CACHE_TTL - 1)
+    assert client.get_user("MrAmitDas") == (200, github.users["mramitdas"])
+
+    assert len(lookups(github, "mramitdas")) == 1
+
+
+def test_expired_entries_are_revalidated_with_their_etag(client, github, clock):
+    github.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+    client.get_user("mramitdas")
+    etag = github.etag(github.users["mramitdas"])
+
+    clock.advance(Config.GITHUB_CACHE_TTL)
+    assert client.get_user("mramitdas") == (200, {"login": "mramitdas", "name": "Amit"})
+
+    revalidation = lookups(github, "mramitdas")[-1]
+    assert revalidation["headers"]["If-None-Match"] == etag
+
+    # The 304 renewed the entry
+    clock.advance(Config.GITHUB_CACHE_TTL - 1)
+    client.get_user("mramitdas")
+    assert len(lookups(github, "mramitdas")) == 2
+
+
+def test_changed_users_replace_the_cached_entry(client, github, clock):
+    github.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+    client.get_user("mramitdas")
+
+    github.users["mramitdas"] = {"login": "mramitdas", "name": "Amit Das"}
+    clock.advance(Config.GITHUB_CACHE_TTL)
+
+    assert client.get_user("mramitdas") == (200, github.users["mramitdas"])
+    clock.advance(Config.GITHUB_CACHE_TTL)
+    client.get_user("mramitdas")
+    assert lookups(github, "mramitdas")[-1]["headers"]["If-None-Match"] == (
+        github.etag(github.users["mramitdas"])
+    )
+
+
+def test_unknown_users_are_cached_for_the_negative_ttl(client, github, clock):
+    assert client.get_user("ghost") == (None, {})
+    assert client.is_unknown("ghost")
+
+    clock.advance(Config.GITHUB_NEGATIVE_CACHE_TTL - 1)
+    assert client.get_user("ghost") == (None, {})
+    assert len(lookups(github, "ghost")) == 1
+
+    github.users["ghost"] = {"login": "ghost"}
+    clock.advance(1)
+    assert client.get_user("ghost") == (200, {"login": "ghost"})
+    assert not client.is_unknown("ghost")
+    assert "If-None-Match" not in lookups(github, "ghost")[-1]["headers"]
+
+
+def test_stale_entries_are_served_while_github_is_unreachable(client, github, clock):
+    github.users["mramitdas"] = {"login": "mramitdas"}
+    client.get_user("mramitdas")
+    # Nothing listens on the discard port
+    client.base_url = "http://127.0.0.1:9"
+
+    clock.advance(Config.GITHUB_CACHE_TTL)
+    assert client.get_user("mramitdas") == (200, {"login": "mramitdas"})
+    assert client.get_user("somebody") == (None, {})
+    assert not client.is_unknown("somebody")
+
+
+def test_redis_shares_entries_between_processes(github, redis_client, clock):
+    github.users["mramitdas"] = {"login": "mramitdas"}
+    GitHubClient(base_url=github.url, token="").get_user("mramitdas")
+    GitHubClient(base_url=github.url, token="").get_user("ghost")
+
+    other = GitHubClient(base_url=github.url, token="")
+    assert other.get_user("mramitdas") == (200, {"login": "mramitdas"})
+    assert other.is_unknown("ghost")
+    assert len(github.requests) == 2
+
+    entry = json.loads(redis_client.get("github:user:mramitdas"))
+    assert entry["etag"] == github.etag(github.users["mramitdas"])
+    assert (
+        0 < redis_client.ttl("github:user:mramitdas") <= Config.GITHUB_CACHE_STALE_TTL
+    )
+
+
+def test_redis_entries_are_revalidated_once_expired(github, redis_client, clock):
+    github.users["mramitdas"] = {"login": "mramitdas"}
+    GitHubClient(base_url=github.url, token="").get_user("mramitdas")
+
+    clock.advance(Config.GITHUB_CACHE_TTL)
+    other = GitHubClient(base_url=github.url, token="")
+    assert other.get_user("mramitdas") == (200, {"login": "mramitdas"})
+
+    assert lookups(github, "mramitdas")[-1]["headers"]["If-None-Match"]
+    renewed = json.loads(redis_client.get("github:user:mramitdas"))
+    assert renewed["fetched_at"] == clock.now
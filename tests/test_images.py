@@ -0,0 +1,30 @@
+from io import BytesIO
+
+from PIL import Image
+
+from app.config.config import Config
+from app.worker.images import build_variants
+
+
+def screenshot(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (36, 41, 47)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_variants_are_encoded_as_avif_and_webp(monkeypatch):
+    monkeypatch.setattr(Config, "SCREENSHOT_WIDTHS", [320, 640])
+    monkeypatch.setattr(Config, "SCREENSHOT_CROP_HEIGHT", 1000)
+
+    variants = build_variants(screenshot(1280, 4000))
+
+    assert [(variant["format"], variant["width"]) for variant in variants] == [
+        ("avif", 320),
+        ("webp", 320),
+        ("avif", 640),
+        ("webp", 640),
+    ]
+    for variant in variants:
+        with Image.open(BytesIO(variant["content"])) as image:
+            assert image.format == variant["format"].upper()
+            assert image.size == (variant["width"], variant["width"] * 1000 // 1280)
@@ -0,0 +1,133 @@
+import asyncio
+import os
+import uuid
+
+import boto3
+import pytest
+
+import app.storage.backends
+from app.config.config import Config
+from app.storage.backends import get_storage
+
+PNG = b"\x89PNG\r\n\x1a\n screenshot"
+
+
+@pytest.fixture(autouse=True)
+def storages(tmp_path, monkeypatch):
+    monkeypatch.setattr(app.storage.backends, "_storages", {})
+    monkeypatch.setattr(Config, "MEDIA_ROOT", str(tmp_path))
+    monkeypatch.setattr(Config, "MEDIA_STORAGE", "local")
+    monkeypatch.setattr(Config, "MEDIA_PUBLIC_URL", None)
+
+
+@pytest.fixture(params=["moto", "minio"])
+def s3(request, monkeypatch):
+    """
+    An empty bucket, in moto's in-process S3 or on the MinIO server at `MINIO_ENDPOINT_URL`.
+
+    Start MinIO with `docker compose --profile s3 up -d minio` and set `MINIO_ENDPOINT_URL=http://localhost:9000` to run the MinIO variant.
+    """
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "minioadmin")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "minioadmin")
+    monkeypatch.setattr(Config, "MEDIA_S3_BUCKET", f"screenshots-{uuid.uuid4().hex}")
+    monkeypatch.setattr(Config, "MEDIA_S3_REGION", "us-east-1")
+
+    if request.param == "minio":
+        endpoint_url = os.environ.get("MINIO_ENDPOINT_URL")
+        if not endpoint_url:
+            pytest.skip("MINIO_ENDPOINT_URL is not set")
+        monkeypatch.setattr(Config, "MEDIA_S3_ENDPOINT_URL", endpoint_url)
+        client = boto3.client("s3", endpoint_url=endpoint_url, region_name="us-east-1")
+        client.create_bucket(Bucket=Config.MEDIA_S3_BUCKET)
+        yield client
+        for item in client.list_objects_v2(Bucket=Config.MEDIA_S3_BUCKET).get(
+            "Contents", []
+        ):
+            client.delete_object(Bucket=Config.MEDIA_S3_BUCKET, Key=item["Key"])
+        client.delete_bucket(Bucket=Config.MEDIA_S3_BUCKET)
+        return
+
+    from moto import mock_aws
+
+    monkeypatch.setattr(Config, "MEDIA_S3_ENDPOINT_URL", None)
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=Config.MEDIA_S3_BUCKET)
+        yield client
+
+
+def test_files_are_served_from_the_backend_of_their_url(web):
+    key = get_storage().put(PNG, "png")
+    url = get_storage().url(key)
+    assert url == f"/media/local/{key}"
+
+    response = web.get(url)
+    assert response.status_code == 200
+    assert response.data == PNG
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert (
+        web.get(url, headers={"If-None-Match": response.headers["ETag"]}).status_code
+        == 304
+    )
+
+    assert web.get(f"/media/github/{key}").status_code == 404
+    assert web.get(f"/media/ftp/{key}").status_code == 404
+
+
+def test_s3_files_are_stored_and_served(web, s3):
+    key = get_storage("s3").put(PNG, "png")
+
+    stored = s3.get_object(Bucket=Config.MEDIA_S3_BUCKET, Key=f"profiles/{key}")
+    assert stored["ContentType"] == "image/png"
+    assert stored["CacheControl"] == "public, max-age=31536000, immutable"
+
+    response = web.get(f"/media/s3/{key}")
+    assert response.status_code == 200
+    assert response.data == PNG
+    assert web.get(f"/media/local/{key}").status_code == 404
+
+
+def test_local_files_are_served_after_switching_to_s3(web, s3, monkeypatch):
+    local_key = get_storage().put(PNG, "png")
+    local_url = get_storage().url(local_key)
+
+    monkeypatch.setattr(Config, "MEDIA_STORAGE", "s3")
+    monkeypatch.setattr(Config, "MEDIA_PUBLIC_URL", "https://cdn.example.com/")
+    s3_key = get_storage().put(b"\x89PNG\r\n\x1a\n recaptured", "png")
+
+    assert web.get(local_url).data == PNG
+    # URLs issued before they named the backend are looked up in every one
+    assert web.get(f"/media/{local_key}").data == PNG
+    assert web.get(f"/media/{s3_key}").status_code == 200
+
+    assert get_storage("local").url(local_key) == local_url
+    assert get_storage().url(s3_key) == f"https://cdn.example.com/{s3_key}"
+
+
+def test_the_asgi_app_serves_files_of_every_backend(s3, monkeypatch):
+    from app.asgi import app as asgi_app
+
+    local_key = get_storage().put(PNG, "png")
+    monkeypatch.setattr(Config, "MEDIA_STORAGE", "s3")
+    s3_key = get_storage().put(b"\x89PNG\r\n\x1a\n recaptured", "png")
+
+    async def fetch(path):
+        response = await asgi_app.test_client().get(path)
+        return response.status_code, await response.get_data()
+
+    assert asyncio.run(fetch(f"/media/local/{local_key}")) == (200, PNG)
+    assert asyncio.run(fetch(f"/media/{local_key}")) == (200, PNG)
+    assert asyncio.run(fetch(f"/media/s3/{s3_key}"))[0] == 200
+    assert asyncio.run(fetch(f"/media/s3/{local_key}"))[0] == 404
+
+
+def test_backends_must_implement_the_storage_interface():
+    class Incomplete(app.storage.backends.MediaStorage):
+        def exists(self, key):
+            return False
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    for name in ("local", "github"):
+        assert isinstance(get_storage(name), app.storage.backends.MediaStorage)
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.config.config import Config
+from app.models.aio import AsyncUser
+from app.models.base import legacy_timestamps
+from app.models.pagination import decode_cursor
+from app.models.user import User
+
+PROJECTION = {"github_username": 1, "created_at": 1}
+
+
+@pytest.fixture
+def profiles(database):
+    """Three profiles with native timestamps and three still holding legacy strings."""
+    database[Config.TABLE_NAME].insert_many(
+        [
+            {"_id": i, "github_username": f"new{i}", "created_at": datetime(2024, 1, i)}
+            for i in range(1, 4)
+        ]
+        + [
+            {
+                "_id": i,
+                "github_username": f"old{i}",
+                "created_at": f"2023-01-0{i} || 10:00:00:000000",
+            }
+            for i in range(4, 7)
+        ]
+    )
+    return database[Config.TABLE_NAME]
+
+
+def pages(paginate):
+    documents, cursors = [], []
+    page, cursor = paginate(None)
+    documents += page
+    while cursor:
+        cursors.append(cursor)
+        page, cursor = paginate(cursor)
+        documents += page
+    return [document["github_username"] for document in documents], cursors
+
+
+def sync_pages(cursor):
+    return User().paginate("latest", 2, cursor, PROJECTION)
+
+
+def async_pages(cursor):
+    return asyncio.run(AsyncUser().paginate("latest", 2, cursor, PROJECTION))
+
+
+@pytest.mark.parametrize("paginate", [sync_pages, async_pages])
+def test_latest_reaches_legacy_timestamps_before_the_migration(
+    profiles, motor, paginate
+):
+    usernames, _ = pages(paginate)
+
+    assert usernames == ["new3", "new2", "new1", "old6", "old5", "old4"]
+
+
+def test_latest_pages_by_keyset_once_migrated(profiles):
+    for _ in User().migrate_timestamps(batch_size=10):
+        pass
+    legacy_timestamps.clear()
+
+    usernames, cursors = pages(sync_pages)
+
+    assert usernames == ["new3", "new2", "new1", "old6", "old5", "old4"]
+    assert decode_cursor("latest", cursors[0])["i"] == 2
+
+
+def test_offset_pages_continue_across_the_migration(profiles):
+    page, cursor = sync_pages(None)
+    for _ in User().migrate_timestamps(batch_size=10):
+        pass
+    legacy_timestamps.clear()
+
+    rest, _ = pages(lambda next_cursor: sync_pages(next_cursor or cursor))
+
+    assert [p["github_username"] for p in page] + rest == [
+        "new3",
+        "new2",
+        "new1",
+        "old6",
+        "old5",
+        "old4",
+    ]
@@ -0,0 +1,88 @@
+from functools import partial
+
+import pytest
+from github import Github, GithubException
+
+import app.github.publisher
+from app.config.config import Config
+from app.github.publisher import LOCK_KEY, PENDING_KEY, GitHubPublisher
+
+
+@pytest.fixture
+def publisher(github, monkeypatch):
+    monkeypatch.setattr(Config, "GITHUB_API_URL", github.url)
+    # PyGithub spaces out writes by a second, which only slows the stub down
+    monkeypatch.setattr(
+        app.github.publisher,
+        "Github",
+        partial(Github, seconds_between_requests=0, seconds_between_writes=0),
+    )
+    return GitHubPublisher(
+        token="test-token", repo_owner="owner", repo_name="repo", branch="dev"
+    )
+
+
+@pytest.mark.parametrize("with_redis", [False, True])
+def test_flush_commits_every_staged_file_at_once(
+    publisher, github, with_redis, request
+):
+    if with_redis:
+        request.getfixturevalue("redis_client")
+
+    files = {f"profiles/user{i}.png": f"screenshot {i}".encode() for i in range(5)}
+    for path, content in files.items():
+        publisher.stage(path, content)
+    # Staging a path again only replaces its content
+    publisher.stage("profiles/user0.png", b"recaptured")
+    files["profiles/user0.png"] = b"recaptured"
+
+    sha = publisher.flush()
+
+    repo = "/repos/owner/repo"
+    assert len(github.calls("POST", f"{repo}/git/blobs")) == len(files)
+    assert len(github.calls("POST", f"{repo}/git/trees")) == 1
+    assert len(github.calls("POST", f"{repo}/git/commits")) == 1
+    assert len(github.calls("PATCH", f"{repo}/git/refs/heads/dev")) == 1
+    assert github.refs["heads/dev"] == sha
+    assert github.files("dev") == files
+    assert publisher.flush() is None
+
+
+def test_failed_flush_keeps_its_files_for_the_next_one(
+    publisher, github, redis_client, monkeypatch
+):
+    publisher.stage("profiles/a.png", b"old a")
+    publisher.stage("profiles/b.png", b"b")
+
+    def fail(files, message=None):
+        raise GithubException(502, {"message": "Bad Gateway"}, {})
+
+    with monkeypatch.context() as patch:
+        patch.setattr(publisher, "_commit", fail)
+        with pytest.raises(GithubException):
+            publisher.flush()
+
+    # Newer content staged after the failure wins
+    publisher.stage("profiles/a.png", b"new a")
+    assert publisher.flush()
+
+    assert github.files("dev") == {"profiles/a.png": b"new a", "profiles/b.png": b"b"}
+    assert publisher.flush() is None
+
+
+def test_crashed_flush_is_recovered_once_its_lock_expires(
+    publisher, github, redis_client
+):
+    publisher.stage("profiles/a.png", b"a")
+    files, release = publisher._drain()
+    assert files == {"profiles/a.png": b"a"}
+
+    # The worker died before committing; its lock is still held
+    publisher.stage("profiles/b.png", b"b")
+    assert publisher.flush() is None
+    assert redis_client.hgetall(PENDING_KEY) == {b"profiles/b.png": b"b"}
+
+    redis_client.delete(LOCK_KEY)
+    assert publisher.flush()
+
+    assert github.files("dev") == {"profiles/a.png": b"a", "profiles/b.png": b"b"}
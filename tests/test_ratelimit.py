@@ -0,0 +1,157 @@
+import pytest
+
+import app.api.V1.endpoints.utils as tasks
+import app.github.ratelimit
+from app.exceptions.custom_exceptions import RateLimitedError
+from app.github.publisher import publisher
+from app.github.ratelimit import RateLimiter
+from app.models.user import PROFILE_PENDING
+from app.models.user import User
+
+
+class Clock:
+    """Stands in for the `time` module of the limiter; sleeping advances it."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(app.github.ratelimit, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter("token", capacity=10, rate_limit=3600)
+
+
+def exhausted(clock, seconds: float = 600) -> dict:
+    return {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(clock.now + seconds)}
+
+
+def test_acquire_takes_the_burst_then_paces(limiter, clock):
+    for _ in range(10):
+        limiter.acquire(timeout=0)
+
+    assert limiter.try_acquire() == pytest.approx(1)
+    limiter.acquire(cost=3, timeout=5)
+    assert clock.now == pytest.approx(1_700_000_003)
+
+
+def test_acquire_defers_without_sleeping_past_its_timeout(limiter, clock):
+    limiter.acquire(cost=10, timeout=0)
+
+    with pytest.raises(RateLimitedError) as deferred:
+        limiter.acquire(cost=5, timeout=2)
+
+    assert deferred.value.retry_after == pytest.approx(5)
+    assert clock.now == 1_700_000_000
+
+
+def test_observe_spreads_the_remaining_requests_until_the_reset(limiter, clock):
+    headers = {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset": str(clock.now + 40)}
+
+    assert limiter.observe(headers, 200) == 0
+    for _ in range(4):
+        limiter.acquire(timeout=0)
+    assert limiter.try_acquire() == pytest.approx(10)
+
+
+def test_observe_blocks_until_the_reset_once_nothing_remains(limiter, clock):
+    assert limiter.observe(exhausted(clock), 403) == pytest.approx(600)
+    assert limiter.try_acquire() == pytest.approx(600)
+
+    clock.sleep(600)
+    for _ in range(10):
+        limiter.acquire(timeout=0)
+
+
+def test_observe_honours_retry_after(limiter, clock):
+    assert limiter.observe({"Retry-After": "30"}, 429) == 30
+    assert limiter.try_acquire() == pytest.approx(30)
+
+
+def test_observe_ignores_permission_errors(limiter):
+    assert limiter.observe({"x-ratelimit-remaining": "12"}, 403) == 0
+    assert limiter.try_acquire() == 0
+
+
+def test_limiters_of_one_token_share_their_bucket_through_redis(clock, redis_client):
+    RateLimiter("token", capacity=10).acquire(cost=10, timeout=0)
+
+    assert RateLimiter("token", capacity=10).try_acquire() > 0
+    assert RateLimiter("other", capacity=10).try_acquire() == 0
+
+
+def test_registration_is_accepted_as_pending_when_deferred(web, github_api, queued):
+    github_api.users["mramitdas"] = {"login": "mramitdas", "name": "Amit"}
+    github_api.remaining = 0
+
+    response = web.post("/profile", json={"github_username": "mramitdas"})
+
+    assert response.status_code == 202
+    assert response.headers["Location"] == "/profile/mramitdas/status"
+    assert User().get("mramitdas")["profile_status"] == PROFILE_PENDING
+    assert queued == [("enrich_profile", "mramitdas", None)]
+
+
+def test_bulk_registration_reports_deferred_profiles(web, github_api, queued):
+    github_api.users = {name: {"login": name} for name in ("alice", "bob")}
+    github_api.remaining = 1
+
+    response = web.post(
+        "/profile/bulk",
+        json={"profiles": [{"github_username": "alice"}, {"github_username": "bob"}]},
+    )
+
+    result = response.get_json()
+    assert len(result["created"]) == len(result["deferred"]) == 1
+    (deferred,) = result["deferred"]
+    assert User().get(deferred)["profile_status"] == PROFILE_PENDING
+    assert ("enrich_profile", deferred, None) in queued
+
+
+def test_enrichment_is_requeued_for_the_reset_when_deferred(github_api, queued, clock):
+    User().save({"github_username": "mramitdas", "profile_status": PROFILE_PENDING})
+    github_api.users["mramitdas"] = {"login": "mramitdas"}
+    github_api.reset = clock.now + 120
+    github_api.remaining = 0
+
+    with pytest.raises(tasks.Ignore):
+        tasks.enrich_profile("mramitdas")
+
+    assert queued == [("enrich_profile", "mramitdas", pytest.approx(120))]
+    assert User().get("mramitdas")["profile_status"] == PROFILE_PENDING
+
+
+def test_refresh_skips_deferred_profiles(github_api, queued, clock):
+    github_api.remaining = 0
+
+    result = tasks.refresh_profile_batch([{"github_username": "mramitdas"}])
+
+    assert result["deferred"] == ["mramitdas"]
+    assert result["updated"] == result["unavailable"] == []
+
+
+def test_deferred_publishing_keeps_the_files_staged(monkeypatch, clock):
+    limiter = RateLimiter("token")
+    limiter.observe(exhausted(clock), 403)
+    monkeypatch.setattr(publisher, "limiter", limiter)
+    monkeypatch.setattr(publisher, "_local", {})
+
+    publisher.stage("profiles/mramitdas.png", b"png")
+
+    assert tasks.publish_screenshots() is None
+    assert publisher._local == {"profiles/mramitdas.png": b"png"}
@@ -0,0 +1,29 @@
+from app.cache.records import RecordCache
+
+
+def test_a_fill_outliving_its_lock_leaves_the_next_holders_lock(redis_client):
+    cache = RecordCache("github_profile", ttl=60, jitter=0, lock_timeout=0.5)
+    lock = cache._lock_key(cache._key("mramitdas"), "*")
+
+    def slow_load():
+        # The lock expired meanwhile and another reader took it
+        redis_client.set(lock, "other reader")
+        return {"github_username": "mramitdas"}
+
+    assert cache.get("mramitdas", None, slow_load) == {"github_username": "mramitdas"}
+    assert redis_client.get(lock) == b"other reader"
+
+
+def test_fills_release_their_own_lock(redis_client):
+    cache = RecordCache("github_profile", ttl=60, jitter=0, lock_timeout=0.5)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return None
+
+    assert cache.get("ghost", None, load) is None
+    assert cache.get("ghost", None, load) is None
+
+    assert len(loads) == 1
+    assert redis_client.keys("*:lock:*") == []
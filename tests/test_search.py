@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from app.config.config import Config
+from app.models.search import SearchIndex
+from app.models.user import User
+
+
+@pytest.fixture
+def profiles():
+    users = User()
+    users.save({"github_username": "alice", "full_name": "Alice Smith", "tags": []})
+    users.save({"github_username": "bob", "full_name": "Bob Alison", "tags": ["ali"]})
+    return users
+
+
+def test_search_ranks_username_matches_first(profiles):
+    assert SearchIndex().search("ali") == ["alice", "bob"]
+    assert SearchIndex().search("alice") == ["alice"]
+
+
+def test_search_reads_terms_and_postings_as_one_snapshot(profiles):
+    index = SearchIndex()
+    index.search("alice")
+    postings, terms = index._index
+
+    profiles.save({"github_username": "carol", "full_name": "Carol", "tags": []})
+    index._build(version="rebuilt")
+
+    # The previous snapshot stays consistent on its own
+    assert set(terms) == set(postings)
+    assert "carol" not in terms
+    assert index.search("carol") == ["carol"]
+
+
+@pytest.fixture
+def stale(monkeypatch):
+    """Let every profile write make the index stale at once."""
+    monkeypatch.setattr(Config, "SEARCH_INDEX_MIN_AGE", 0)
+
+
+def test_rebuilds_run_in_the_background(profiles, stale, monkeypatch):
+    index = SearchIndex()
+    index.search("alice")
+
+    release = threading.Event()
+    build = index._build
+
+    def slow_build(version):
+        release.wait(5)
+        build(version)
+
+    monkeypatch.setattr(index, "_build", slow_build)
+    profiles.save({"github_username": "carol", "full_name": "Carol", "tags": []})
+
+    # The previous index is served while the rebuild scans the table
+    assert index.search("carol") == []
+    assert index.search("alice") == ["alice"]
+
+    release.set()
+    index._rebuild.join(5)
+
+    assert index.search("carol") == ["carol"]
+
+
+def test_a_failed_rebuild_keeps_the_previous_index(profiles, stale, monkeypatch):
+    index = SearchIndex()
+    index.search("alice")
+
+    def fail(version):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(index, "_build", fail)
+    profiles.save({"github_username": "carol", "full_name": "Carol", "tags": []})
+
+    assert index.search("alice") == ["alice"]
+    index._rebuild.join(5)
+    assert index.search("alice") == ["alice"]
@@ -0,0 +1,137 @@
+import asyncio
+import runpy
+from pathlib import Path
+
+import pytest
+from pymongo.errors import PyMongoError
+from quart.testing.app import LifespanError
+
+from app.config.config import Config
+from app.exceptions.custom_exceptions import DuplicateRecordError
+from app.github.aio import async_github_client
+from app.models.aio import AsyncUser
+from app.models.user import User
+
+
+def test_unique_indexes_reject_duplicate_registrations(database):
+    assert User().ensure_unique_indexes() == ["github_username"]
+
+    User().save({"github_username": "mramitdas"})
+    with pytest.raises(DuplicateRecordError):
+        User().save({"github_username": "mramitdas"})
+
+    assert database[Config.TABLE_NAME].count_documents({}) == 1
+
+
+@pytest.fixture
+def duplicates(database):
+    database[Config.TABLE_NAME].insert_many(
+        [{"_id": 1, "github_username": "twin"}, {"_id": 2, "github_username": "twin"}]
+    )
+
+
+def test_unique_indexes_fail_on_existing_duplicates(duplicates):
+    with pytest.raises(PyMongoError):
+        User().ensure_unique_indexes()
+
+
+def test_gunicorn_refuses_to_start_without_the_unique_indexes(duplicates):
+    hooks = runpy.run_path(Path(__file__).parents[1] / "gunicorn.conf.py")
+
+    with pytest.raises(PyMongoError):
+        hooks["on_starting"](None)
+
+
+@pytest.fixture
+def start_asgi(monkeypatch):
+    """Run the startup and shutdown hooks of the ASGI app."""
+    from app.asgi import app
+
+    # The shared HTTP client may belong to the event loop of an earlier test
+    monkeypatch.setattr(async_github_client, "_client", None)
+
+    async def start():
+        async with app.test_app():
+            pass
+
+    return lambda: asyncio.run(start())
+
+
+def test_the_asgi_app_refuses_to_start_without_the_unique_indexes(
+    duplicates, start_asgi
+):
+    with pytest.raises(LifespanError, match="Duplicate Key"):
+        start_asgi()
+
+
+def test_the_asgi_app_creates_the_unique_indexes_on_start(database, start_asgi):
+    start_asgi()
+
+    assert "github_username" in database[Config.TABLE_NAME].index_information()
+
+
+def test_overwritten_counters_rescore_every_leaderboard(redis_client):
+    users = User()
+    users.save({"github_username": "alice", "profile_views": 9, "profile_likes": 4})
+    users.save({"github_username": "bob", "profile_views": 1, "profile_likes": 1})
+    users.rebuild_leaderboards()
+
+    users.update(
+        {
+            "github_username": "alice",
+            "user_data": {"profile_views": 1, "profile_likes": 0},
+        }
+    )
+
+    assert redis_client.zscore("leaderboard:trending", "alice") == 1
+    assert redis_client.zscore("leaderboard:popular", "alice") == 0
+    assert redis_client.zscore("leaderboard:hot", "alice") == 0
+    assert users.paginate("hot", limit=1)[0][0]["github_username"] == "bob"
+
+
+def test_updates_do_not_list_pending_profiles(redis_client):
+    users = User()
+    users.save({"github_username": "carol", "profile_status": "pending"})
+    users.rebuild_leaderboards()
+
+    users.update({"github_username": "carol", "user_data": {"profile_views": 5}})
+    assert redis_client.zscore("leaderboard:trending", "carol") is None
+
+    users.update(
+        {"github_username": "carol", "user_data": {"profile_status": "active"}}
+    )
+    assert redis_client.zscore("leaderboard:trending", "carol") == 5
+
+
+@pytest.mark.parametrize("leaderboard", [False, True])
+def test_both_apps_page_through_listings_alike(motor, redis_client, leaderboard):
+    users = User()
+    for i in range(5):
+        users.save(
+            {"github_username": f"user{i}", "profile_views": i, "profile_likes": 1}
+        )
+    users.save({"github_username": "pending", "profile_status": "pending"})
+    if leaderboard:
+        users.rebuild_leaderboards()
+
+    projection = {"github_username": 1, "profile_views": 1}
+
+    async def pages(filter_type):
+        documents, cursor = await AsyncUser().paginate(
+            filter_type, limit=2, projection=projection
+        )
+        while cursor:
+            page, cursor = await AsyncUser().paginate(
+                filter_type, 2, cursor, projection
+            )
+            documents += page
+        return documents
+
+    for filter_type in (None, "trending"):
+        documents, cursor = users.paginate(filter_type, 2, projection=projection)
+        while cursor:
+            page, cursor = users.paginate(filter_type, 2, cursor, projection)
+            documents += page
+
+        assert len(documents) == 5
+        assert asyncio.run(pages(filter_type)) == documents